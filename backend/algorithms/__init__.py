@@ -1,4 +1,4 @@
-from algorithms.base import RankingStrategy, MutantData
+from algorithms.base import RankingStrategy, MutantData, MutantBatch, DictionaryColumn
 from algorithms.lexicographical_rank import LexicographicalRank
 
-__all__ = ['RankingStrategy', 'MutantData', 'LexicographicalRank']
+__all__ = ['RankingStrategy', 'MutantData', 'MutantBatch', 'DictionaryColumn', 'LexicographicalRank']
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence, Union
+from dataclasses import dataclass, fields
+
+import numpy as np
 
 
 @dataclass
@@ -17,14 +19,127 @@ class MutantData:
     description: str
 
 
+@dataclass
+class DictionaryColumn:
+    """
+    Dictionary-encoded string column: `values` holds every distinct string once, in
+    sorted order, and `codes` the position of each row's string in it. Since the
+    dictionary is sorted, comparing codes compares the strings.
+    """
+    codes: np.ndarray
+    values: List[str]
+
+    @classmethod
+    def encode(cls, strings: Sequence[str]) -> "DictionaryColumn":
+        values = sorted(set(strings))
+        index = {value: code for code, value in enumerate(values)}
+        codes = np.fromiter((index[s] for s in strings), dtype=np.int32, count=len(strings))
+        return cls(codes, values)
+
+    def decode(self) -> List[str]:
+        return [self.values[code] for code in self.codes.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+@dataclass
+class MutantBatch:
+    """
+    All mutants of a ranking as contiguous arrays, one per MutantData field.
+    Row i of every column describes the same mutant.
+    """
+    id: np.ndarray
+    source_file: DictionaryColumn
+    mutated_class: DictionaryColumn
+    mutated_method: DictionaryColumn
+    line_number: np.ndarray
+    mutator: DictionaryColumn
+    status: DictionaryColumn
+    detected: np.ndarray
+    description: DictionaryColumn
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence]) -> "MutantBatch":
+        """Build a batch from one sequence of values per MutantData field."""
+        return cls(
+            id=np.asarray(columns["id"], dtype=np.int64),
+            line_number=np.asarray(columns["line_number"], dtype=np.int32),
+            detected=np.asarray(columns["detected"], dtype=np.bool_),
+            **{
+                name: DictionaryColumn.encode(columns[name])
+                for name in ("source_file", "mutated_class", "mutated_method", "mutator", "status", "description")
+            }
+        )
+
+    @classmethod
+    def from_mutants(cls, mutants: List[MutantData]) -> "MutantBatch":
+        return cls.from_columns({
+            field.name: [getattr(m, field.name) for m in mutants] for field in fields(MutantData)
+        })
+
+    def to_mutants(self) -> List[MutantData]:
+        """The batch as MutantData objects, for strategies that only implement `rank`."""
+        columns = []
+        for field in fields(MutantData):
+            column = getattr(self, field.name)
+            columns.append(column.decode() if isinstance(column, DictionaryColumn) else column.tolist())
+        return [MutantData(*values) for values in zip(*columns)]
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+# Key columns of a sort key, most significant first: integer arrays or string columns
+SortKey = List[Union[np.ndarray, DictionaryColumn]]
+
+
+def encode_sort_keys(columns: SortKey) -> List[bytes]:
+    """
+    One byte string per row, whose byte order is the order of the key columns:
+    integers as 8 big-endian bytes with the sign bit flipped, strings as UTF-8
+    followed by a NUL byte (PIT reports are XML, which cannot contain NUL).
+    """
+    parts = []
+    for column in columns:
+        if isinstance(column, DictionaryColumn):
+            encoded = [value.encode() + b"\x00" for value in column.values]
+            parts.append([encoded[code] for code in column.codes.tolist()])
+            continue
+        column = np.asarray(column)
+        if column.dtype.kind not in "iub":
+            raise TypeError(f"Sort key columns must be integers or strings, not {column.dtype}")
+        raw = (column.astype(np.int64).view(np.uint64) ^ np.uint64(1 << 63)).astype(">u8").tobytes()
+        parts.append([raw[i:i + 8] for i in range(0, len(raw), 8)])
+    return [b"".join(row) for row in zip(*parts)]
+
+
 class RankingStrategy(ABC):
     """
     Abstract base class for mutant ranking strategies.
 
     All custom ranking algorithms must inherit from this class
-    and implement the `rank` method.
+    and implement the `rank` method. Algorithms that rank large projects
+    should also implement `rank_batch`, which works on a columnar
+    MutantBatch instead of one object per mutant and is what the server
+    calls; by default it falls back to `rank`.
+
+    Ranking runs in a separate worker process. An algorithm that needs more
+    time or memory than the server defaults (ALGORITHM_TIMEOUT,
+    ALGORITHM_MEMORY_LIMIT_MB) can set `timeout` (seconds) and
+    `memory_limit_mb` as class attributes.
+
+    Algorithms whose order is "sort by these fields" should implement
+    `sort_key` instead of ordering themselves: the server then stores each
+    mutant's key and later runs only compute keys for new mutants. Stored
+    keys are recomputed when the algorithm's file changes; increase `version`
+    when the key changes for another reason, e.g. in a module it imports.
     """
 
+    timeout: Optional[float] = None
+    memory_limit_mb: Optional[int] = None
+    version: int = 1
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -51,3 +166,43 @@ class RankingStrategy(ABC):
             with no duplicates and no missing entries.
         """
         pass
+
+    def sort_key(self, batch: MutantBatch) -> Optional[SortKey]:
+        """
+        Sort key of every mutant in the batch, if the algorithm has one.
+
+        Args:
+            batch: MutantBatch with the mutants to rank
+
+        Returns:
+            Key columns, most significant first, each with one entry per row:
+            integer arrays or DictionaryColumns (compared as strings). Mutants
+            are ranked by ascending key, ties by ascending id. None (the
+            default) if the algorithm does not rank by a key.
+        """
+        return None
+
+    def rank_batch(self, batch: MutantBatch) -> np.ndarray:
+        """
+        Calculate ranking for a batch of mutants.
+
+        Args:
+            batch: MutantBatch with the mutants to rank
+
+        Returns:
+            Array of row indices into the batch in ranked order (highest
+            priority first), e.g. the result of np.argsort or np.lexsort.
+            By default the order of `sort_key`, or else of `rank`.
+        """
+        columns = self.sort_key(batch)
+        if columns is not None:
+            keys = [c.codes if isinstance(c, DictionaryColumn) else np.asarray(c) for c in columns]
+            # np.lexsort sorts by the last key first; the id breaks ties
+            return np.lexsort([batch.id] + keys[::-1])
+
+        ranked_ids = self.rank(batch.to_mutants())
+        row_of = {mutant_id: row for row, mutant_id in enumerate(batch.id.tolist())}
+        return np.fromiter(
+            (row_of[mutant_id] for mutant_id in ranked_ids
+             if isinstance(mutant_id, int) and mutant_id in row_of), dtype=np.int64
+        )
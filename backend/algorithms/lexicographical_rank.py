@@ -1,5 +1,6 @@
 from typing import List
-from algorithms.base import RankingStrategy, MutantData
+
+from algorithms.base import RankingStrategy, MutantData, MutantBatch, SortKey
 
 
 class LexicographicalRank(RankingStrategy):
@@ -21,8 +22,8 @@ class LexicographicalRank(RankingStrategy):
         return "Sorts mutants by file path, then line number, then mutator type"
 
     def rank(self, mutants: List[MutantData]) -> List[int]:
-        sorted_mutants = sorted(
-            mutants,
-            key=lambda m: (m.source_file, m.line_number, m.mutator)
-        )
-        return [m.id for m in sorted_mutants]
+        batch = MutantBatch.from_mutants(mutants)
+        return batch.id[self.rank_batch(batch)].tolist()
+
+    def sort_key(self, batch: MutantBatch) -> SortKey:
+        return [batch.source_file, batch.line_number, batch.mutator]
@@ -1,5 +1,8 @@
 from typing import List
-from algorithms.base import RankingStrategy, MutantData
+
+import numpy as np
+
+from algorithms.base import RankingStrategy, MutantData, MutantBatch, SortKey
 
 
 class StatusPriorityRank(RankingStrategy):
@@ -32,12 +35,12 @@ class StatusPriorityRank(RankingStrategy):
         return "Prioritizes survived mutants, then no-coverage, then killed"
 
     def rank(self, mutants: List[MutantData]) -> List[int]:
-        sorted_mutants = sorted(
-            mutants,
-            key=lambda m: (
-                self.STATUS_PRIORITY.get(m.status, 99),
-                m.source_file,
-                m.line_number
-            )
+        batch = MutantBatch.from_mutants(mutants)
+        return batch.id[self.rank_batch(batch)].tolist()
+
+    def sort_key(self, batch: MutantBatch) -> SortKey:
+        # Priority of every distinct status, then looked up per mutant
+        priorities = np.array(
+            [self.STATUS_PRIORITY.get(status, 99) for status in batch.status.values], dtype=np.int32
         )
-        return [m.id for m in sorted_mutants]
+        return [priorities[batch.status.codes], batch.source_file, batch.line_number]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Check that suggesting the next mutant from a warm adaptive ranking model stays below a millisecond.
+
+Builds an in-memory ProjectModel (no database needed) with synthetic mutants spread over
+mutators, classes and methods, then alternates recording a rating and asking for the
+reviewer's next suggestion, like a reviewer working through the project. The order is
+refreshed every --refresh-every ratings; AdaptiveRanker does that off the event loop.
+Exits with status 1 if the median suggestion latency exceeds --max-ms.
+
+Usage: python benchmarks/bench_adaptive_ranking.py [--mutants 1000000] [--ratings 2000]
+                                                    [--refresh-every 100] [--max-ms 1]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.adaptive_ranking import ProjectModel
+
+MUTATORS = [f"MUTATOR_{i}" for i in range(30)]
+STATUSES = ["SURVIVED", "NO_COVERAGE", "KILLED", "TIMED_OUT"]
+CLASSES = 2000
+METHODS_PER_CLASS = 8
+
+
+def build(mutant_count: int) -> ProjectModel:
+    rng = random.Random(1)
+    classes = [rng.randrange(CLASSES) for _ in range(mutant_count)]
+    return ProjectModel({
+        "id": list(range(1, mutant_count + 1)),
+        "mutator": [rng.choice(MUTATORS) for _ in range(mutant_count)],
+        "mutatedclass": [f"com.example.Class{c}" for c in classes],
+        "mutatedmethod": [f"method{c}_{rng.randrange(METHODS_PER_CLASS)}" for c in classes],
+        "status": [rng.choice(STATUSES) for _ in range(mutant_count)],
+    }, set())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mutants", type=int, default=1_000_000)
+    parser.add_argument("--ratings", type=int, default=2000)
+    parser.add_argument("--refresh-every", type=int, default=100)
+    parser.add_argument("--max-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    model = build(args.mutants)
+    model.refresh()
+    print(f"Built model of {args.mutants} mutants in {time.perf_counter() - started:.1f} s")
+
+    rng = random.Random(2)
+    user_id = 1
+    record_ms, next_ms, refresh_ms = [], [], []
+    suggestion = model.next_unrated(user_id)[0]
+    for rating in range(1, args.ratings + 1):
+        started = time.perf_counter()
+        model.record(suggestion.id, user_id, rng.random())
+        record_ms.append((time.perf_counter() - started) * 1000)
+
+        if rating % args.refresh_every == 0:
+            started = time.perf_counter()
+            model.refresh()
+            refresh_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        suggestion = model.next_unrated(user_id)[0]
+        next_ms.append((time.perf_counter() - started) * 1000)
+
+    for label, values in (("record rating", record_ms), ("next suggestion", next_ms), ("refresh", refresh_ms)):
+        values.sort()
+        print(f"{label:>16}: median {statistics.median(values):.3f} ms, "
+              f"p99 {values[int(len(values) * 0.99) - 1]:.3f} ms")
+
+    if statistics.median(next_ms) > args.max_ms:
+        print(f"FAIL: median suggestion latency above {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
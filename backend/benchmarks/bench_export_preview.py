@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Check that export preview latency does not grow with the number of ratings in a project.
+
+Runs against the database configured through the usual DB_* environment variables.
+Every run uses a throwaway project and throwaway reviewers that are deleted again afterwards.
+Exits with status 1 if the preview of the largest project is more than --max-ratio times
+slower than that of the smallest, so it can be used as a regression check.
+
+Usage: python benchmarks/bench_export_preview.py [--ratings 1000 10000 100000] [--max-ratio 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.database import db
+from repositories.export_repository import ExportRepository
+from repositories.form_field_repository import FormFieldRepository
+from repositories.progress_repository import ProgressRepository
+from repositories.project_repository import ProjectRepository
+from services.export import ExportService
+
+DEFAULT_RATINGS = [1000, 10000, 100000]
+DEFAULT_MAX_RATIO = 3.0
+REVIEWERS = 10
+REPEATS = 7
+
+
+async def seed(rating_count: int):
+    """Create a project whose mutants are each rated by REVIEWERS users, with one field value per rating."""
+    project_repo = ProjectRepository(db)
+    async with db.transaction() as conn:
+        project_id = await project_repo.create(f"bench_preview_{uuid.uuid4().hex[:8]}")
+        form_field_id = await FormFieldRepository(db).create(project_id, "Score", "rating", False)
+        user_ids = [r["id"] for r in await conn.fetch(
+            """
+            INSERT INTO users (username, password_hash)
+            SELECT 'bench_' || $1 || '_' || g, 'x' FROM generate_series(1, $2) g
+            RETURNING id
+            """,
+            uuid.uuid4().hex[:8], REVIEWERS
+        )]
+        await conn.execute(
+            """
+            INSERT INTO mutants (project_id, detected, status, numberOfTestsRun, sourceFile,
+                                 mutatedClass, mutatedMethod, methodDescription, lineNumber,
+                                 mutator, description)
+            SELECT $1, FALSE, 'SURVIVED', 1, 'Bench.java', 'com.example.Bench', 'run', '()V',
+                   g, 'MATH', 'synthetic benchmark mutant'
+            FROM generate_series(1, $2) g
+            """,
+            project_id, max(1, rating_count // REVIEWERS)
+        )
+        await conn.execute(
+            """
+            INSERT INTO rating (mutant_id, user_id)
+            SELECT m.id, u FROM mutants m, unnest($2::int[]) u WHERE m.project_id = $1
+            """,
+            project_id, user_ids
+        )
+        await conn.execute(
+            """
+            INSERT INTO form_field_values (form_field_id, rating_id, value)
+            SELECT $2, id, '3' FROM rating WHERE project_id = $1
+            """,
+            project_id, form_field_id
+        )
+    # Rows were inserted directly, so bring the progress counters up to date
+    await ProgressRepository(db).rebuild_project(project_id)
+    async with db.acquire() as conn:
+        await conn.execute("ANALYZE rating")
+        await conn.execute("ANALYZE form_field_values")
+    return project_id, user_ids
+
+
+async def preview_full_build(service: ExportService, project_id: int):
+    """The previous preview: build every entry of the export, then keep the first five."""
+    return (await service._build_rating_entries(project_id))[:5]
+
+
+async def preview(service: ExportService, project_id: int):
+    return (await service.get_export_preview(project_id)).sample_entries
+
+
+async def median_ms(build, service: ExportService, project_id: int) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await build(service, project_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(rating_counts: list, max_ratio: float) -> int:
+    service = ExportService(ExportRepository(db), ProjectRepository(db))
+    previews = []
+    await db.connect()
+    try:
+        print(f"{'ratings':>9} {'full build ms':>14} {'preview ms':>11}")
+        for count in rating_counts:
+            project_id, user_ids = await seed(count)
+            try:
+                assert await preview(service, project_id) == await preview_full_build(service, project_id)
+                full = await median_ms(preview_full_build, service, project_id)
+                limited = await median_ms(preview, service, project_id)
+                previews.append(limited)
+                print(f"{count:>9} {full:>14.1f} {limited:>11.1f}")
+            finally:
+                async with db.acquire() as conn:
+                    await conn.execute("DELETE FROM projects WHERE id = $1", project_id)
+                    await conn.execute("DELETE FROM users WHERE id = ANY($1::int[])", user_ids)
+    finally:
+        await db.disconnect()
+
+    ratio = previews[-1] / previews[0]
+    print(f"preview latency ratio largest/smallest: {ratio:.2f} (max {max_ratio})")
+    return 0 if ratio <= max_ratio else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ratings", type=int, nargs="+", default=DEFAULT_RATINGS)
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.ratings, args.max_ratio)))
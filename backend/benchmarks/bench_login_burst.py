@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Measure latency of unrelated requests while a burst of logins is in flight.
+
+Fires --logins concurrent POST /api/login requests and, while they run, keeps
+calling GET /api/user with an existing session. Reports the p50/p99 latency of
+those calls with bcrypt inline on the event loop (BCRYPT_WORKERS=0, the old
+behaviour) and on the bounded pool, plus how many logins got a 503.
+
+Runs in-process through the ASGI app against the database configured through
+the usual DB_* environment variables, with a throwaway user.
+
+Usage: python benchmarks/bench_login_burst.py [--logins 50] [--workers 4] [--queue 32]
+"""
+
+import argparse
+import asyncio
+import secrets
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from httpx import AsyncClient, ASGITransport
+
+from core import security
+from core.database import db
+from core.security import PasswordHasher
+from main import app
+from repositories.session_repository import SessionRepository
+from repositories.user_repository import UserRepository
+
+PASSWORD = "BenchPass123!"
+SAMPLE_INTERVAL = 0.01
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def burst(username: str, token: str, logins: int) -> tuple:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def login():
+            response = await client.post("/api/login", json={"username": username, "password": PASSWORD})
+            return response.status_code
+
+        login_tasks = [asyncio.ensure_future(login()) for _ in range(logins)]
+        latencies = []
+        headers = {"Authorization": f"Bearer {token}"}
+        # Samples are due every SAMPLE_INTERVAL and timed from when they were due, so time
+        # spent waiting for a blocked event loop counts as latency (no coordinated omission)
+        due = time.perf_counter()
+        while not all(task.done() for task in login_tasks):
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            response = await client.get("/api/user", headers=headers)
+            assert response.status_code == 200, response.text
+            latencies.append((time.perf_counter() - due) * 1000)
+            due += SAMPLE_INTERVAL
+        statuses = await asyncio.gather(*login_tasks)
+    return latencies, statuses
+
+
+async def main(logins: int, workers: int, queue: int) -> None:
+    await db.connect()
+    user_repo = UserRepository(db)
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    user_id = await user_repo.create(username, security.hash_password(PASSWORD))
+    token = secrets.token_urlsafe(32)
+    await SessionRepository(db).create(user_id, token)
+    original = security.password_hasher
+    try:
+        print(f"{'mode':>8} {'samples':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'200':>5} {'503':>5}")
+        for mode, hasher in (("inline", PasswordHasher(0, 0)), ("pool", PasswordHasher(workers, queue))):
+            security.password_hasher = hasher
+            try:
+                latencies, statuses = await burst(username, token, logins)
+            finally:
+                hasher.shutdown()
+            print(
+                f"{mode:>8} {len(latencies):>8} {statistics.median(latencies):>8.1f} "
+                f"{percentile(latencies, 0.99):>8.1f} {max(latencies):>8.1f} "
+                f"{statuses.count(200):>5} {statuses.count(503):>5}"
+            )
+    finally:
+        security.password_hasher = original
+        await user_repo.delete_by_id(user_id)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers, args.queue))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare mutant bulk load throughput of binary COPY and multi-row INSERT.
+
+Runs against the database configured through the usual DB_* environment variables.
+Every run uses a throwaway project that is deleted again afterwards.
+
+Usage: python benchmarks/bench_mutant_bulk_load.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.database import db
+from repositories.mutant_repository import MutantRepository
+from repositories.project_repository import ProjectRepository
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+MUTATORS = ["MATH", "NEGATE_CONDITIONALS", "VOID_METHOD_CALLS", "RETURN_VALS"]
+STATUSES = ["KILLED", "SURVIVED", "NO_COVERAGE"]
+
+
+def synthetic_mutants(count: int) -> list:
+    return [
+        [
+            0,
+            i % 3 == 0,
+            STATUSES[i % len(STATUSES)],
+            i % 7,
+            f"File{i % 500}.java",
+            f"com.example.pkg{i % 50}.File{i % 500}",
+            f"method{i % 20}",
+            "(I)V",
+            i % 2000,
+            MUTATORS[i % len(MUTATORS)],
+            None,
+            "synthetic benchmark mutant",
+            None,
+        ]
+        for i in range(count)
+    ]
+
+
+async def time_load(method: str, count: int) -> float:
+    project_repo = ProjectRepository(db)
+    mutant_repo = MutantRepository(db)
+    mutants = synthetic_mutants(count)
+
+    project_id = await project_repo.create(f"bench_{method}_{uuid.uuid4().hex[:8]}")
+    try:
+        for mutant in mutants:
+            mutant[0] = project_id
+        start = time.perf_counter()
+        async with db.transaction():
+            await mutant_repo.create_many(mutants, method=method)
+        return time.perf_counter() - start
+    finally:
+        await project_repo.delete(project_id)
+
+
+async def main(sizes: list) -> None:
+    await db.connect()
+    try:
+        print(f"{'rows':>10} {'method':>8} {'seconds':>9} {'rows/s':>12}")
+        for count in sizes:
+            for method in ("insert", "copy"):
+                elapsed = await time_load(method, count)
+                print(f"{count:>10} {method:>8} {elapsed:>9.2f} {count / elapsed:>12,.0f}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
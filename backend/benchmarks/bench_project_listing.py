@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Compare project listing latency of per-project count queries and the aggregated query.
+
+Runs against the database configured through the usual DB_* environment variables.
+Every run uses throwaway projects and a throwaway user that are deleted again afterwards.
+
+Usage: python benchmarks/bench_project_listing.py [--projects 10 100 1000] [--mutants 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.database import db
+from repositories.mutant_repository import MutantRepository
+from repositories.progress_repository import ProgressRepository
+from repositories.project_repository import ProjectRepository
+from repositories.rating_repository import RatingRepository
+from repositories.user_repository import UserRepository
+
+DEFAULT_PROJECTS = [10, 100, 1000]
+DEFAULT_MUTANTS = 200
+REPEATS = 5
+
+
+async def seed(project_count: int, mutants_per_project: int):
+    """Create a user assigned to project_count projects, each with some rated mutants."""
+    project_repo = ProjectRepository(db)
+    user_id = await UserRepository(db).create(f"bench_{uuid.uuid4().hex[:8]}", "x")
+    project_ids = []
+    async with db.transaction() as conn:
+        for _ in range(project_count):
+            project_id = await project_repo.create(f"bench_listing_{uuid.uuid4().hex[:8]}")
+            project_ids.append(project_id)
+            await project_repo.add_user(project_id, user_id)
+        await conn.execute(
+            """
+            INSERT INTO mutants (project_id, detected, status, numberOfTestsRun, sourceFile,
+                                 mutatedClass, mutatedMethod, methodDescription, lineNumber,
+                                 mutator, description)
+            SELECT p, FALSE, 'SURVIVED', 1, 'Bench.java', 'com.example.Bench', 'run', '()V',
+                   g, 'MATH', 'synthetic benchmark mutant'
+            FROM unnest($1::int[]) AS p, generate_series(1, $2) AS g
+            """,
+            project_ids, mutants_per_project
+        )
+        await conn.execute(
+            "INSERT INTO rating (mutant_id, user_id) "
+            "SELECT id, $2 FROM mutants WHERE project_id = ANY($1::int[]) AND id % 3 = 0",
+            project_ids, user_id
+        )
+    # Rows were inserted directly, so bring their progress counters up to date
+    progress_repo = ProgressRepository(db)
+    for project_id in project_ids:
+        await progress_repo.rebuild_project(project_id)
+    return user_id, project_ids
+
+
+async def list_per_project(user_id: int) -> list:
+    """The previous listing: one query for the projects plus two per project."""
+    project_repo = ProjectRepository(db)
+    mutant_repo = MutantRepository(db)
+    rating_repo = RatingRepository(db)
+    result = []
+    for project in await project_repo.find_by_user_id(user_id):
+        total = await mutant_repo.count_by_project_id(project["id"])
+        reviewed = await rating_repo.count_reviewed_by_project_and_user(project["id"], user_id)
+        result.append((project["id"], total, reviewed))
+    return result
+
+
+async def list_aggregated(user_id: int) -> list:
+    rows = await ProjectRepository(db).find_by_user_id_with_counts(user_id)
+    return [(row["id"], row["total_mutants"], row["reviewed_mutants"]) for row in rows]
+
+
+async def median_ms(listing, user_id: int) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await listing(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(project_counts: list, mutants_per_project: int) -> None:
+    await db.connect()
+    try:
+        print(f"{'projects':>9} {'per-project ms':>15} {'aggregated ms':>14}")
+        for count in project_counts:
+            user_id, project_ids = await seed(count, mutants_per_project)
+            try:
+                assert sorted(await list_per_project(user_id)) == sorted(await list_aggregated(user_id))
+                per_project = await median_ms(list_per_project, user_id)
+                aggregated = await median_ms(list_aggregated, user_id)
+                print(f"{count:>9} {per_project:>15.1f} {aggregated:>14.1f}")
+            finally:
+                async with db.acquire() as conn:
+                    await conn.execute("DELETE FROM projects WHERE id = ANY($1::int[])", project_ids)
+                await UserRepository(db).delete_by_id(user_id)
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, nargs="+", default=DEFAULT_PROJECTS)
+    parser.add_argument("--mutants", type=int, default=DEFAULT_MUTANTS)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.mutants))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare authenticated request throughput with and without the session cache.
+
+Sends GET /api/user through the ASGI app in-process, so the numbers measure
+the application and database, not HTTP parsing. Runs against the database
+configured through the usual DB_* environment variables with a throwaway user.
+
+Usage: python benchmarks/bench_session_auth.py [--requests 5000] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import secrets
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from httpx import AsyncClient, ASGITransport
+
+from core.database import db
+from core.session_cache import session_cache
+from main import app
+from repositories.session_repository import SessionRepository
+from repositories.user_repository import UserRepository
+
+
+async def run(token: str, total: int, concurrency: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker(count: int):
+            for _ in range(count):
+                response = await client.get("/api/user", headers=headers)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(total // concurrency) for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+async def main(total: int, concurrency: int) -> None:
+    await db.connect()
+    user_repo = UserRepository(db)
+    user_id = await user_repo.create(f"bench_{uuid.uuid4().hex[:8]}", "x")
+    token = secrets.token_urlsafe(32)
+    await SessionRepository(db).create(user_id, token)
+    ttl = session_cache.ttl
+    try:
+        print(f"{'cache':>6} {'requests':>9} {'seconds':>8} {'req/s':>9} {'hit ratio':>10}")
+        for label, cache_ttl in (("off", 0), ("on", ttl or 30)):
+            session_cache.ttl = cache_ttl
+            session_cache.clear()
+            session_cache.hits = session_cache.misses = 0
+            elapsed = await run(token, total, concurrency)
+            stats = session_cache.stats()
+            print(f"{label:>6} {total:>9} {elapsed:>8.2f} {total / elapsed:>9,.0f} {stats['hit_ratio']:>10.2%}")
+    finally:
+        session_cache.ttl = ttl
+        await user_repo.delete_by_id(user_id)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
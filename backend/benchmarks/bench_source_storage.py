@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Compare extracting uploaded source archives with keeping them and reading members on demand.
+
+Builds a synthetic Maven-style archive of --files Java classes (no database needed) and, for
+each storage mode of SourceCodeRepository, measures the upload, the disk space it takes and
+the latency of the first read of classes: the very first one (which loads the class index
+and, in archive mode, maps the archive) and the median of --reads further classes, each
+read for the first time. The source cache is disabled, so every read hits the storage.
+Files just written are usually still in the OS page cache, so reads measure the storage
+layout rather than the disk. Exits with status 1 if the median first read in archive
+mode exceeds --max-read-ms. Extract mode is measured once per --workers count of
+extraction threads.
+
+Usage: python benchmarks/bench_source_storage.py [--files 20000] [--reads 200] [--max-read-ms 2] [--workers 1 4]
+"""
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.storage import FileStorage
+from repositories import source_code_repository
+from repositories.source_code_repository import SourceCodeRepository
+
+PACKAGES = 200
+METHODS_PER_CLASS = 20
+
+
+def class_source(package: str, name: str) -> str:
+    methods = "\n".join(
+        f"    public int method{i}(int value) {{\n        return value * {i} + {len(name)};\n    }}\n"
+        for i in range(METHODS_PER_CLASS)
+    )
+    return f"package {package};\n\nimport java.util.List;\n\npublic class {name} {{\n{methods}}}\n"
+
+
+def build_archive(file_count: int) -> tuple:
+    """The archive's bytes and the fully qualified names of its classes."""
+    buffer = io.BytesIO()
+    names = []
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(file_count):
+            package = f"com.example.module{i % PACKAGES}"
+            name = f"Class{i}"
+            archive.writestr(
+                f"module{i % 4}/src/main/java/{package.replace('.', '/')}/{name}.java",
+                class_source(package, name)
+            )
+            names.append(f"{package}.{name}")
+    return buffer.getvalue(), names
+
+
+def disk_usage(root: Path) -> int:
+    return sum(path.stat().st_blocks * 512 for path in root.rglob("*") if path.is_file())
+
+
+def forget_open_sources() -> None:
+    """Drop what the process keeps between reads, as if another worker served the first read."""
+    source_code_repository._loaded_indexes.clear()
+    source_code_repository._mapped_archives.clear()
+
+
+def measure(mode: str, archive: bytes, names: list, reads: int, workers: int) -> dict:
+    with tempfile.TemporaryDirectory() as root:
+        storage = FileStorage()
+        storage.root_path = Path(root)
+        repo = SourceCodeRepository(storage, cache=None, storage_mode=mode)
+        repo.extract_workers = workers
+
+        started = time.perf_counter()
+        repo._sync_save_zip(1, io.BytesIO(archive))
+        upload_s = time.perf_counter() - started
+
+        forget_open_sources()
+        sample = random.Random(1).sample(names, reads + 1)
+        started = time.perf_counter()
+        assert repo._sync_get_class_content(1, sample[0]) is not None
+        first_ms = (time.perf_counter() - started) * 1000
+
+        read_ms = []
+        for name in sample[1:]:
+            started = time.perf_counter()
+            assert repo._sync_get_class_content(1, name) is not None
+            read_ms.append((time.perf_counter() - started) * 1000)
+
+        usage = disk_usage(Path(root))
+        repo._sync_delete_source(1)
+    return {"upload_s": upload_s, "disk_mib": usage / 2 ** 20, "first_ms": first_ms,
+            "read_ms": statistics.median(read_ms)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--max-read-ms", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    archive, names = build_archive(args.files)
+    print(f"Archive of {args.files} classes: {len(archive) / 2 ** 20:.1f} MiB")
+    print(f"{'mode':>11} {'upload s':>9} {'disk MiB':>9} {'first read ms':>14} {'median read ms':>15}")
+    results = {}
+    runs = [("extract", workers) for workers in args.workers] + [("archive", 1)]
+    for mode, workers in runs:
+        label = f"{mode}/{workers}" if mode == "extract" else mode
+        result = results[mode] = measure(mode, archive, names, min(args.reads, args.files - 1), workers)
+        print(f"{label:>11} {result['upload_s']:>9.2f} {result['disk_mib']:>9.1f} "
+              f"{result['first_ms']:>14.2f} {result['read_ms']:>15.3f}")
+
+    if results["archive"]["read_ms"] > args.max_read_ms:
+        print(f"FAIL: median first read from the archive above {args.max_read_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+-- One-off upgrade for databases created before the backend applied migrations itself.
+-- init.sql only hands the tables to triage_backend on a fresh volume; older volumes still
+-- have them owned by postgres, so the migrations fail with "must be owner of table".
+-- Run once as the superuser, e.g.:
+--   docker compose exec -T db psql -v ON_ERROR_STOP=1 -U postgres -d triage_database < backend/fix-table-ownership.sql
+ALTER TABLE users OWNER TO triage_backend;
+ALTER TABLE sessions OWNER TO triage_backend;
+ALTER TABLE projects OWNER TO triage_backend;
+ALTER TABLE mutants OWNER TO triage_backend;
+ALTER TABLE rating OWNER TO triage_backend;
+ALTER TABLE project_assignments OWNER TO triage_backend;
+ALTER TABLE form_fields OWNER TO triage_backend;
+ALTER TABLE form_field_values OWNER TO triage_backend;
+
+-- Created by the migrations; only present if they were applied as another user
+ALTER TABLE IF EXISTS schema_migrations OWNER TO triage_backend;
+ALTER TABLE IF EXISTS project_progress OWNER TO triage_backend;
+ALTER TABLE IF EXISTS project_user_progress OWNER TO triage_backend;
+ALTER TABLE IF EXISTS jobs OWNER TO triage_backend;
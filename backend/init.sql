@@ -82,5 +82,17 @@ CREATE TABLE form_field_values(
 GRANT ALL ON ALL TABLES IN SCHEMA public TO triage_backend;
 GRANT ALL ON ALL SEQUENCES IN SCHEMA public TO triage_backend;
 
+-- The backend applies the versioned migrations in backend/migrations on startup,
+-- which requires owning the tables (e.g. for CREATE INDEX).
+-- Databases created before this run fix-table-ownership.sql once instead.
+ALTER TABLE users OWNER TO triage_backend;
+ALTER TABLE sessions OWNER TO triage_backend;
+ALTER TABLE projects OWNER TO triage_backend;
+ALTER TABLE mutants OWNER TO triage_backend;
+ALTER TABLE rating OWNER TO triage_backend;
+ALTER TABLE project_assignments OWNER TO triage_backend;
+ALTER TABLE form_fields OWNER TO triage_backend;
+ALTER TABLE form_field_values OWNER TO triage_backend;
+
 -- Populate tables with default admin and password 'admin'
 INSERT INTO users (username, password_hash, is_admin) VALUES ('admin', '$2b$12$mAaZcN1wyllVVG1lsZ/zZOgMaXWowN6A6zq96bExBX.C7WpkuDc/W', TRUE);
@@ -0,0 +1,28 @@
+-- Secondary indexes for the hot query paths.
+-- Foreign keys in init.sql are not indexed, so every per-project, per-user
+-- and per-rating lookup used to scan the whole table.
+
+-- Project listings, counts, ranking input and the ranked mutant list
+CREATE INDEX IF NOT EXISTS mutants_project_ranking_idx
+    ON mutants (project_id, ranking DESC, id);
+
+-- Per-user review counts; covers rating -> mutant joins without touching the heap
+CREATE INDEX IF NOT EXISTS rating_user_mutant_idx
+    ON rating (user_id, mutant_id);
+
+-- Field values of a rating (export, rating lookup, upsert)
+CREATE INDEX IF NOT EXISTS form_field_values_rating_idx
+    ON form_field_values (rating_id);
+
+-- Cascading deletes of form fields
+CREATE INDEX IF NOT EXISTS form_field_values_form_field_idx
+    ON form_field_values (form_field_id);
+
+-- Users of a project; the primary key only covers lookups by user
+CREATE INDEX IF NOT EXISTS project_assignments_project_user_idx
+    ON project_assignments (project_id, user_id);
+
+-- Session invalidation by user
+CREATE INDEX IF NOT EXISTS sessions_user_idx
+    ON sessions (user_id);
+
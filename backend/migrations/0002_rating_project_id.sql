@@ -0,0 +1,32 @@
+-- Store the (immutable) project of a rating's mutant on the rating itself.
+-- Project-scoped rating queries (progress, export, rating lists) can then use
+-- an index on rating instead of joining every rating of the database to mutants.
+
+ALTER TABLE rating ADD COLUMN IF NOT EXISTS project_id INTEGER;
+
+UPDATE rating r
+SET project_id = m.project_id
+FROM mutants m
+WHERE m.id = r.mutant_id AND r.project_id IS NULL;
+
+ALTER TABLE rating ALTER COLUMN project_id SET NOT NULL;
+
+CREATE OR REPLACE FUNCTION rating_set_project_id() RETURNS trigger AS $$
+BEGIN
+    SELECT project_id INTO NEW.project_id FROM mutants WHERE id = NEW.mutant_id;
+    IF NEW.project_id IS NULL THEN
+        RAISE EXCEPTION 'mutant % does not exist', NEW.mutant_id
+            USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rating_set_project_id ON rating;
+CREATE TRIGGER rating_set_project_id
+    BEFORE INSERT OR UPDATE OF mutant_id ON rating
+    FOR EACH ROW EXECUTE FUNCTION rating_set_project_id();
+
+-- Ratings of a project, optionally narrowed to one reviewer
+CREATE INDEX IF NOT EXISTS rating_project_user_mutant_idx
+    ON rating (project_id, user_id, mutant_id);
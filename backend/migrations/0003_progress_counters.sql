@@ -0,0 +1,38 @@
+-- Materialized review progress, so dashboards read a few counter rows instead of
+-- counting over mutants and rating on every request.
+--
+-- Maintained by the repositories in the same transaction as the write they count
+-- (ProjectRepository.create, MutantRepository.create_many, RatingRepository.create/
+-- upsert/delete); rows of deleted projects and users go away by cascade.
+-- ProgressRepository.rebuild_project recomputes them from scratch.
+
+CREATE TABLE IF NOT EXISTS project_progress (
+    project_id INTEGER PRIMARY KEY REFERENCES projects(id) ON DELETE CASCADE,
+    total_mutants INTEGER DEFAULT 0 NOT NULL,
+    -- Mutants with at least one rating from any reviewer
+    rated_mutants INTEGER DEFAULT 0 NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS project_user_progress (
+    project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    reviewed_mutants INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (project_id, user_id)
+);
+
+-- Reviews of one user across all projects
+CREATE INDEX IF NOT EXISTS project_user_progress_user_idx
+    ON project_user_progress (user_id);
+
+INSERT INTO project_progress (project_id, total_mutants, rated_mutants)
+SELECT p.id,
+       (SELECT COUNT(*) FROM mutants m WHERE m.project_id = p.id),
+       (SELECT COUNT(DISTINCT r.mutant_id) FROM rating r WHERE r.project_id = p.id)
+FROM projects p
+ON CONFLICT (project_id) DO NOTHING;
+
+INSERT INTO project_user_progress (project_id, user_id, reviewed_mutants)
+SELECT project_id, user_id, COUNT(*)
+FROM rating
+GROUP BY project_id, user_id
+ON CONFLICT (project_id, user_id) DO NOTHING;
@@ -0,0 +1,4 @@
+-- Username prefix search on the admin users page (LIKE 'prefix%').
+-- The unique index on username only serves LIKE under the C collation.
+CREATE INDEX IF NOT EXISTS users_username_pattern_idx
+    ON users (username text_pattern_ops);
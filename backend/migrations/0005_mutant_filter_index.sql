@@ -0,0 +1,4 @@
+-- Filtered counts of the paginated mutant list (status, mutator, sourceFile prefix,
+-- rated/unrated) answered from the index alone, without visiting the heap.
+CREATE INDEX IF NOT EXISTS mutants_project_filter_idx
+    ON mutants (project_id, status, mutator) INCLUDE (sourcefile, id);
@@ -0,0 +1,4 @@
+-- Ratings of a project in export order, so the streaming export can read them
+-- through a cursor without sorting the whole project first.
+CREATE INDEX IF NOT EXISTS rating_project_mutant_idx
+    ON rating (project_id, mutant_id, id);
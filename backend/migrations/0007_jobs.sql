@@ -0,0 +1,34 @@
+-- Background jobs for long-running admin operations (project import, source upload,
+-- ranking, export). Jobs run in the process that accepted them; the row is how
+-- other processes and clients follow them.
+--
+-- A running process refreshes heartbeat_at of its jobs; jobs whose heartbeat stops
+-- (the process died) are failed by the next process that looks.
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id SERIAL PRIMARY KEY,
+    type TEXT NOT NULL,
+    status TEXT DEFAULT 'queued' NOT NULL
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+    project_id INTEGER REFERENCES projects(id) ON DELETE SET NULL,
+    created_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    params JSONB DEFAULT '{}' NOT NULL,
+    progress_current BIGINT DEFAULT 0 NOT NULL,
+    -- NULL while the amount of work is unknown
+    progress_total BIGINT,
+    result JSONB,
+    error TEXT,
+    cancel_requested BOOLEAN DEFAULT FALSE NOT NULL,
+    -- Process running the job
+    owner TEXT NOT NULL,
+    heartbeat_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Job listing, newest first
+CREATE INDEX IF NOT EXISTS jobs_created_idx ON jobs (created_at DESC, id DESC);
+
+-- Unfinished jobs, for heartbeats and stale job detection
+CREATE INDEX IF NOT EXISTS jobs_active_idx ON jobs (owner) WHERE status IN ('queued', 'running');
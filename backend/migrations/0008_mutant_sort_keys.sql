@@ -0,0 +1,17 @@
+-- Incremental re-ranking. Algorithms that declare a sort key store it per mutant;
+-- positions are then derived from the stored keys, so a later run only computes
+-- keys for mutants that have none (new mutants, or ones whose key was cleared
+-- because their ranking inputs changed) instead of re-ranking the whole project.
+--
+-- projects.ranking_algorithm / ranking_algorithm_version record the algorithm id
+-- and version that produced the current ordering; stored keys are only reused
+-- while both match.
+
+ALTER TABLE mutants ADD COLUMN IF NOT EXISTS sort_key BYTEA;
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS ranking_algorithm TEXT;
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS ranking_algorithm_version INTEGER;
+
+-- Positions in key order, and the mutants still waiting for a key
+CREATE INDEX IF NOT EXISTS mutants_project_sort_key_idx
+    ON mutants (project_id, sort_key, id);
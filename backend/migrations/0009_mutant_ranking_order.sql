@@ -0,0 +1,7 @@
+-- Algorithms give ranking 0 to the mutant to review first, so the ranked mutant list,
+-- the next-mutant lookup and the adaptive ranking read mutants in (ranking, id) order.
+-- Replaces the (ranking DESC, id) index of 0001, which only serves the reverse order.
+CREATE INDEX IF NOT EXISTS mutants_project_ranking_asc_idx
+    ON mutants (project_id, ranking, id);
+
+DROP INDEX IF EXISTS mutants_project_ranking_idx;
@@ -0,0 +1,5 @@
+-- ranking_algorithm_version now also records a hash of the algorithm's file, so
+-- stored sort keys are not reused after the file was edited and hot-reloaded.
+-- Versions recorded before never match the new ones: the next run is a full one.
+ALTER TABLE projects ALTER COLUMN ranking_algorithm_version TYPE TEXT
+    USING ranking_algorithm_version::text;
@@ -0,0 +1,174 @@
+import asyncio
+import importlib.util
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; the memory ceiling is then not enforced
+    resource = None
+
+from .config import config
+
+# How often a supervising thread checks whether its ranking was cancelled
+POLL_INTERVAL = 0.1
+
+
+class AlgorithmRunnerError(Exception):
+    """Raised when a ranking strategy fails, times out, runs out of memory or crashes its worker."""
+    pass
+
+
+# What a worker computes: the ranked mutant ids, or the encoded sort key of every mutant
+RANK = "rank"
+SORT_KEYS = "sort_keys"
+
+
+def _execute(operation: str, module_path: str, module_name: str, class_name: str, batch) -> list:
+    """Load the strategy class from its module file and apply `operation` to the batch with it."""
+    from algorithms.base import encode_sort_keys
+
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    strategy = getattr(module, class_name)()
+
+    if operation == SORT_KEYS:
+        columns = strategy.sort_key(batch)
+        if columns is None:
+            raise TypeError(f"{class_name} does not define a sort key")
+        return encode_sort_keys(columns)
+    order = np.asarray(strategy.rank_batch(batch))
+    return batch.id[order].tolist()
+
+
+def _run_strategy(conn, operation: str, module_path: str, module_name: str, class_name: str,
+                  batch, memory_limit_mb: Optional[int]) -> None:
+    """Worker process: run one strategy and send back ("ok", result) or ("error", message)."""
+    try:
+        if memory_limit_mb and resource is not None:
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        conn.send(("ok", _execute(operation, module_path, module_name, class_name, batch)))
+    except MemoryError:
+        conn.send(("error", f"exceeded the memory limit of {memory_limit_mb} MB"))
+    except BaseException as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class AlgorithmRunner:
+    """
+    Runs ranking strategies in worker processes, so a slow or broken strategy cannot
+    block the event loop or take the server down.
+
+    At most `workers` strategies run at once; further rankings wait for a free slot.
+    Every ranking gets a fresh process (forkserver where available), which is killed
+    when it exceeds its timeout or is cancelled, and which has its address space
+    capped at the memory limit. With workers=0 strategies run inline on the event
+    loop, without timeout or memory limit.
+    """
+
+    def __init__(self, workers: int, timeout: float, memory_limit_mb: int):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.crashes = 0
+        self.timeouts = 0
+        self._executor = None
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+    async def rank(self, module_path: str, module_name: str, class_name: str, batch,
+                   timeout: Optional[float] = None, memory_limit_mb: Optional[int] = None) -> List[int]:
+        """
+        Rank `batch` (an algorithms.base.MutantBatch) with the strategy class `class_name`
+        of the module at `module_path`. Returns the ranked mutant ids.
+
+        Raises AlgorithmRunnerError if the strategy raises, times out or its worker dies.
+        """
+        return await self._run(RANK, module_path, module_name, class_name, batch, timeout, memory_limit_mb)
+
+    async def sort_keys(self, module_path: str, module_name: str, class_name: str, batch,
+                        timeout: Optional[float] = None, memory_limit_mb: Optional[int] = None) -> List[bytes]:
+        """
+        Like rank(), but returns the encoded sort key (see algorithms.base.encode_sort_keys)
+        of every mutant of the batch, in batch order.
+        """
+        return await self._run(SORT_KEYS, module_path, module_name, class_name, batch, timeout, memory_limit_mb)
+
+    async def _run(self, operation, module_path, module_name, class_name, batch, timeout, memory_limit_mb) -> list:
+        timeout = timeout or self.timeout
+        memory_limit_mb = memory_limit_mb or self.memory_limit_mb
+        if self.workers <= 0:
+            try:
+                return _execute(operation, module_path, module_name, class_name, batch)
+            except Exception as e:
+                raise AlgorithmRunnerError(f"{type(e).__name__}: {e}") from e
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ranking")
+
+        cancelled = threading.Event()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._supervise, operation, module_path, module_name, class_name,
+                batch, timeout, memory_limit_mb, cancelled
+            )
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def _supervise(self, operation, module_path, module_name, class_name, batch, timeout, memory_limit_mb,
+                   cancelled: threading.Event) -> list:
+        """Runs on a supervisor thread: start the worker process and wait for its answer."""
+        parent, child = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_run_strategy,
+            args=(child, operation, module_path, module_name, class_name, batch, memory_limit_mb),
+            daemon=True
+        )
+        process.start()
+        child.close()
+        try:
+            deadline = time.monotonic() + timeout
+            # The pipe also becomes readable when the worker dies without answering
+            while not parent.poll(POLL_INTERVAL):
+                if cancelled.is_set():
+                    raise AlgorithmRunnerError("Ranking was cancelled")
+                if time.monotonic() >= deadline:
+                    self.timeouts += 1
+                    raise AlgorithmRunnerError(f"Ranking timed out after {timeout:g} seconds")
+            try:
+                status, value = parent.recv()
+            except (EOFError, OSError):
+                process.join(timeout=1)
+                self.crashes += 1
+                raise AlgorithmRunnerError(
+                    f"Ranking worker crashed (exit code {process.exitcode}); "
+                    f"it may have exceeded the memory limit of {memory_limit_mb} MB"
+                )
+            if status != "ok":
+                raise AlgorithmRunnerError(value)
+            return value
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join(timeout=1)
+            parent.close()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Create a singleton instance to be imported by other modules
+algorithm_runner = AlgorithmRunner(
+    config.ALGORITHM_WORKERS, config.ALGORITHM_TIMEOUT, config.ALGORITHM_MEMORY_LIMIT_MB
+)
@@ -13,5 +13,51 @@ class Config:
     DB_USER: str = os.getenv("DB_USER", "triage_backend")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "password")
     STORAGE_ROOT: str = os.getenv("STORAGE_ROOT", "./source")
+    # How mutants are bulk loaded: "copy" (binary COPY) or "insert" (batched multi-row INSERT)
+    MUTANT_LOAD_METHOD: str = os.getenv("MUTANT_LOAD_METHOD", "copy")
+    # Per-process cache of session token -> user; a TTL of 0 disables it.
+    # Changes made through another worker process become visible after at most the TTL.
+    SESSION_CACHE_SIZE: int = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+    SESSION_CACHE_TTL: float = float(os.getenv("SESSION_CACHE_TTL", "30"))
+    # How uploaded source archives are stored: "extract" (every file on disk), "archive"
+    # (the archive itself, members read on demand) or "blobs" (Java files stored once by
+    # content hash and shared between projects)
+    SOURCE_STORAGE: str = os.getenv("SOURCE_STORAGE", "extract")
+    # Largest source archive accepted as a streamed request body, in bytes (compressed;
+    # the uncompressed contents have a limit of their own)
+    SOURCE_MAX_UPLOAD_SIZE: int = int(os.getenv("SOURCE_MAX_UPLOAD_SIZE", str(512 * 1024 * 1024)))
+    # Threads extracting one uploaded source archive
+    SOURCE_EXTRACT_WORKERS: int = int(os.getenv("SOURCE_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Per-process LRU cache of decoded source files, bounded in bytes; 0 disables it.
+    # Cached files are served without checking the filesystem for REVALIDATE seconds.
+    SOURCE_CACHE_BYTES: int = int(os.getenv("SOURCE_CACHE_BYTES", str(64 * 1024 * 1024)))
+    SOURCE_CACHE_REVALIDATE: float = float(os.getenv("SOURCE_CACHE_REVALIDATE", "5"))
+    # bcrypt threads and how many more password operations may wait for one before
+    # requests are turned away with 503; 0 workers hashes inline on the event loop
+    BCRYPT_WORKERS: int = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    BCRYPT_MAX_QUEUE: int = int(os.getenv("BCRYPT_MAX_QUEUE", "32"))
+    # Seconds between rebuilds of the review progress counters; 0 disables the job
+    PROGRESS_RECONCILE_INTERVAL: float = float(os.getenv("PROGRESS_RECONCILE_INTERVAL", "3600"))
+    # Background jobs: how many may run at once per job type and process ("type=limit,...";
+    # unlisted types run one at a time), seconds between heartbeats, seconds without a
+    # heartbeat after which a job counts as dead, and seconds finished jobs are kept
+    JOB_CONCURRENCY: str = os.getenv(
+        "JOB_CONCURRENCY", "project_import=1,source_upload=2,ranking=2,export=2"
+    )
+    JOB_HEARTBEAT_INTERVAL: float = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "2"))
+    JOB_STALE_AFTER: float = float(os.getenv("JOB_STALE_AFTER", "60"))
+    JOB_RETENTION: float = float(os.getenv("JOB_RETENTION", "86400"))
+    # Ranking algorithms run in worker processes: how many at once, and the wall-clock
+    # timeout (seconds) and memory ceiling (MB) of each run unless the algorithm sets
+    # its own; 0 workers ranks inline on the event loop without either limit
+    ALGORITHM_WORKERS: int = int(os.getenv("ALGORITHM_WORKERS", str(min(2, os.cpu_count() or 1))))
+    ALGORITHM_TIMEOUT: float = float(os.getenv("ALGORITHM_TIMEOUT", "60"))
+    ALGORITHM_MEMORY_LIMIT_MB: int = int(os.getenv("ALGORITHM_MEMORY_LIMIT_MB", "1024"))
+    # Warm adaptive ranking models kept per process: how many projects at most, seconds
+    # after which a model is rebuilt to pick up ratings made by other processes, and the
+    # minimum seconds between re-sorts of a large project after new ratings
+    ADAPTIVE_RANKING_PROJECTS: int = int(os.getenv("ADAPTIVE_RANKING_PROJECTS", "16"))
+    ADAPTIVE_RANKING_TTL: float = float(os.getenv("ADAPTIVE_RANKING_TTL", "300"))
+    ADAPTIVE_RANKING_REFRESH_INTERVAL: float = float(os.getenv("ADAPTIVE_RANKING_REFRESH_INTERVAL", "2"))
 
 config = Config()
@@ -1,6 +1,30 @@
 import asyncpg
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from .config import config
 
+# Connection bound by Database.transaction() for the current task
+_transaction_connection: ContextVar = ContextVar("transaction_connection", default=None)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so that `value` matches literally, e.g. in `LIKE escape_like(prefix) || '%'`."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _BoundConnection:
+    """Async context manager that hands out an already acquired connection without releasing it."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
 class Database:
     def __init__(self):
         self.pool = None
@@ -29,10 +53,37 @@ class Database:
         """
         Helper method to get a connection from the pool.
         Usage: async with db.acquire() as conn: ...
+
+        Inside a `db.transaction()` block the transaction's connection is returned instead.
         """
         if not self.pool:
             raise Exception("Database is not connected. Call connect() first.")
+        conn = _transaction_connection.get()
+        if conn is not None:
+            return _BoundConnection(conn)
         return self.pool.acquire()
 
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Runs every repository call made inside the block on one connection and one transaction.
+        Usage: async with db.transaction(): ...
+
+        Nested blocks become savepoints of the outer transaction.
+        """
+        conn = _transaction_connection.get()
+        if conn is not None:
+            async with conn.transaction():
+                yield conn
+            return
+
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                token = _transaction_connection.set(conn)
+                try:
+                    yield conn
+                finally:
+                    _transaction_connection.reset(token)
+
 # Create a singleton instance to be imported by other modules
 db = Database()
@@ -0,0 +1,107 @@
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import asyncpg
+
+from .database import Database
+
+# backend/migrations, next to init.sql
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "migrations"
+
+# Arbitrary key for the advisory lock that serializes concurrent migration runs
+MIGRATION_LOCK_ID = 7_301_924
+
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+
+def discover_migrations(migrations_dir: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Find all migration files, ordered by version.
+    Files are named <version>_<name>.sql, e.g. 0001_hot_path_indexes.sql.
+    """
+    migrations = []
+    for path in migrations_dir.glob("*.sql"):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            raise ValueError(f"Invalid migration file name: {path.name}")
+        migrations.append(Migration(version=int(match.group(1)), name=match.group(2), path=path))
+
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Duplicate migration versions found")
+    return migrations
+
+
+async def apply_migrations(database: Database, migrations_dir: Path = MIGRATIONS_DIR) -> List[int]:
+    """
+    Apply all pending migrations, each in its own transaction.
+    Call this on startup in main.py after db.connect().
+
+    Returns the versions that were applied.
+    """
+    applied_now = []
+    async with database.acquire() as conn:
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+            )
+            """
+        )
+        # Several workers may start at once; only one of them migrates
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+        try:
+            applied = {
+                row["version"]
+                for row in await conn.fetch("SELECT version FROM schema_migrations")
+            }
+            for migration in discover_migrations(migrations_dir):
+                if migration.version in applied:
+                    continue
+                try:
+                    async with conn.transaction():
+                        await conn.execute(migration.path.read_text(encoding="utf-8"))
+                        await conn.execute(
+                            "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+                            migration.version, migration.name
+                        )
+                except asyncpg.InsufficientPrivilegeError as e:
+                    # Tables created by an older init.sql are still owned by postgres
+                    raise RuntimeError(
+                        f"Migration {migration.version:04d}_{migration.name} failed: {e}. "
+                        "Hand the tables to the backend user once with backend/fix-table-ownership.sql, "
+                        "or apply the migrations as the table owner: "
+                        "DB_USER=postgres python -m core.migrations"
+                    ) from e
+                print(f"Applied migration {migration.version:04d}_{migration.name}")
+                applied_now.append(migration.version)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+    return applied_now
+
+
+if __name__ == "__main__":
+    # Apply migrations manually, e.g. as the table owner: DB_USER=postgres python -m core.migrations
+    import asyncio
+    from .database import db
+
+    async def _main():
+        await db.connect()
+        try:
+            await apply_migrations(db)
+        finally:
+            await db.disconnect()
+
+    asyncio.run(_main())
@@ -1,7 +1,69 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from .config import config
+
+
 def hash_password(password):
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 def verify_password(password, hash):
     return bcrypt.checkpw(password.encode(), hash.encode())
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many password hash operations are already running or queued."""
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool instead of the event loop.
+    bcrypt releases the GIL while hashing, so other requests keep being served.
+
+    At most `workers` hashes run at once and at most `max_queue` more wait for a
+    worker; anything beyond that is rejected with PasswordHasherBusyError rather
+    than piling up. With workers=0 hashing runs inline on the event loop.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = None
+
+    async def run(self, func, *args):
+        if self.workers <= 0:
+            return func(*args)
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusyError("Too many password operations in progress")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Create a singleton instance to be imported by other modules
+password_hasher = PasswordHasher(config.BCRYPT_WORKERS, config.BCRYPT_MAX_QUEUE)
+
+
+async def hash_password_async(password):
+    """hash_password on the bcrypt pool. Raises PasswordHasherBusyError when it is saturated."""
+    return await password_hasher.run(hash_password, password)
+
+async def verify_password_async(password, hash):
+    """verify_password on the bcrypt pool. Raises PasswordHasherBusyError when it is saturated."""
+    return await password_hasher.run(verify_password, password, hash)
@@ -0,0 +1,127 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .config import config
+
+
+def _token_key(token: str) -> str:
+    # Raw tokens are never kept in memory longer than a request
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class SessionCache:
+    """
+    Bounded LRU cache of session token -> user, with a TTL.
+
+    Entries are keyed by the SHA-256 of the token. Each process has its own cache,
+    so changes made through another worker become visible after at most `ttl` seconds;
+    changes made through this process are applied at once via the invalidate methods.
+
+    Usage:
+        generation = session_cache.generation
+        user = session_cache.get(token)
+        if user is None:
+            user = ...load from the database...
+            session_cache.put(token, user, generation=generation)
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        # Bumped on every invalidation; put() drops values loaded before the latest one
+        self.generation = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, token: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, user_id, value = entry
+        if expires <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, token: str, user_id: int, value: Any, generation: int,
+            session_expires_at: Optional[datetime] = None) -> None:
+        """Cache `value` for `token`, unless something was invalidated since `generation` was read."""
+        if not self.enabled or generation != self.generation:
+            return
+        expires = time.monotonic() + self.ttl
+        if session_expires_at is not None:
+            # Never serve a session past its own expiry
+            remaining = (session_expires_at - datetime.now()).total_seconds()
+            expires = min(expires, time.monotonic() + remaining)
+
+        key = _token_key(token)
+        self._remove(key)
+        self._entries[key] = (expires, user_id, value)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        self._remove(_token_key(token))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached session of a user."""
+        self.generation += 1
+        self.invalidations += 1
+        for key in list(self._keys_by_user.get(user_id, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[1])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[1]]
+
+
+# Create a singleton instance to be imported by other modules
+session_cache = SessionCache(config.SESSION_CACHE_SIZE, config.SESSION_CACHE_TTL)
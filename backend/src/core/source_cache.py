@@ -0,0 +1,152 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from .config import config
+
+# (project id, path of the file within the project's sources)
+SourceKey = Tuple[int, str]
+# (mtime in ns, size) of a source file when it was read
+FileVersion = Tuple[int, int]
+
+
+class SourceCache:
+    """
+    Byte-bounded LRU cache of decoded source files, keyed by project and path.
+
+    Each entry remembers the mtime and size of the file it was read from. get_recent()
+    serves an entry without touching the filesystem for `revalidate_after` seconds
+    after it was read or last checked; after that, get() serves it only if the file's
+    current version still matches. Uploads and deletions through this process drop a
+    project's entries at once via invalidate_project(); changes made through another
+    worker process are noticed within `revalidate_after` seconds.
+
+    Source files are read in worker threads, so all methods take a lock.
+
+    Usage:
+        content = source_cache.get_recent(project_id, path)
+        if content is None:
+            generation = source_cache.generation
+            version = ...mtime and size of the file...
+            content = source_cache.get(project_id, path, version)
+            if content is None:
+                content = ...read the file...
+                source_cache.put(project_id, path, version, content, generation=generation)
+    """
+
+    def __init__(self, max_bytes: int, revalidate_after: float):
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        # Bumped on every invalidation; put() drops content read before the latest one
+        self.generation = 0
+        self.size_bytes = 0
+        self._entries: "OrderedDict[SourceKey, Tuple[FileVersion, float, int, str]]" = OrderedDict()
+        self._keys_by_project: Dict[int, Set[SourceKey]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get_recent(self, project_id: int, path: str) -> Optional[str]:
+        """
+        The cached content of a file if it was read or checked within `revalidate_after`
+        seconds, without touching the filesystem. Otherwise None, and the caller should
+        get() it with the file's version; only that lookup counts as a miss.
+        """
+        if not self.enabled:
+            return None
+        key = (project_id, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] + self.revalidate_after <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def get(self, project_id: int, path: str, version: FileVersion) -> Optional[str]:
+        """The cached content of a file, if it is still at `version`."""
+        if not self.enabled:
+            return None
+        key = (project_id, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries[key] = (version, time.monotonic(), entry[2], entry[3])
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def put(self, project_id: int, path: str, version: FileVersion, content: str, generation: int) -> None:
+        """Cache `content` of a file, unless something was invalidated since `generation` was read."""
+        size = sys.getsizeof(content)
+        if not self.enabled or size > self.max_bytes:
+            return
+        key = (project_id, path)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = (version, time.monotonic(), size, content)
+            self._keys_by_project.setdefault(project_id, set()).add(key)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_project(self, project_id: int) -> None:
+        """Drop every cached file of a project, e.g. when its sources are replaced."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            for key in list(self._keys_by_project.get(project_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_project.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "files": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "revalidate_after_seconds": self.revalidate_after,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: SourceKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size_bytes -= entry[2]
+        project_keys = self._keys_by_project.get(key[0])
+        if project_keys is not None:
+            project_keys.discard(key)
+            if not project_keys:
+                del self._keys_by_project[key[0]]
+
+
+# Create a singleton instance to be imported by other modules
+source_cache = SourceCache(config.SOURCE_CACHE_BYTES, config.SOURCE_CACHE_REVALIDATE)
@@ -17,5 +17,13 @@ class FileStorage:
     def get_project_path(self, project_id: int) -> Path:
         return self.root_path / str(project_id)
 
+    def get_blob_root(self) -> Path:
+        """Source files stored once by content hash, shared by all projects."""
+        return self.root_path / "blobs"
+
+    def get_job_path(self, job_id: int) -> Path:
+        """Working directory of a background job (staged uploads, export files)."""
+        return self.root_path / "jobs" / str(job_id)
+
 # Singleton instance
 storage = FileStorage()
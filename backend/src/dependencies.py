@@ -2,6 +2,9 @@ from fastapi import Request
 
 from core.database import db
 from core.storage import storage
+from core.session_cache import session_cache
+from core.source_cache import source_cache
+from core.algorithm_runner import algorithm_runner
 from repositories.user_repository import UserRepository
 from repositories.session_repository import SessionRepository
 from repositories.project_repository import ProjectRepository
@@ -10,6 +13,7 @@ from repositories.form_field_repository import FormFieldRepository
 from repositories.form_field_value_repository import FormFieldValueRepository
 from repositories.rating_repository import RatingRepository
 from repositories.export_repository import ExportRepository
+from repositories.progress_repository import ProgressRepository
 from repositories.source_code_repository import SourceCodeRepository
 from services.source_code import SourceCodeService
 from services.auth import AuthService
@@ -18,6 +22,10 @@ from services.mutant import MutantService
 from services.form_field import FormFieldService
 from services.export import ExportService
 from services.algorithm import AlgorithmService
+from services.algorithm_registry import algorithm_registry
+from services.progress import ProgressService
+from services.jobs import JobQueue, job_queue
+from services.adaptive_ranking import AdaptiveRanker, adaptive_ranker
 from repositories import http_responses
 from models.auth import UserResponse
 
@@ -54,8 +62,12 @@ def get_rating_repository() -> RatingRepository:
 def get_export_repository() -> ExportRepository:
     return ExportRepository(db)
 
+
+def get_progress_repository() -> ProgressRepository:
+    return ProgressRepository(db)
+
 def get_source_code_repository() -> SourceCodeRepository:
-    return SourceCodeRepository(storage)
+    return SourceCodeRepository(storage, source_cache)
 
 
 # Service factories
@@ -63,7 +75,8 @@ def get_auth_service() -> AuthService:
     return AuthService(
         user_repository=get_user_repository(),
         session_repository=get_session_repository(),
-        rating_repository=get_rating_repository()
+        rating_repository=get_rating_repository(),
+        session_cache=session_cache
     )
 
 
@@ -80,7 +93,9 @@ def get_mutant_service() -> MutantService:
         project_repository=get_project_repository(),
         mutant_repository=get_mutant_repository(),
         form_field_repository=get_form_field_repository(),
-        rating_repository=get_rating_repository()
+        rating_repository=get_rating_repository(),
+        form_field_value_repository=get_form_field_value_repository(),
+        source_code_service=get_source_code_service()
     )
 
 
@@ -89,7 +104,8 @@ def get_form_field_service() -> FormFieldService:
         form_field_repository=get_form_field_repository(),
         form_field_value_repository=get_form_field_value_repository(),
         rating_repository=get_rating_repository(),
-        project_repository=get_project_repository()
+        project_repository=get_project_repository(),
+        ranker=adaptive_ranker
     )
 
 
@@ -103,12 +119,30 @@ def get_export_service() -> ExportService:
 def get_algorithm_service() -> AlgorithmService:
     return AlgorithmService(
         mutant_repository=get_mutant_repository(),
-        project_repository=get_project_repository()
+        project_repository=get_project_repository(),
+        runner=algorithm_runner,
+        registry=algorithm_registry,
+        ranker=adaptive_ranker
     )
 
+def get_progress_service() -> ProgressService:
+    return ProgressService(
+        progress_repository=get_progress_repository()
+    )
+
+
+def get_job_queue() -> JobQueue:
+    return job_queue
+
+
+def get_adaptive_ranker() -> AdaptiveRanker:
+    return adaptive_ranker
+
+
 def get_source_code_service() -> SourceCodeService:
     return SourceCodeService(
-        repository=get_source_code_repository()
+        repository=get_source_code_repository(),
+        mutant_repository=get_mutant_repository()
     )
 
 def get_project_service() -> ProjectService:
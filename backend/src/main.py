@@ -1,13 +1,22 @@
 import os
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from core.algorithm_runner import algorithm_runner
+from core.config import config
 from core.database import db
+from core.migrations import apply_migrations
+from core.security import password_hasher
 from core.storage import storage
 from services import auth
+from services.progress import run_reconciliation
+from services.jobs import job_queue, run_job_maintenance
+from services.algorithm_registry import algorithm_registry
+from dependencies import get_progress_service
 from repositories import http_responses
-from routers import admin, login, projects, user, mutants, form_fields, ratings, export, algorithms
+from routers import admin, login, projects, user, mutants, form_fields, ratings, export, algorithms, jobs
 
 DEBUG_LOGGING = os.getenv("DEBUG_LOGGING", "false").lower() == "true"
 
@@ -18,8 +27,22 @@ if DEBUG_LOGGING:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db.connect()
+    await apply_migrations(db)
     storage.setup()
+    algorithm_registry.reload()
+    reconciliation = None
+    if config.PROGRESS_RECONCILE_INTERVAL > 0:
+        reconciliation = asyncio.create_task(
+            run_reconciliation(get_progress_service(), config.PROGRESS_RECONCILE_INTERVAL)
+        )
+    job_maintenance = asyncio.create_task(run_job_maintenance(job_queue, config.JOB_HEARTBEAT_INTERVAL))
     yield
+    if reconciliation:
+        reconciliation.cancel()
+    job_maintenance.cancel()
+    await job_queue.shutdown()
+    password_hasher.shutdown()
+    algorithm_runner.shutdown()
     await db.disconnect()
 
 app = FastAPI(lifespan=lifespan)
@@ -50,6 +73,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination headers of the mutant list
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
 app.include_router(admin.router)
@@ -61,3 +86,4 @@ app.include_router(form_fields.router)
 app.include_router(ratings.router)
 app.include_router(export.router)
 app.include_router(algorithms.router)
+app.include_router(jobs.router)
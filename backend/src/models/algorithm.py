@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List
 
 
 class AlgorithmInfo(BaseModel):
@@ -14,12 +14,25 @@ class AlgorithmListResponse(BaseModel):
     algorithms: List[AlgorithmInfo]
 
 
+class AlgorithmReloadResponse(BaseModel):
+    """Result of rescanning the algorithms directory."""
+    added: List[str]
+    updated: List[str]
+    removed: List[str]
+    failed: Dict[str, str] = Field(description="File name -> error for files that failed to load")
+    algorithms: List[AlgorithmInfo]
+
+
 class ApplyAlgorithmRequest(BaseModel):
     """Request to apply a ranking algorithm to a project."""
     algorithm: str = Field(
         min_length=1,
         description="ID of the algorithm to apply"
     )
+    full: bool = Field(
+        default=False,
+        description="Recompute every mutant even if the ordering could be updated incrementally"
+    )
 
 
 class ApplyAlgorithmResponse(BaseModel):
@@ -27,4 +40,6 @@ class ApplyAlgorithmResponse(BaseModel):
     success: bool
     algorithm_name: str
     mutants_ranked: int
+    mutants_changed: int = 0
+    incremental: bool = False
     message: str
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+JobStatus = Literal['queued', 'running', 'succeeded', 'failed', 'cancelled']
+
+
+class JobResponse(BaseModel):
+    id: int
+    type: str
+    status: JobStatus
+    project_id: Optional[int]
+    created_by: Optional[int]
+    params: dict
+    progress_current: int
+    # None while the amount of work is unknown
+    progress_total: Optional[int]
+    result: Optional[dict]
+    error: Optional[str]
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
@@ -1,6 +1,9 @@
 from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal
 
+from models.form_field import FormFieldResponse, RatingWithValuesResponse
+from models.source_code import SourceCodeResponse
+
 
 class MutantResponse(BaseModel):
     id: int
@@ -35,6 +38,49 @@ class MutantOverviewResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+MutantStatus = Literal['KILLED', 'SURVIVED', 'NO_COVERAGE', 'NON_VIABLE', 'TIMED_OUT', 'MEMORY_ERROR', 'RUN_ERROR']
+
+
+class MutantListFilter(BaseModel):
+    status: Optional[MutantStatus] = None
+    mutator: Optional[str] = None
+    source_file_prefix: Optional[str] = None
+    # True: only mutants the user rated, False: only those they did not
+    rated: Optional[bool] = None
+
+
+class MutantPage(BaseModel):
+    mutants: list[MutantOverviewResponse]
+    # Number of mutants matching the filter across all pages
+    total: int
+    # Pass as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class ReviewMutantResponse(BaseModel):
+    mutant: MutantResponse
+    source: SourceCodeResponse
+    # The user's rating of the mutant, if any
+    rating: Optional[RatingWithValuesResponse] = None
+
+
+class NextMutantsResponse(BaseModel):
+    # The project's rating form, shared by all mutants
+    form_fields: list[FormFieldResponse]
+    # The next mutant followed by the prefetched ones; empty at the end of the list
+    mutants: list[ReviewMutantResponse]
+    # Mutants the user has not rated yet, including the returned ones
+    remaining: int
+
+
+class SuggestedMutantResponse(BaseModel):
+    id: int
+    # Expected score (0 to 1) of a rating, learned from the ratings of similar mutants
+    predicted_score: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class RatingRequest(BaseModel):
     mutant_id: int = Field(gt=0)
     rating: int = Field(ge=1, le=5)
@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 class SourceClassQuery(BaseModel):
@@ -17,3 +17,12 @@ class SourceCodeResponse(BaseModel):
     fully_qualified_name: str
     content: Optional[str] = None
     found: bool
+
+class SourceUploadResponse(BaseModel):
+    detail: str
+    # Top-level classes found in the archive
+    indexed_classes: int
+    # Mutated classes of the project that no file in the archive declares (the first 100)
+    unresolved_classes: List[str]
+    # Mutants of those classes, whose source will not be shown
+    unresolved_mutants: int
@@ -1,4 +1,5 @@
-from typing import List, Optional
+import json
+from typing import AsyncIterator, List, Optional
 
 from core.database import Database
 
@@ -20,22 +21,26 @@ class ExportRepository:
             stats = await conn.fetchrow(
                 """
                 SELECT
-                    (SELECT COUNT(*) FROM mutants WHERE project_id = $1) AS total_mutants,
-                    (SELECT COUNT(*) FROM rating r
-                     INNER JOIN mutants m ON r.mutant_id = m.id
-                     WHERE m.project_id = $1) AS total_ratings,
-                    (SELECT COUNT(DISTINCT r.user_id) FROM rating r
-                     INNER JOIN mutants m ON r.mutant_id = m.id
-                     WHERE m.project_id = $1) AS unique_reviewers,
-                    (SELECT COUNT(DISTINCT r.mutant_id) FROM rating r
-                     INNER JOIN mutants m ON r.mutant_id = m.id
-                     WHERE m.project_id = $1) AS mutants_with_ratings
+                    COALESCE(pp.total_mutants, 0) AS total_mutants,
+                    COALESCE(SUM(pup.reviewed_mutants), 0) AS total_ratings,
+                    COUNT(pup.user_id) FILTER (WHERE pup.reviewed_mutants > 0) AS unique_reviewers,
+                    COALESCE(pp.rated_mutants, 0) AS mutants_with_ratings
+                FROM (SELECT $1::int AS project_id) p
+                LEFT JOIN project_progress pp ON pp.project_id = p.project_id
+                LEFT JOIN project_user_progress pup ON pup.project_id = p.project_id
+                GROUP BY pp.total_mutants, pp.rated_mutants
                 """,
                 project_id
             )
             return dict(stats)
 
-    async def get_all_ratings_with_details(self, project_id: int) -> List[dict]:
+    async def get_all_ratings_with_details(self, project_id: int, limit: Optional[int] = None) -> List[dict]:
+        """
+        Ratings of a project with their mutant and reviewer, ordered by mutant and reviewer.
+
+        With a limit only the first rows are read: rating_project_mutant_idx delivers them
+        by mutant, so only the ratings of those mutants are sorted by reviewer.
+        """
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -55,10 +60,11 @@ class ExportRepository:
                 FROM rating r
                 INNER JOIN mutants m ON r.mutant_id = m.id
                 INNER JOIN users u ON r.user_id = u.id
-                WHERE m.project_id = $1
-                ORDER BY m.id, u.username
+                WHERE r.project_id = $1
+                ORDER BY r.mutant_id, u.username
+                LIMIT $2
                 """,
-                project_id
+                project_id, limit
             )
             return [dict(row) for row in rows]
 
@@ -81,3 +87,68 @@ class ExportRepository:
                 rating_ids
             )
             return [dict(row) for row in rows]
+
+    async def get_form_fields(self, project_id: int) -> List[dict]:
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT id, label, type FROM form_fields WHERE project_id = $1 ORDER BY position",
+                project_id
+            )
+            return [dict(row) for row in rows]
+
+    async def stream_ratings(self, project_id: int, batch_size: int = 500) -> AsyncIterator[List[dict]]:
+        """
+        Yield the export rows of a project in batches of at most `batch_size`, read
+        through a server-side cursor so that only one batch is held in memory.
+
+        Rows are ordered by mutant and then rating creation, which follows
+        rating_project_mutant_idx and needs no sort. Each row carries its form field
+        values in position order under "field_values". All batches come from one
+        snapshot; the connection is held until the generator is exhausted or closed.
+        """
+        async with self.db.acquire() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                cursor = await conn.cursor(
+                    """
+                    SELECT
+                        m.id AS mutant_id,
+                        m.sourcefile AS source_file,
+                        m.mutatedclass AS mutated_class,
+                        m.mutatedmethod AS mutated_method,
+                        m.linenumber AS line_number,
+                        m.mutator,
+                        m.status,
+                        m.description,
+                        m.ranking,
+                        m.additionalfields AS additional_fields,
+                        u.username AS reviewer_username,
+                        r.id AS rating_id,
+                        (
+                            SELECT json_agg(json_build_object(
+                                'form_field_id', ff.id,
+                                'field_label', ff.label,
+                                'field_type', ff.type,
+                                'value', fv.value
+                            ) ORDER BY ff.position)
+                            FROM form_field_values fv
+                            INNER JOIN form_fields ff ON fv.form_field_id = ff.id
+                            WHERE fv.rating_id = r.id
+                        ) AS field_values
+                    FROM rating r
+                    INNER JOIN mutants m ON r.mutant_id = m.id
+                    INNER JOIN users u ON r.user_id = u.id
+                    WHERE r.project_id = $1
+                    ORDER BY r.mutant_id, r.id
+                    """,
+                    project_id
+                )
+                while True:
+                    rows = await cursor.fetch(batch_size)
+                    if not rows:
+                        return
+                    batch = []
+                    for row in rows:
+                        entry = dict(row)
+                        entry["field_values"] = json.loads(entry["field_values"] or "[]")
+                        batch.append(entry)
+                    yield batch
@@ -47,6 +47,19 @@ class FormFieldValueRepository:
             )
             return [dict(row) for row in rows]
 
+    async def find_by_rating_ids(self, rating_ids: List[int]) -> List[dict]:
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, form_field_id, rating_id, value
+                FROM form_field_values
+                WHERE rating_id = ANY($1::int[])
+                ORDER BY rating_id, id
+                """,
+                rating_ids
+            )
+            return [dict(row) for row in rows]
+
     async def find_by_id(self, value_id: int) -> Optional[dict]:
         async with self.db.acquire() as conn:
             row = await conn.fetchrow(
@@ -16,6 +16,12 @@ INVALID_LOGIN = HTTPException(
                 detail="Invalid username or password"
             )
 
+PASSWORD_HASHER_BUSY = HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login attempts in progress, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
 USERNAME_TAKEN = HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Username already taken"
@@ -50,3 +56,18 @@ MUTANT_NOT_FOUND = HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Mutant not found"
             )
+
+JOB_NOT_FOUND = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+
+JOB_RESULT_NOT_AVAILABLE = HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="This job has no downloadable result"
+            )
+
+INVALID_CURSOR = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
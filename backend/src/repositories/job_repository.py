@@ -0,0 +1,166 @@
+import json
+from typing import List, Optional
+
+from core.database import Database
+
+# Columns returned for a job
+JOB_COLUMNS = """
+    id, type, status, project_id, created_by, params, progress_current, progress_total,
+    result, error, cancel_requested, created_at, started_at, finished_at
+"""
+
+
+def _job(row) -> Optional[dict]:
+    if row is None:
+        return None
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    return job
+
+
+class JobRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def create(self, job_type: str, owner: str, params: dict,
+                     project_id: Optional[int] = None, created_by: Optional[int] = None) -> dict:
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(
+                f"""
+                INSERT INTO jobs (type, owner, params, project_id, created_by)
+                VALUES ($1, $2, $3, $4, $5)
+                RETURNING {JOB_COLUMNS}
+                """,
+                job_type, owner, json.dumps(params), project_id, created_by
+            )
+            return _job(row)
+
+    async def find_by_id(self, job_id: int) -> Optional[dict]:
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = $1", job_id)
+            return _job(row)
+
+    async def find_all(self, limit: int, status: Optional[str] = None,
+                       job_type: Optional[str] = None) -> List[dict]:
+        """Newest jobs first, optionally of one status and type."""
+        args = []
+        conditions = []
+        if status is not None:
+            args.append(status)
+            conditions.append(f"status = ${len(args)}")
+        if job_type is not None:
+            args.append(job_type)
+            conditions.append(f"type = ${len(args)}")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        args.append(limit)
+
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT {JOB_COLUMNS} FROM jobs {where} ORDER BY created_at DESC, id DESC LIMIT ${len(args)}",
+                *args
+            )
+            return [_job(row) for row in rows]
+
+    async def mark_running(self, job_id: int) -> None:
+        async with self.db.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP,
+                                heartbeat_at = CURRENT_TIMESTAMP
+                WHERE id = $1 AND status = 'queued'
+                """,
+                job_id
+            )
+
+    async def finish(self, job_id: int, status: str, result: Optional[dict] = None,
+                     error: Optional[str] = None, progress_current: Optional[int] = None,
+                     progress_total: Optional[int] = None) -> None:
+        async with self.db.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE jobs
+                SET status = $2, result = $3, error = $4, finished_at = CURRENT_TIMESTAMP,
+                    progress_current = COALESCE($5, progress_current),
+                    progress_total = COALESCE($6, progress_total)
+                WHERE id = $1 AND status IN ('queued', 'running')
+                """,
+                job_id, status, json.dumps(result) if result is not None else None, error,
+                progress_current, progress_total
+            )
+
+    async def request_cancel(self, job_id: int) -> Optional[str]:
+        """Flag an unfinished job for cancellation. Returns the job's status, None if it does not exist."""
+        async with self.db.acquire() as conn:
+            return await conn.fetchval(
+                """
+                WITH flagged AS (
+                    UPDATE jobs SET cancel_requested = TRUE
+                    WHERE id = $1 AND status IN ('queued', 'running')
+                    RETURNING status
+                )
+                SELECT status FROM flagged
+                UNION ALL
+                SELECT status FROM jobs WHERE id = $1 AND NOT EXISTS (SELECT 1 FROM flagged)
+                """,
+                job_id
+            )
+
+    async def heartbeat(self, owner: str, progress: List[tuple]) -> List[int]:
+        """
+        Refresh the heartbeat of the owner's unfinished jobs and store the progress
+        of its running ones, given as (job_id, current, total) tuples.
+
+        Returns the ids of the owner's jobs that were asked to cancel.
+        """
+        job_ids = [p[0] for p in progress]
+        async with self.db.transaction() as conn:
+            if progress:
+                await conn.execute(
+                    """
+                    UPDATE jobs j
+                    SET progress_current = p.current, progress_total = p.total
+                    FROM unnest($1::int[], $2::bigint[], $3::bigint[]) AS p(id, current, total)
+                    WHERE j.id = p.id AND j.status = 'running'
+                    """,
+                    job_ids, [p[1] for p in progress], [p[2] for p in progress]
+                )
+            rows = await conn.fetch(
+                """
+                UPDATE jobs SET heartbeat_at = CURRENT_TIMESTAMP
+                WHERE owner = $1 AND status IN ('queued', 'running')
+                RETURNING id, cancel_requested
+                """,
+                owner
+            )
+            return [row["id"] for row in rows if row["cancel_requested"]]
+
+    async def fail_stale(self, stale_after_seconds: float) -> List[int]:
+        """Fail the unfinished jobs of processes that stopped sending heartbeats. Returns their ids."""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                UPDATE jobs
+                SET status = 'failed', error = 'Interrupted: the server running the job stopped',
+                    finished_at = CURRENT_TIMESTAMP
+                WHERE status IN ('queued', 'running')
+                  AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => $1)
+                RETURNING id
+                """,
+                stale_after_seconds
+            )
+            return [row["id"] for row in rows]
+
+    async def delete_finished_before(self, age_seconds: float) -> List[int]:
+        """Delete jobs that finished more than age_seconds ago. Returns their ids."""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                DELETE FROM jobs
+                WHERE status NOT IN ('queued', 'running')
+                  AND finished_at < CURRENT_TIMESTAMP - make_interval(secs => $1)
+                RETURNING id
+                """,
+                age_seconds
+            )
+            return [row["id"] for row in rows]
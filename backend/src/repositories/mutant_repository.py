@@ -1,32 +1,86 @@
-from typing import Optional, List
+from collections import Counter
+from typing import Optional, List, Tuple
 
+from core.config import config
 from core.database import Database
+from repositories.progress_repository import lock_project_progress
+
+# Column order of the mutant rows produced by services.xml_parser
+MUTANT_COLUMNS = [
+    "project_id", "detected", "status", "numberoftestsrun", "sourcefile",
+    "mutatedclass", "mutatedmethod", "methoddescription", "linenumber",
+    "mutator", "killingtest", "description", "additionalfields",
+]
+
+# Rows per multi-row INSERT statement (13 parameters each, well below the 32767 limit)
+INSERT_BATCH_SIZE = 1000
 
 
 class MutantRepository:
     def __init__(self, db: Database):
         self.db = db
 
-    async def create_many(self, mutants: List[list]) -> None:
+    async def create_many(self, mutants: List[list], method: Optional[str] = None) -> None:
         """Bulk insert mutants.
 
         Each mutant is a list with:
         [project_id, detected, status, numberOfTestsRun, sourceFile,
          mutatedClass, mutatedMethod, methodDescription, lineNumber,
          mutator, killingTest, description, additionalFields]
+
+        Uses binary COPY unless `method` (or MUTANT_LOAD_METHOD) is "insert".
+        The projects' progress counters are updated in the same transaction.
         """
-        async with self.db.acquire() as conn:
-            await conn.executemany(
+        if not mutants:
+            return
+        method = method or config.MUTANT_LOAD_METHOD
+        if method not in ("copy", "insert"):
+            raise ValueError(f"Unknown mutant load method '{method}'")
+
+        counts = Counter(mutant[0] for mutant in mutants)
+        async with self.db.transaction() as conn:
+            await lock_project_progress(conn, counts)
+            if method == "copy":
+                await self.copy_many(mutants)
+            else:
+                await self.insert_many(mutants)
+            await conn.execute(
                 """
-                INSERT INTO mutants
-                (project_id, detected, status, numberOfTestsRun, sourceFile,
-                 mutatedClass, mutatedMethod, methodDescription, lineNumber,
-                 mutator, killingTest, description, additionalFields)
-                VALUES($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+                UPDATE project_progress AS pp
+                SET total_mutants = pp.total_mutants + c.added
+                FROM unnest($1::int[], $2::int[]) AS c(project_id, added)
+                WHERE pp.project_id = c.project_id
                 """,
-                mutants
+                list(counts.keys()), list(counts.values())
             )
 
+    async def copy_many(self, mutants: List[list]) -> None:
+        """Bulk load mutants with PostgreSQL binary COPY. Progress counters are left to create_many."""
+        async with self.db.acquire() as conn:
+            await conn.copy_records_to_table(
+                "mutants",
+                records=mutants,
+                columns=MUTANT_COLUMNS
+            )
+
+    async def insert_many(self, mutants: List[list]) -> None:
+        """Bulk insert mutants with multi-row INSERT statements of INSERT_BATCH_SIZE rows.
+        Progress counters are left to create_many.
+        """
+        width = len(MUTANT_COLUMNS)
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                for start in range(0, len(mutants), INSERT_BATCH_SIZE):
+                    chunk = mutants[start:start + INSERT_BATCH_SIZE]
+                    values = ", ".join(
+                        "(" + ", ".join(f"${row * width + col + 1}" for col in range(width)) + ")"
+                        for row in range(len(chunk))
+                    )
+                    await conn.execute(
+                        f"INSERT INTO mutants ({', '.join(MUTANT_COLUMNS)}) VALUES {values}",
+                        *(value for mutant in chunk for value in mutant)
+                    )
+
     async def count_by_project_id(self, project_id: int) -> int:
         async with self.db.acquire() as conn:
             count = await conn.fetchval(
@@ -44,27 +98,137 @@ class MutantRepository:
             )
             return dict(mutant) if mutant is not None else None
 
-    async def get_all_for_ranking(self, project_id: int) -> List[dict]:
-        """Get all mutants for a project with fields needed for ranking."""
+    async def get_mutants(self, mutant_ids: List[int]) -> List[dict]:
+        """Get several mutants at once, in the order of `mutant_ids` (unknown ids are left out)."""
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
                 """
+                SELECT id, project_id, detected, status, numberoftestsrun, sourcefile,
+                       mutatedclass, mutatedmethod, methoddescription, linenumber,
+                       mutator, killingtest, description, ranking, additionalfields
+                FROM mutants
+                WHERE id = ANY($1::int[])
+                """,
+                mutant_ids
+            )
+        by_id = {row["id"]: dict(row) for row in rows}
+        return [by_id[mutant_id] for mutant_id in mutant_ids if mutant_id in by_id]
+
+    async def count_by_class(self, project_id: int) -> List[dict]:
+        """Number of mutants per mutated class of a project."""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT mutatedclass, COUNT(*) AS mutants
+                FROM mutants
+                WHERE project_id = $1
+                GROUP BY mutatedclass
+                """,
+                project_id
+            )
+            return [dict(row) for row in rows]
+
+    async def get_all_for_ranking(self, project_id: int, without_sort_key: bool = False) -> List[dict]:
+        """Get all mutants for a project with fields needed for ranking.
+
+        With without_sort_key only those that have no stored sort key yet.
+        """
+        condition = "AND sort_key IS NULL" if without_sort_key else ""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
                 SELECT id, sourcefile, mutatedclass, mutatedmethod,
                        linenumber, mutator, status, detected, description, additionalfields
                 FROM mutants
+                WHERE project_id = $1 {condition}
+                """,
+                project_id
+            )
+            return [dict(row) for row in rows]
+
+    async def get_all_for_adaptive_ranking(self, project_id: int) -> List[dict]:
+        """Get the id and the features learned by the adaptive ranking of all mutants, in ranking order
+        (ranking 0, the mutant to review first, first).
+        """
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, mutator, mutatedclass, mutatedmethod, status
+                FROM mutants
                 WHERE project_id = $1
+                ORDER BY ranking, id
                 """,
                 project_id
             )
             return [dict(row) for row in rows]
 
-    async def bulk_update_rankings(self, project_id: int, rankings: dict) -> None:
-        """Bulk update ranking values for mutants in a project."""
+    async def bulk_update_rankings(self, project_id: int, rankings: dict) -> int:
+        """Bulk update ranking values for mutants in a project.
+
+        All (id, rank) pairs are sent as two arrays and applied with one joined UPDATE.
+        Rows whose ranking is already correct are left untouched.
+
+        Returns the number of mutants whose ranking changed.
+        """
         if not rankings:
+            return 0
+        async with self.db.acquire() as conn:
+            result = await conn.execute(
+                """
+                UPDATE mutants AS m
+                SET ranking = r.ranking
+                FROM unnest($1::int[], $2::int[]) AS r(id, ranking)
+                WHERE m.id = r.id
+                  AND m.project_id = $3
+                  AND m.ranking IS DISTINCT FROM r.ranking
+                """,
+                list(rankings.keys()), list(rankings.values()), project_id
+            )
+            return int(result.split()[-1]) if result else 0
+
+    async def bulk_update_sort_keys(self, project_id: int, mutant_ids: List[int], sort_keys: List[bytes]) -> None:
+        """Store the sort key of each mutant, given as two parallel lists."""
+        if not mutant_ids:
             return
         async with self.db.acquire() as conn:
-            await conn.executemany(
-                "UPDATE mutants SET ranking = $1 WHERE id = $2 AND project_id = $3",
-                [(rank, mutant_id, project_id) for mutant_id, rank in rankings.items()]
+            await conn.execute(
+                """
+                UPDATE mutants AS m
+                SET sort_key = k.sort_key
+                FROM unnest($1::int[], $2::bytea[]) AS k(id, sort_key)
+                WHERE m.id = k.id
+                  AND m.project_id = $3
+                  AND m.sort_key IS DISTINCT FROM k.sort_key
+                """,
+                mutant_ids, sort_keys, project_id
             )
 
+    async def update_rankings_from_sort_keys(self, project_id: int) -> Tuple[int, int]:
+        """Set every mutant's ranking to its position in (sort_key, id) order.
+
+        Only rows whose position moved are written.
+
+        Returns (number of mutants ranked, number whose ranking changed).
+        """
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                WITH positions AS (
+                    SELECT id, (row_number() OVER (ORDER BY sort_key, id) - 1)::int AS position
+                    FROM mutants
+                    WHERE project_id = $1
+                ), updated AS (
+                    UPDATE mutants AS m
+                    SET ranking = p.position
+                    FROM positions p
+                    WHERE m.id = p.id
+                      AND m.project_id = $1
+                      AND m.ranking IS DISTINCT FROM p.position
+                    RETURNING 1
+                )
+                SELECT (SELECT COUNT(*) FROM positions) AS ranked,
+                       (SELECT COUNT(*) FROM updated) AS changed
+                """,
+                project_id
+            )
+            return row["ranked"], row["changed"]
@@ -0,0 +1,93 @@
+from typing import Iterable, List
+
+from core.database import Database
+
+# Waiting longer would hold up every rating write of the project queued behind the rebuild
+REBUILD_LOCK_TIMEOUT = "2s"
+
+# Arbitrary first key of the per-project advisory locks guarding the progress counters;
+# the second key is the project id
+PROGRESS_LOCK_CLASS = 7_301_925
+
+
+async def lock_project_progress(conn, project_ids: Iterable[int], exclusive: bool = False) -> None:
+    """Lock the progress counters of projects until the end of the current transaction.
+
+    Every write that counts itself takes the shared lock, so writers never wait for each
+    other; rebuild_project() takes the exclusive one. Writers that lock mutant rows must
+    do so before taking this lock, so they cannot deadlock with a queued rebuild.
+    """
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    for project_id in sorted(set(project_ids)):
+        await conn.execute(f"SELECT {function}($1, $2)", PROGRESS_LOCK_CLASS, project_id)
+
+
+class ProgressRepository:
+    """Rebuilds the project_progress and project_user_progress counter tables."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def find_project_ids(self) -> List[int]:
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch("SELECT id FROM projects ORDER BY id")
+            return [row["id"] for row in rows]
+
+    async def rebuild_project(self, project_id: int) -> int:
+        """Recompute the counters of one project from its mutants and ratings.
+
+        Rating and mutant writes of this project are blocked for the duration, which
+        is one index range scan per table, so no concurrent update is lost; other
+        projects are not affected. Raises asyncpg's LockNotAvailableError instead of
+        queueing behind a long write, such as a project upload, for more than
+        REBUILD_LOCK_TIMEOUT.
+
+        Returns the number of counter rows that had drifted and were corrected.
+        """
+        async with self.db.transaction() as conn:
+            await conn.execute(f"SET LOCAL lock_timeout = '{REBUILD_LOCK_TIMEOUT}'")
+            await lock_project_progress(conn, [project_id], exclusive=True)
+            await conn.execute(
+                "SELECT 1 FROM project_progress WHERE project_id = $1 FOR UPDATE", project_id
+            )
+            project_result = await conn.execute(
+                """
+                INSERT INTO project_progress AS pp (project_id, total_mutants, rated_mutants)
+                SELECT p.id,
+                       (SELECT COUNT(*) FROM mutants m WHERE m.project_id = p.id),
+                       (SELECT COUNT(DISTINCT r.mutant_id) FROM rating r WHERE r.project_id = p.id)
+                FROM projects p
+                WHERE p.id = $1
+                ON CONFLICT (project_id) DO UPDATE
+                SET total_mutants = EXCLUDED.total_mutants, rated_mutants = EXCLUDED.rated_mutants
+                WHERE (pp.total_mutants, pp.rated_mutants)
+                      IS DISTINCT FROM (EXCLUDED.total_mutants, EXCLUDED.rated_mutants)
+                """,
+                project_id
+            )
+            user_result = await conn.fetchval(
+                """
+                WITH actual AS (
+                    SELECT user_id, COUNT(*) AS reviewed_mutants
+                    FROM rating
+                    WHERE project_id = $1
+                    GROUP BY user_id
+                ), removed AS (
+                    DELETE FROM project_user_progress pup
+                    WHERE pup.project_id = $1
+                      AND pup.reviewed_mutants <> 0
+                      AND NOT EXISTS (SELECT 1 FROM actual a WHERE a.user_id = pup.user_id)
+                    RETURNING 1
+                ), corrected AS (
+                    INSERT INTO project_user_progress AS pup (project_id, user_id, reviewed_mutants)
+                    SELECT $1, user_id, reviewed_mutants FROM actual
+                    ON CONFLICT (project_id, user_id) DO UPDATE
+                    SET reviewed_mutants = EXCLUDED.reviewed_mutants
+                    WHERE pup.reviewed_mutants <> EXCLUDED.reviewed_mutants
+                    RETURNING 1
+                )
+                SELECT (SELECT COUNT(*) FROM removed) + (SELECT COUNT(*) FROM corrected)
+                """,
+                project_id
+            )
+            return int(project_result.split()[-1]) + user_result
@@ -1,6 +1,9 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
-from core.database import Database
+from core.database import Database, escape_like
+
+# Class key of the per-project advisory locks that serialize ranking runs
+RANKING_LOCK_CLASS = 7_301_926
 
 
 class ProjectRepository:
@@ -8,10 +11,17 @@ class ProjectRepository:
         self.db = db
 
     async def create(self, name: str) -> int:
-        """Creates a new project and returns its id."""
+        """Creates a new project, with zeroed progress counters, and returns its id."""
         async with self.db.acquire() as conn:
             project_id = await conn.fetchval(
-                "INSERT INTO projects (name) VALUES ($1) RETURNING id",
+                """
+                WITH project AS (
+                    INSERT INTO projects (name) VALUES ($1) RETURNING id
+                ), progress AS (
+                    INSERT INTO project_progress (project_id) SELECT id FROM project
+                )
+                SELECT id FROM project
+                """,
                 name
             )
             return project_id
@@ -47,6 +57,29 @@ class ProjectRepository:
             )
             return [dict(row) for row in rows]
 
+    async def find_by_user_id_with_counts(self, user_id: int) -> List[dict]:
+        """Find all projects assigned to a user, with total and reviewed mutant counts.
+
+        Counts come from the progress counter tables, so no mutants or ratings are counted.
+        """
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT p.id, p.name, p.created_at::text,
+                       COALESCE(pp.total_mutants, 0) AS total_mutants,
+                       COALESCE(pup.reviewed_mutants, 0) AS reviewed_mutants
+                FROM projects p
+                INNER JOIN project_assignments pa ON p.id = pa.project_id
+                LEFT JOIN project_progress pp ON pp.project_id = p.id
+                LEFT JOIN project_user_progress pup
+                    ON pup.project_id = p.id AND pup.user_id = pa.user_id
+                WHERE pa.user_id = $1
+                ORDER BY p.created_at DESC
+                """,
+                user_id
+            )
+            return [dict(row) for row in rows]
+
     async def add_user(self, project_id: int, user_id: int) -> None:
         """Adds a user to a project."""
         async with self.db.acquire() as conn:
@@ -92,25 +125,134 @@ class ProjectRepository:
             )
             return exists
 
-    async def get_mutant_list(self, user_id, project_id):
-        """Find all projects assigned to a user."""
+    async def get_mutant_list(
+        self,
+        user_id: int,
+        project_id: int,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        status: Optional[str] = None,
+        mutator: Optional[str] = None,
+        source_file_prefix: Optional[str] = None,
+        rated: Optional[bool] = None
+    ) -> List[dict]:
+        """List a project's mutants in ranking order, with whether the user rated each one.
+
+        Keyset paginated over (ranking, id), most important (ranking 0) first: pass the (ranking, id) of the last
+        mutant of a page as `after` to get the next one. The optional filters narrow
+        the list by status, mutator, sourceFile prefix and rated/unrated by the user.
+        """
+        args = [user_id, project_id]
+        conditions = ["m.project_id = $2"] + self._mutant_filter_conditions(
+            args, "$1", status, mutator, source_file_prefix, rated
+        )
+        if after is not None:
+            args.extend(after)
+            ranking, mutant_id = f"${len(args) - 1}", f"${len(args)}"
+            # Split so that the ranking bound is an index condition of mutants_project_ranking_asc_idx
+            conditions.append(
+                f"m.ranking >= {ranking} AND (m.ranking > {ranking} OR m.id > {mutant_id})"
+            )
+        limit_clause = ""
+        if limit is not None:
+            args.append(limit)
+            limit_clause = f"LIMIT ${len(args)}"
+
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
-                """
+                f"""
                 SELECT m.id, m.detected, m.status, m.sourcefile, m.linenumber, m.mutator, m.ranking,
-                    CASE 
-                        WHEN r.user_id IS NOT NULL THEN TRUE
-                        ELSE FALSE
-                    END AS rated
+                    EXISTS (
+                        SELECT 1 FROM rating r WHERE r.mutant_id = m.id AND r.user_id = $1
+                    ) AS rated
                 FROM mutants m
-                LEFT JOIN rating r ON r.mutant_id = m.id AND r.user_id = $1
-                WHERE m.project_id = $2
-                ORDER BY m.ranking DESC
+                WHERE {' AND '.join(conditions)}
+                ORDER BY m.ranking, m.id
+                {limit_clause}
                 """,
-                user_id, project_id
+                *args
             )
             return [dict(row) for row in rows]
 
+    async def count_mutants(
+        self,
+        user_id: int,
+        project_id: int,
+        status: Optional[str] = None,
+        mutator: Optional[str] = None,
+        source_file_prefix: Optional[str] = None,
+        rated: Optional[bool] = None
+    ) -> int:
+        """Count the mutants get_mutant_list would return without pagination.
+
+        Without filters, or with only the rated filter, this reads the progress counters;
+        otherwise it is answered from mutants_project_filter_idx and the rating index.
+        """
+        async with self.db.acquire() as conn:
+            if status is None and mutator is None and not source_file_prefix:
+                counts = await conn.fetchrow(
+                    """
+                    SELECT COALESCE(pp.total_mutants, 0) AS total,
+                           COALESCE((
+                               SELECT pup.reviewed_mutants FROM project_user_progress pup
+                               WHERE pup.project_id = $1 AND pup.user_id = $2
+                           ), 0) AS reviewed
+                    FROM project_progress pp
+                    WHERE pp.project_id = $1
+                    """,
+                    project_id, user_id
+                )
+                if counts is None:
+                    return 0
+                if rated is None:
+                    return counts["total"]
+                return counts["reviewed"] if rated else counts["total"] - counts["reviewed"]
+
+            args = [project_id]
+            conditions = ["m.project_id = $1"]
+            user_param = None
+            if rated is not None:
+                args.append(user_id)
+                user_param = "$2"
+            conditions += self._mutant_filter_conditions(
+                args, user_param, status, mutator, source_file_prefix, rated
+            )
+            count = await conn.fetchval(
+                f"SELECT COUNT(*) FROM mutants m WHERE {' AND '.join(conditions)}",
+                *args
+            )
+            return count or 0
+
+    @staticmethod
+    def _mutant_filter_conditions(
+        args: list,
+        user_param: Optional[str],
+        status: Optional[str],
+        mutator: Optional[str],
+        source_file_prefix: Optional[str],
+        rated: Optional[bool]
+    ) -> List[str]:
+        """SQL conditions for the mutant list filters; their values are appended to args.
+
+        user_param is the placeholder of the user id, needed for the rated filter.
+        """
+        conditions = []
+        if status is not None:
+            args.append(status)
+            conditions.append(f"m.status = ${len(args)}")
+        if mutator is not None:
+            args.append(mutator)
+            conditions.append(f"m.mutator = ${len(args)}")
+        if source_file_prefix:
+            args.append(escape_like(source_file_prefix) + "%")
+            conditions.append(f"m.sourcefile LIKE ${len(args)}")
+        if rated is not None:
+            conditions.append(
+                ("" if rated else "NOT ")
+                + f"EXISTS (SELECT 1 FROM rating r WHERE r.mutant_id = m.id AND r.user_id = {user_param})"
+            )
+        return conditions
+
     async def does_project_exsist(self, project_id):
         async with self.db.acquire() as conn:
             exists = await conn.fetchval(
@@ -137,10 +279,48 @@ class ProjectRepository:
             )
             return [dict(row) for row in rows]
 
-    async def update_last_algorithm(self, project_id: int, algorithm_name: str) -> None:
-        """Update the last applied algorithm for a project."""
+    async def find_all_projects_with_counts(self) -> List[dict]:
+        """Find all projects in the system with their total mutant counts."""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT p.id, p.name, p.created_at::text,
+                       COALESCE(pp.total_mutants, 0) AS total_mutants
+                FROM projects p
+                LEFT JOIN project_progress pp ON pp.project_id = p.id
+                ORDER BY p.created_at DESC
+                """
+            )
+            return [dict(row) for row in rows]
+
+    async def update_last_algorithm(
+        self,
+        project_id: int,
+        algorithm_name: str,
+        algorithm_id: Optional[str] = None,
+        algorithm_version: Optional[str] = None
+    ) -> None:
+        """Update the last applied algorithm for a project, with the id and version that produced its ordering."""
         async with self.db.acquire() as conn:
             await conn.execute(
-                "UPDATE projects SET last_algorithm = $1 WHERE id = $2",
-                algorithm_name, project_id
+                """
+                UPDATE projects
+                SET last_algorithm = $1, ranking_algorithm = $2, ranking_algorithm_version = $3
+                WHERE id = $4
+                """,
+                algorithm_name, algorithm_id, algorithm_version, project_id
+            )
+
+    async def lock_ranking(self, project_id: int) -> None:
+        """Wait for other ranking runs of the project; held until the end of the current transaction."""
+        async with self.db.acquire() as conn:
+            await conn.execute("SELECT pg_advisory_xact_lock($1, $2)", RANKING_LOCK_CLASS, project_id)
+
+    async def get_ranking_algorithm(self, project_id: int) -> Optional[dict]:
+        """Id and version of the algorithm that produced the project's ordering (None if no project)."""
+        async with self.db.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT ranking_algorithm, ranking_algorithm_version FROM projects WHERE id = $1",
+                project_id
             )
+            return dict(row) if row is not None else None
@@ -1,6 +1,7 @@
 from typing import Optional, List
 
 from core.database import Database
+from repositories.progress_repository import lock_project_progress
 
 
 class RatingRepository:
@@ -8,16 +9,7 @@ class RatingRepository:
         self.db = db
 
     async def create(self, mutant_id: int, user_id: int) -> int:
-        async with self.db.acquire() as conn:
-            rating_id = await conn.fetchval(
-                """
-                INSERT INTO rating (mutant_id, user_id)
-                VALUES ($1, $2)
-                RETURNING id
-                """,
-                mutant_id, user_id
-            )
-            return rating_id
+        return await self._insert(mutant_id, user_id, upsert=False)
 
     async def find_by_id(self, rating_id: int) -> Optional[dict]:
         async with self.db.acquire() as conn:
@@ -43,35 +35,103 @@ class RatingRepository:
             )
             return dict(row) if row else None
 
-    async def upsert(self, mutant_id: int, user_id: int) -> int:
+    async def find_by_user_and_mutants(self, user_id: int, mutant_ids: List[int]) -> List[dict]:
         async with self.db.acquire() as conn:
-            rating_id = await conn.fetchval(
+            rows = await conn.fetch(
                 """
+                SELECT id, mutant_id, user_id
+                FROM rating
+                WHERE user_id = $1 AND mutant_id = ANY($2::int[])
+                """,
+                user_id, mutant_ids
+            )
+            return [dict(row) for row in rows]
+
+    async def upsert(self, mutant_id: int, user_id: int) -> int:
+        return await self._insert(mutant_id, user_id, upsert=True)
+
+    async def delete(self, rating_id: int) -> bool:
+        async with self.db.transaction() as conn:
+            mutant_id = await conn.fetchval("SELECT mutant_id FROM rating WHERE id = $1", rating_id)
+            if mutant_id is None:
+                return False
+            await self._lock_mutant(conn, mutant_id)
+            row = await conn.fetchrow(
+                """
+                DELETE FROM rating
+                WHERE id = $1
+                RETURNING project_id, user_id,
+                          NOT EXISTS (
+                              SELECT 1 FROM rating other
+                              WHERE other.mutant_id = rating.mutant_id AND other.id <> rating.id
+                          ) AS was_last
+                """,
+                rating_id
+            )
+            if row is None:
+                return False
+            await self._count(conn, row["project_id"], row["user_id"], -1, -1 if row["was_last"] else 0)
+            return True
+
+    async def _insert(self, mutant_id: int, user_id: int, upsert: bool) -> int:
+        """Insert a rating and count it in the progress counters, in one transaction.
+
+        With upsert, an existing rating of the user is returned instead and nothing is counted.
+        """
+        on_conflict = (
+            "ON CONFLICT (mutant_id, user_id) DO UPDATE SET mutant_id = EXCLUDED.mutant_id"
+            if upsert else ""
+        )
+        async with self.db.transaction() as conn:
+            await self._lock_mutant(conn, mutant_id)
+            # Subqueries in RETURNING see the table as it was before this insert
+            row = await conn.fetchrow(
+                f"""
                 INSERT INTO rating (mutant_id, user_id)
                 VALUES ($1, $2)
-                ON CONFLICT (mutant_id, user_id) DO UPDATE SET mutant_id = EXCLUDED.mutant_id
-                RETURNING id
+                {on_conflict}
+                RETURNING id, project_id, xmax = 0 AS inserted,
+                          NOT EXISTS (SELECT 1 FROM rating WHERE mutant_id = $1) AS is_first
                 """,
                 mutant_id, user_id
             )
-            return rating_id
+            if row["inserted"]:
+                await self._count(conn, row["project_id"], user_id, 1, 1 if row["is_first"] else 0)
+            return row["id"]
 
-    async def delete(self, rating_id: int) -> bool:
-        async with self.db.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM rating WHERE id = $1",
-                rating_id
+    @staticmethod
+    async def _lock_mutant(conn, mutant_id: int) -> None:
+        # Serializes reviewers of one mutant, so exactly one of them sees it become (un)rated
+        project_id = await conn.fetchval(
+            "SELECT project_id FROM mutants WHERE id = $1 FOR NO KEY UPDATE", mutant_id
+        )
+        if project_id is not None:
+            await lock_project_progress(conn, [project_id])
+
+    @staticmethod
+    async def _count(conn, project_id: int, user_id: int, reviewed: int, rated: int) -> None:
+        await conn.execute(
+            """
+            INSERT INTO project_user_progress (project_id, user_id, reviewed_mutants)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (project_id, user_id) DO UPDATE
+            SET reviewed_mutants = project_user_progress.reviewed_mutants + EXCLUDED.reviewed_mutants
+            """,
+            project_id, user_id, reviewed
+        )
+        if rated:
+            await conn.execute(
+                "UPDATE project_progress SET rated_mutants = rated_mutants + $2 WHERE project_id = $1",
+                project_id, rated
             )
-            return result == "DELETE 1"
 
     async def count_reviewed_by_project_and_user(self, project_id: int, user_id: int) -> int:
         async with self.db.acquire() as conn:
             count = await conn.fetchval(
                 """
-                SELECT COUNT(DISTINCT r.mutant_id)
-                FROM rating r
-                INNER JOIN mutants m ON r.mutant_id = m.id
-                WHERE m.project_id = $1 AND r.user_id = $2
+                SELECT reviewed_mutants
+                FROM project_user_progress
+                WHERE project_id = $1 AND user_id = $2
                 """,
                 project_id, user_id
             )
@@ -81,8 +141,8 @@ class RatingRepository:
         async with self.db.acquire() as conn:
             count = await conn.fetchval(
                 """
-                SELECT COUNT(DISTINCT mutant_id)
-                FROM rating
+                SELECT SUM(reviewed_mutants)
+                FROM project_user_progress
                 WHERE user_id = $1
                 """,
                 user_id
@@ -93,10 +153,9 @@ class RatingRepository:
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
                 """
-                SELECT r.id, r.mutant_id, r.user_id
-                FROM rating r
-                INNER JOIN mutants m ON r.mutant_id = m.id
-                WHERE m.project_id = $1 AND r.user_id = $2
+                SELECT id, mutant_id, user_id
+                FROM rating
+                WHERE project_id = $1 AND user_id = $2
                 """,
                 project_id, user_id
             )
@@ -106,11 +165,29 @@ class RatingRepository:
         async with self.db.acquire() as conn:
             rows = await conn.fetch(
                 """
-                SELECT r.id, r.mutant_id, r.user_id
+                SELECT id, mutant_id, user_id
+                FROM rating
+                WHERE project_id = $1
+                ORDER BY id
+                """,
+                project_id
+            )
+            return [dict(row) for row in rows]
+
+    async def find_rating_values_by_project(self, project_id: int) -> List[dict]:
+        """All ratings of a project with the values they gave to its "rating" form fields."""
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT r.mutant_id, r.user_id,
+                       ARRAY(
+                           SELECT fv.value
+                           FROM form_field_values fv
+                           INNER JOIN form_fields ff ON fv.form_field_id = ff.id
+                           WHERE fv.rating_id = r.id AND ff.type = 'rating'
+                       ) AS rating_values
                 FROM rating r
-                INNER JOIN mutants m ON r.mutant_id = m.id
-                WHERE m.project_id = $1
-                ORDER BY r.id
+                WHERE r.project_id = $1
                 """,
                 project_id
             )
@@ -28,7 +28,7 @@ class SessionRepository:
         async with self.db.acquire() as conn:
             row = await conn.fetchrow(
                 """
-                SELECT users.id, username, is_admin, is_active
+                SELECT users.id, username, is_admin, is_active, sessions.expires_at
                 FROM users
                 JOIN sessions ON users.id = sessions.user_id
                 WHERE sessions.token = $1
@@ -1,88 +1,603 @@
+import fcntl
+import hashlib
+import json
+import mmap
+import re
 import shutil
+import struct
+import threading
 import zipfile
+import zlib
 import asyncio
 import os
-from typing import Optional, BinaryIO
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, BinaryIO, Set, Tuple, Union
 from pathlib import Path
 
+from core.config import config
+from core.source_cache import SourceCache
 from core.storage import FileStorage
 
+# Comments and string/char literals, which may contain braces or words like "class"
+_COMMENT_OR_LITERAL = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"""(?:\\.|.)*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.S
+)
+_PACKAGE = re.compile(r'^\s*package\s+([\w.]+)\s*;', re.M)
+_TYPE_OR_BRACE = re.compile(r'\b(?:class|interface|enum|record)\s+([A-Za-z_$][\w$]*)|[{}]')
+
+# Index files already read by this process: index path -> ((mtime, inode), index document)
+_loaded_indexes: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+# Kept archives this process mapped: archive path -> ((mtime, inode), read-only memory map)
+_mapped_archives: Dict[Path, Tuple[Tuple[int, int], mmap.mmap]] = {}
+_mapped_archives_lock = threading.Lock()
+# Serializes uploads and deletions of one project between this process's threads
+_project_locks: Dict[int, threading.Lock] = {}
+_project_locks_lock = threading.Lock()
+
+# ZIP local file header: signature, 22 bytes we do not need, file name and extra field lengths
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+
+def _read_member(archive: mmap.mmap, offset: int, compressed_size: int, size: int,
+                 compression: int, crc: int) -> bytes:
+    """
+    One member of a kept archive, located by the central directory entry recorded in the
+    class index at upload time, so the central directory is never parsed again.
+    """
+    signature, name_length, extra_length = _LOCAL_HEADER.unpack_from(archive, offset)
+    if signature != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"No local file header at offset {offset}")
+    start = offset + _LOCAL_HEADER.size + name_length + extra_length
+    data = archive[start:start + compressed_size]
+    if compression == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    if len(data) != size or zlib.crc32(data) != crc:
+        raise zipfile.BadZipFile(f"Corrupt member at offset {offset}")
+    return data
+
+
+def declared_types(source: str) -> Tuple[str, List[str]]:
+    """The package of a Java source file and the names of its top-level types."""
+    code = _COMMENT_OR_LITERAL.sub(" ", source)
+    package = _PACKAGE.search(code)
+    names = []
+    depth = 0
+    for match in _TYPE_OR_BRACE.finditer(code):
+        token = match.group(0)
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            names.append(match.group(1))
+    return (package.group(1) if package else ""), names
+
+
+def build_class_index(files: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Map the fully qualified name of every top-level type to the file declaring it,
+    from (relative path, source) pairs. Where several files declare the same class,
+    e.g. in multi-module builds, main sources win over tests, then the shortest path.
+    """
+    candidates: Dict[str, List[str]] = {}
+    for relative_path, source in files:
+        package, names = declared_types(source)
+        fqns = [f"{package}.{name}" if package else name for name in names or [Path(relative_path).stem]]
+        if not package:
+            # Without a package declaration, also accept the name its path implies (com/example/Foo.java)
+            fqns.append(relative_path[:-len(".java")].replace("/", "."))
+        for fqn in dict.fromkeys(fqns):
+            candidates.setdefault(fqn, []).append(relative_path)
+    return {
+        fqn: min(paths, key=lambda p: ("/test/" in f"/{p}", len(p), p))
+        for fqn, paths in candidates.items()
+    }
+
+
 class SourceCodeRepository:
-    def __init__(self, fs: FileStorage):
+    def __init__(self, fs: FileStorage, cache: Optional[SourceCache] = None, storage_mode: Optional[str] = None):
         self.fs = fs
+        # Decoded files served without reading them again; None reads every time
+        self.cache = cache
+        # How uploads are stored: "extract" every file, keep the "archive" and read members from
+        # it, or store Java files as "blobs" shared by content. Sources are read from whichever
+        # form they were stored in.
+        self.storage_mode = storage_mode or config.SOURCE_STORAGE
+        if self.storage_mode not in ("extract", "archive", "blobs"):
+            raise ValueError(f"Unknown source storage mode '{self.storage_mode}'")
         # Safety limit: 100MB max uncompressed size to prevent zip bombs
-        self.MAX_UNCOMPRESSED_SIZE = 100 * 1024 * 1024 
+        self.MAX_UNCOMPRESSED_SIZE = 100 * 1024 * 1024
+        # Size limit of a streamed upload, i.e. of the compressed archive
+        self.MAX_UPLOAD_SIZE = config.SOURCE_MAX_UPLOAD_SIZE
+        # Threads extracting one archive
+        self.extract_workers = config.SOURCE_EXTRACT_WORKERS
 
-    def _sync_save_zip(self, project_id: int, zip_file_obj: BinaryIO):
-        """Blocking helper to safely unzip project files."""
+    def _index_path(self, project_id: int) -> Path:
+        """The class index is kept next to the extracted sources, so it cannot clash with archive entries."""
         project_dir = self.fs.get_project_path(project_id)
+        return project_dir.with_name(f"{project_dir.name}.index.json")
 
-        # 1. Clean up existing directory if present
-        if project_dir.exists():
-            shutil.rmtree(project_dir)
-        
-        # 2. Create directory
-        project_dir.mkdir(parents=True, exist_ok=True)
+    def _stored_path(self, project_id: int, name: str) -> Path:
+        """A file or directory of the project's sources, named in its index document."""
+        return self.fs.get_project_path(project_id).with_name(name)
+
+    def _new_path(self, project_id: int, suffix: str = "") -> Path:
+        """A fresh name next to the project's sources, so an upload never overwrites files being read."""
+        project_dir = self.fs.get_project_path(project_id)
+        return project_dir.with_name(f"{project_dir.name}.{uuid.uuid4().hex[:12]}{suffix}")
+
+    def _archive_path(self, project_id: int, document: Dict[str, Any]) -> Path:
+        """Where the upload is kept when the archive is not extracted."""
+        project_dir = self.fs.get_project_path(project_id)
+        # Archives kept before they got fresh names on every upload
+        return project_dir.with_name(document.get("archive", f"{project_dir.name}.zip"))
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.fs.get_blob_root() / digest[:2] / digest
+
+    def _sync_save_zip(self, project_id: int, source: Union[BinaryIO, Path]) -> Dict[str, str]:
+        """
+        Blocking helper to safely store project files from an archive (a file object or
+        path). Returns the class index built on the way.
+
+        The new files are stored under fresh names while the previous ones stay readable.
+        Replacing the index document then switches readers over at once, and the previous
+        files are removed after that. If storing fails, the previous sources are kept.
+        Uploads and deletions of one project take turns, so each removes exactly the files
+        of the index document it replaced.
+        """
+        with self._project_lock(project_id):
+            previous = self._sync_read_document(project_id)
 
+            # 1. Keep the archive, store blobs or extract it, next to the previous sources,
+            # and 2. switch readers over
+            if self.storage_mode == "archive":
+                index, layout = self._sync_store_archive(project_id, source)
+                self._sync_switch_index(project_id, index, layout)
+            elif self.storage_mode == "blobs":
+                # Garbage collection waits until the manifest referencing the new blobs is in place
+                with self._blob_lock("collect.lock", fcntl.LOCK_SH):
+                    index, layout = self._sync_store_blobs(project_id, source)
+                    self._sync_switch_index(project_id, index, layout)
+            else:
+                index, layout = self._sync_extract(project_id, source)
+                self._sync_switch_index(project_id, index, layout)
+
+            # 3. Remove the previous sources
+            self._sync_remove_files(project_id, previous)
+            # Also drops files that readers cached from the old sources while storing
+            self._invalidate_cache(project_id)
+            return index
+
+    def _sync_switch_index(self, project_id: int, index: Dict[str, str], layout: Dict[str, Any]) -> None:
+        """Point the index document at newly stored files, or remove them if that fails."""
+        try:
+            self._write_index(project_id, index, **layout)
+        except Exception:
+            self._sync_remove_files(project_id, layout)
+            raise
+        if "tree" in layout:
+            self._sync_link_tree(project_id, layout["tree"])
+        else:
+            self._sync_remove_project_dir(project_id)
+
+    @contextmanager
+    def _project_lock(self, project_id: int) -> Iterator[None]:
+        """
+        Held while a project's sources are replaced or deleted: a thread lock, and an flock
+        on `<id>.lock` against other worker processes. Deleting the sources removes the
+        lock file, so a lock taken on a file that is gone by then is taken again.
+        """
+        with _project_locks_lock:
+            thread_lock = _project_locks.setdefault(project_id, threading.Lock())
+        with thread_lock:
+            lock_path = self._stored_path(project_id, f"{self.fs.get_project_path(project_id).name}.lock")
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            while True:
+                handle = open(lock_path, "a")
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    if os.path.samestat(os.fstat(handle.fileno()), os.stat(lock_path)):
+                        break
+                except FileNotFoundError:
+                    pass
+                handle.close()
+            try:
+                yield
+            finally:
+                handle.close()
+
+    def _checked_members(self, zip_ref: zipfile.ZipFile, project_dir: Path) -> Iterator[zipfile.ZipInfo]:
         total_size = 0
-        
+        for zip_info in zip_ref.infolist():
+            # Calculate potential size to prevent Zip Bombs
+            total_size += zip_info.file_size
+            if total_size > self.MAX_UNCOMPRESSED_SIZE:
+                raise ValueError(f"Zip content exceeds limit of {self.MAX_UNCOMPRESSED_SIZE} bytes")
+
+            # Security: Prevent Zip Slip (extracting outside target dir)
+            target_path = project_dir / zip_info.filename
+            if not target_path.resolve().is_relative_to(project_dir.resolve()):
+                raise ValueError(f"Malicious zip path detected: {zip_info.filename}")
+            yield zip_info
+
+    def _sync_extract(self, project_id: int, source: Union[BinaryIO, Path]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Extract into a new directory, with members spread over `extract_workers` threads.
+        Returns the class index and the layout naming the directory.
+        """
+        tree = self._new_path(project_id)
+        with self._sync_spooled(project_id, source) as zip_path:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                members = list(self._checked_members(zip_ref, tree))
+            try:
+                # Directories first, so the workers only write files
+                tree.mkdir(parents=True)
+                for directory in sorted({tree / m.filename if m.is_dir() else (tree / m.filename).parent for m in members}):
+                    directory.mkdir(parents=True, exist_ok=True)
+
+                files = [m for m in members if not m.is_dir()]
+                workers = max(1, min(self.extract_workers, len(files)))
+                with ThreadPoolExecutor(workers) as pool:
+                    parts = pool.map(self._sync_extract_members, repeat(zip_path), repeat(tree),
+                                     [files[i::workers] for i in range(workers)])
+                    java_files = [java_file for part in parts for java_file in part]
+            except Exception:
+                shutil.rmtree(tree, ignore_errors=True)
+                raise
+        return build_class_index(java_files), {"tree": tree.name}
+
+    @staticmethod
+    def _sync_extract_members(zip_path: Path, tree: Path, members: List[zipfile.ZipInfo]) -> List[Tuple[str, str]]:
+        """Extract files through a handle of this thread's own; returns the Java sources, scanned for the class index."""
+        java_files = []
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for zip_info in members:
+                target_path = tree / zip_info.filename
+                if not zip_info.filename.endswith(".java"):
+                    with zip_ref.open(zip_info) as member, open(target_path, "wb") as target:
+                        shutil.copyfileobj(member, target)
+                    continue
+                content = zip_ref.read(zip_info)
+                target_path.write_bytes(content)
+                java_files.append((zip_info.filename, content.decode("utf-8", errors="replace")))
+        return java_files
+
+    @contextmanager
+    def _sync_spooled(self, project_id: int, source: Union[BinaryIO, Path]) -> Iterator[Path]:
+        """The archive as a file on disk, which every extracting thread can open."""
+        if isinstance(source, Path):
+            yield source
+            return
+        spooled = self._new_path(project_id, ".upload.zip")
+        spooled.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(spooled, "wb") as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            yield spooled
+        finally:
+            spooled.unlink(missing_ok=True)
+
+    def _sync_link_tree(self, project_id: int, tree_name: str) -> None:
+        """Point the project directory at its current extracted tree, for anyone browsing the storage."""
+        project_dir = self.fs.get_project_path(project_id)
+        link = self._new_path(project_id, ".link")
+        link.symlink_to(tree_name)
+        if project_dir.is_dir() and not project_dir.is_symlink():
+            # Extracted before uploads were swapped in; readers already use the new tree
+            shutil.rmtree(project_dir)
+        os.replace(link, project_dir)
+
+    def _sync_store_archive(self, project_id: int, source: Union[BinaryIO, Path]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Keep the archive as uploaded, under a new name. Returns the class index and the
+        layout naming the archive and where each Java file lies in it.
+        """
+        archive_path = self._new_path(project_id, ".zip")
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            with zipfile.ZipFile(zip_file_obj, 'r') as zip_ref:
-                for zip_info in zip_ref.infolist():
-                    # Calculate potential size to prevent Zip Bombs
-                    total_size += zip_info.file_size
-                    if total_size > self.MAX_UNCOMPRESSED_SIZE:
-                        raise ValueError(f"Zip content exceeds limit of {self.MAX_UNCOMPRESSED_SIZE} bytes")
-                    
-                    # Security: Prevent Zip Slip (extracting outside target dir)
-                    target_path = project_dir / zip_info.filename
-                    if not target_path.resolve().is_relative_to(project_dir.resolve()):
-                        raise ValueError(f"Malicious zip path detected: {zip_info.filename}")
-
-                    # Extract
-                    zip_ref.extract(zip_info, project_dir)
-        except Exception as e:
-            # Cleanup on failure
-            if project_dir.exists():
-                shutil.rmtree(project_dir)
-            raise e
+            if isinstance(source, Path):
+                shutil.copyfile(source, archive_path)
+            else:
+                with open(archive_path, "wb") as archive:
+                    shutil.copyfileobj(source, archive, 1024 * 1024)
+
+            java_files = []
+            members = {}
+            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                # Members are checked as for extraction, so both modes accept the same archives
+                for zip_info in self._checked_members(zip_ref, self.fs.get_project_path(project_id)):
+                    if zip_info.is_dir() or not zip_info.filename.endswith(".java"):
+                        continue
+                    if zip_info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                        raise ValueError(f"Unsupported compression of {zip_info.filename}; use deflate")
+                    content = zip_ref.read(zip_info)
+                    java_files.append((zip_info.filename, content.decode("utf-8", errors="replace")))
+                    members[zip_info.filename] = [
+                        zip_info.header_offset, zip_info.compress_size, zip_info.file_size,
+                        zip_info.compress_type, zip_info.CRC
+                    ]
+        except Exception:
+            archive_path.unlink(missing_ok=True)
+            raise
+        return build_class_index(java_files), {"archive": archive_path.name, "members": members}
+
+    def _sync_store_blobs(self, project_id: int, source: Union[BinaryIO, Path]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Store each Java file once by its SHA-256. Returns the class index and the layout
+        with the project's manifest of path -> hash. Other files are never served, so they
+        are not kept.
+        """
+        java_files = []
+        manifest = {}
+        with zipfile.ZipFile(source, 'r') as zip_ref:
+            for zip_info in self._checked_members(zip_ref, self.fs.get_project_path(project_id)):
+                if zip_info.is_dir() or not zip_info.filename.endswith(".java"):
+                    continue
+                content = zip_ref.read(zip_info)
+                digest = hashlib.sha256(content).hexdigest()
+                blob_path = self._blob_path(digest)
+                # A file uploaded before costs a hash check instead of a write
+                if not blob_path.exists():
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                    temporary = blob_path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+                    temporary.write_bytes(content)
+                    os.replace(temporary, blob_path)
+                manifest[zip_info.filename] = digest
+                java_files.append((zip_info.filename, content.decode("utf-8", errors="replace")))
+        return build_class_index(java_files), {"blobs": manifest}
+
+    @contextmanager
+    def _blob_lock(self, name: str, operation: int) -> Iterator[None]:
+        """An flock on a file of the blob store, held against other threads and processes."""
+        blob_root = self.fs.get_blob_root()
+        blob_root.mkdir(parents=True, exist_ok=True)
+        with open(blob_root / name, "a") as lock:
+            fcntl.flock(lock, operation)
+            yield
+
+    def _sync_referenced_blobs(self) -> Set[str]:
+        """The hashes in the manifests of every project's current index document."""
+        referenced = set()
+        for index_path in self.fs.root_path.glob("*.index.json"):
+            try:
+                document = json.loads(index_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                # Deleted meanwhile, with the project's sources
+                continue
+            referenced.update(document.get("blobs", {}).values())
+        return referenced
+
+    def _sync_collect_garbage(self) -> dict:
+        """Remove the blobs that no project's manifest references, and left-overs of failed writes."""
+        removed = freed = kept = 0
+        if self.fs.get_blob_root().is_dir():
+            # Exclusive: no upload is between storing blobs and writing the manifest referencing them
+            with self._blob_lock("collect.lock", fcntl.LOCK_EX):
+                referenced = self._sync_referenced_blobs()
+                for blob_path in self.fs.get_blob_root().glob("??/*"):
+                    if blob_path.name in referenced:
+                        kept += 1
+                        continue
+                    freed += blob_path.stat().st_size
+                    blob_path.unlink()
+                    removed += 1
+        return {"removed_blobs": removed, "freed_bytes": freed, "kept_blobs": kept}
+
+    def _write_index(self, project_id: int, index: Dict[str, str], **layout: Dict[str, Any]) -> None:
+        """Save the class index, with where the files are kept unless they were extracted."""
+        document = {"classes": index, **layout}
+        index_path = self._index_path(project_id)
+        temporary = index_path.with_name(index_path.name + ".tmp")
+        temporary.write_text(json.dumps(document), encoding="utf-8")
+        # Atomic, so other processes read either the old or the new index
+        os.replace(temporary, index_path)
 
     def _sync_delete_source(self, project_id: int):
-        """Blocking helper to remove directory."""
+        """Blocking helper to remove the sources, however they were stored."""
+        with self._project_lock(project_id):
+            document = self._sync_read_document(project_id)
+            index_path = self._index_path(project_id)
+            index_path.unlink(missing_ok=True)
+            _loaded_indexes.pop(index_path, None)
+            self._sync_remove_project_dir(project_id)
+            self._sync_remove_files(project_id, document)
+
+            # Left-overs of uploads that were interrupted, and the lock file itself
+            project_dir = self.fs.get_project_path(project_id)
+            for path in project_dir.parent.glob(f"{project_dir.name}.*"):
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+            self._invalidate_cache(project_id)
+
+    def _sync_remove_project_dir(self, project_id: int) -> None:
+        """Remove the project directory: a link to the extracted tree, or sources extracted before uploads were swapped in."""
         project_dir = self.fs.get_project_path(project_id)
-        if project_dir.exists():
+        if project_dir.is_symlink():
+            project_dir.unlink()
+        elif project_dir.exists():
             shutil.rmtree(project_dir)
 
+    def _sync_remove_files(self, project_id: int, layout: Optional[Dict[str, Any]]) -> None:
+        """
+        Remove the files an index document points at: an extracted tree or a kept archive.
+        Blobs no longer referenced by any document are left to garbage collection.
+        """
+        if not layout:
+            return
+        if "tree" in layout:
+            shutil.rmtree(self._stored_path(project_id, layout["tree"]), ignore_errors=True)
+        if "members" in layout:
+            archive_path = self._archive_path(project_id, layout)
+            archive_path.unlink(missing_ok=True)
+            # Not closed: another thread may still be reading from it
+            with _mapped_archives_lock:
+                _mapped_archives.pop(archive_path, None)
+
+    def _sync_read_document(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """The project's index document as stored, None if there is none."""
+        try:
+            return json.loads(self._index_path(project_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def _invalidate_cache(self, project_id: int) -> None:
+        if self.cache is not None:
+            self.cache.invalidate_project(project_id)
+
+    def _sync_load_index(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """
+        The project's index document, None if it has no sources. Sources extracted before
+        indexes existed are indexed on first use, taking turns with uploads so that the
+        index of an upload is never overwritten.
+        """
+        index_path = self._index_path(project_id)
+        try:
+            stat = index_path.stat()
+        except FileNotFoundError:
+            project_dir = self.fs.get_project_path(project_id)
+            if not project_dir.is_dir():
+                return None
+            with self._project_lock(project_id):
+                # An upload or another reader may have written the index meanwhile
+                if index_path.exists():
+                    return self._sync_load_index(project_id)
+                if not project_dir.is_dir():
+                    return None
+                index = build_class_index(
+                    (path.relative_to(project_dir).as_posix(), path.read_text(encoding="utf-8", errors="replace"))
+                    for path in project_dir.rglob("*.java") if path.is_file()
+                )
+                self._write_index(project_id, index)
+                return {"classes": index}
+
+        # Re-read only when another upload (possibly in another process) replaced the file
+        version = (stat.st_mtime_ns, stat.st_ino)
+        loaded = _loaded_indexes.get(index_path)
+        if loaded is None or loaded[0] != version:
+            document = json.loads(index_path.read_text(encoding="utf-8"))
+            loaded = _loaded_indexes[index_path] = (version, document)
+        return loaded[1]
+
+    def _sync_get_class_index(self, project_id: int) -> Optional[Dict[str, str]]:
+        """The project's fully qualified class name -> file index, None if it has no sources."""
+        document = self._sync_load_index(project_id)
+        return document["classes"] if document is not None else None
+
     def _sync_get_class_content(self, project_id: int, fully_qualified_name: str) -> Optional[str]:
         """Blocking helper to read java file."""
-        project_dir = self.fs.get_project_path(project_id)
-        
-        # Convert 'com.example.Test' -> 'com/example/Test.java'
-        relative_path = fully_qualified_name.replace(".", os.sep) + ".java"
-        target_file = project_dir / relative_path
+        # A second attempt if an upload replaced the files after the index was read
+        for _ in range(2):
+            document = self._sync_load_index(project_id)
+            if document is None:
+                return None
 
-        # Security check: Ensure file is inside project dir
-        try:
-            if not target_file.resolve().is_relative_to(project_dir.resolve()):
+            # Inner classes ('com.example.Outer$Inner') live in the file of their top-level class
+            relative_path = document["classes"].get(fully_qualified_name.split("$", 1)[0])
+            if relative_path is None:
                 return None
-        except ValueError:
-            return None # Path resolution failed
 
-        if not target_file.exists() or not target_file.is_file():
-            return None
+            try:
+                if self.cache is None:
+                    return self._sync_open_file(project_id, relative_path, document)[1]()
 
-        try:
-            return target_file.read_text(encoding='utf-8')
-        except Exception:
+                generation = self.cache.generation
+                version, read = self._sync_open_file(project_id, relative_path, document)
+                content = self.cache.get(project_id, relative_path, version)
+                if content is None:
+                    content = read()
+                    self.cache.put(project_id, relative_path, version, content, generation=generation)
+                return content
+            except FileNotFoundError:
+                continue
+            except Exception:
+                return None
+        return None
+
+    def _sync_open_file(
+        self, project_id: int, relative_path: str, document: Dict[str, Any]
+    ) -> Tuple[Tuple[int, int], Callable[[], str]]:
+        """
+        The (mtime, size) of a source file and a function reading it: from the kept archive
+        or the blob store if the index says so, else from the extracted files.
+        """
+        if "members" in document:
+            (mtime, _), archive = self._sync_map_archive(self._archive_path(project_id, document))
+            member = document["members"][relative_path]
+            return (mtime, member[2]), lambda: _read_member(archive, *member).decode('utf-8')
+
+        if "blobs" in document:
+            path = self._blob_path(document["blobs"][relative_path])
+        elif "tree" in document:
+            path = self._stored_path(project_id, document["tree"]) / relative_path
+        else:
+            path = self.fs.get_project_path(project_id) / relative_path
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size), lambda: path.read_text(encoding='utf-8')
+
+    @staticmethod
+    def _sync_map_archive(archive_path: Path) -> Tuple[Tuple[int, int], mmap.mmap]:
+        """A kept archive, memory-mapped once per process."""
+        stat = archive_path.stat()
+        with _mapped_archives_lock:
+            mapped = _mapped_archives.get(archive_path)
+            if mapped is None or mapped[0] != (stat.st_mtime_ns, stat.st_ino):
+                with open(archive_path, "rb") as archive:
+                    stat = os.fstat(archive.fileno())
+                    mapped = (stat.st_mtime_ns, stat.st_ino), mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+                _mapped_archives[archive_path] = mapped
+            return mapped
+
+    def _get_recent_class_content(self, project_id: int, fully_qualified_name: str) -> Optional[str]:
+        """
+        The class's source if the cache checked it recently, using the class index this
+        process already loaded: no filesystem access and no thread.
+        """
+        if self.cache is None:
+            return None
+        loaded = _loaded_indexes.get(self._index_path(project_id))
+        relative_path = loaded[1]["classes"].get(fully_qualified_name.split("$", 1)[0]) if loaded else None
+        if relative_path is None:
             return None
+        return self.cache.get_recent(project_id, relative_path)
 
     # --- Async Public Methods (offload blocking work to threads) ---
 
-    async def save_project_source(self, project_id: int, zip_file_obj: BinaryIO):
-        await asyncio.to_thread(self._sync_save_zip, project_id, zip_file_obj)
+    async def save_project_source(self, project_id: int, source: Union[BinaryIO, Path]) -> Dict[str, str]:
+        return await asyncio.to_thread(self._sync_save_zip, project_id, source)
+
+    async def save_project_source_stream(self, project_id: int, chunks: AsyncIterator[bytes]) -> Dict[str, str]:
+        """Write an archive to disk as it arrives, e.g. from a request body, then store it."""
+        upload_path = self._new_path(project_id, ".upload.zip")
+        upload_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(upload_path, "wb") as upload:
+                size = 0
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.MAX_UPLOAD_SIZE:
+                        raise ValueError(f"Upload exceeds limit of {self.MAX_UPLOAD_SIZE} bytes")
+                    await asyncio.to_thread(upload.write, chunk)
+            return await asyncio.to_thread(self._sync_save_zip, project_id, upload_path)
+        finally:
+            upload_path.unlink(missing_ok=True)
 
     async def delete_project_source(self, project_id: int):
         await asyncio.to_thread(self._sync_delete_source, project_id)
 
+    async def collect_garbage(self) -> dict:
+        return await asyncio.to_thread(self._sync_collect_garbage)
+
+    async def get_class_index(self, project_id: int) -> Optional[Dict[str, str]]:
+        return await asyncio.to_thread(self._sync_get_class_index, project_id)
+
     async def get_source_file(self, project_id: int, fully_qualified_name: str) -> Optional[str]:
+        content = self._get_recent_class_content(project_id, fully_qualified_name)
+        if content is not None:
+            return content
         return await asyncio.to_thread(self._sync_get_class_content, project_id, fully_qualified_name)
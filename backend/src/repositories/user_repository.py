@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 
-from core.database import Database
+from core.database import Database, escape_like
+from repositories.progress_repository import lock_project_progress
 
 
 class UserRepository:
@@ -54,8 +55,94 @@ class UserRepository:
             )
             return [dict(row) for row in rows]
 
-    async def delete_by_id(self, user_id: int) -> None:
+    async def find_users_with_review_counts(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> List[dict]:
+        """Find users ordered by username, each with the number of mutants they reviewed.
+
+        Keyset paginated: pass the username of the last user of a page as `after`
+        to get the next one. `search` keeps only usernames starting with it.
+        """
+        conditions = []
+        args = []
+        if after is not None:
+            args.append(after)
+            conditions.append(f"username > ${len(args)}")
+        if search:
+            args.append(escape_like(search) + "%")
+            conditions.append(f"username LIKE ${len(args)}")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit_clause = ""
+        if limit is not None:
+            args.append(limit)
+            limit_clause = f"LIMIT ${len(args)}"
+
         async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT u.id, u.username, u.is_admin, u.is_active,
+                       COALESCE(rv.mutants_reviewed, 0) AS mutants_reviewed
+                FROM (
+                    SELECT id, username, is_admin, is_active
+                    FROM users
+                    {where}
+                    ORDER BY username
+                    {limit_clause}
+                ) u
+                CROSS JOIN LATERAL (
+                    SELECT SUM(reviewed_mutants) AS mutants_reviewed
+                    FROM project_user_progress
+                    WHERE user_id = u.id
+                ) rv
+                ORDER BY u.username
+                """,
+                *args
+            )
+            return [dict(row) for row in rows]
+
+    async def delete_by_id(self, user_id: int) -> None:
+        """Delete a user. Their ratings go away by cascade; mutants that are left without
+        any rating are taken off the rated_mutants counters in the same transaction.
+        """
+        async with self.db.transaction() as conn:
+            # Same lock order as RatingRepository: mutant rows first, then the counters
+            project_ids = await conn.fetch(
+                """
+                WITH rated AS (
+                    SELECT m.project_id
+                    FROM mutants m
+                    WHERE m.id IN (SELECT mutant_id FROM rating WHERE user_id = $1)
+                    ORDER BY m.id
+                    FOR NO KEY UPDATE
+                )
+                SELECT DISTINCT project_id FROM rated
+                """,
+                user_id
+            )
+            await lock_project_progress(conn, [row["project_id"] for row in project_ids])
+            await conn.execute(
+                """
+                UPDATE project_progress AS pp
+                SET rated_mutants = pp.rated_mutants - lost.mutants
+                FROM (
+                    SELECT r.project_id, COUNT(*) AS mutants
+                    FROM rating r
+                    -- LATERAL ... LIMIT 1 looks up each mutant in the rating index
+                    LEFT JOIN LATERAL (
+                        SELECT 1 AS kept FROM rating other
+                        WHERE other.mutant_id = r.mutant_id AND other.user_id <> $1
+                        LIMIT 1
+                    ) other ON TRUE
+                    WHERE r.user_id = $1 AND other.kept IS NULL
+                    GROUP BY r.project_id
+                ) AS lost
+                WHERE pp.project_id = lost.project_id
+                """,
+                user_id
+            )
             await conn.execute(
                 "DELETE FROM users WHERE id = $1",
                 user_id
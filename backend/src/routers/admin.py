@@ -1,16 +1,20 @@
-from typing import List
 import asyncio
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status, HTTPException, Query, Response
+import shutil
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, Form, UploadFile, status, HTTPException, Query, Request, Response
 
-from dependencies import get_auth_service, get_current_admin, get_project_service, get_form_field_service, get_source_code_service
+from dependencies import get_auth_service, get_current_admin, get_project_service, get_form_field_service, get_source_code_service, get_job_queue
+from core.security import PasswordHasherBusyError
 from repositories import http_responses
 from services.auth import AuthService
 from services.project import ProjectService, ProjectNameExistsError
 from services.source_code import SourceCodeService
 from services.form_field import FormFieldService
 from services import xml_parser
+from services.jobs import JobQueue, JobContext, PROJECT_IMPORT, SOURCE_UPLOAD
+from routers.jobs import job_accepted
 from models.project import ProjectRenameRequest
-from models.source_code import SourceCodeResponse, SourceClassQuery
+from models.source_code import SourceCodeResponse, SourceClassQuery, SourceUploadResponse
 from models.auth import UserResponse, RegisterRequest, ResetPasswordRequest
 from models.form_field import (
     FormFieldCreate,
@@ -27,7 +31,10 @@ async def register(
     user: UserResponse = Depends(get_current_admin),
     auth_service: AuthService = Depends(get_auth_service)
 ):
-    await auth_service.register(register_data.username, register_data.password)
+    try:
+        await auth_service.register(register_data.username, register_data.password)
+    except PasswordHasherBusyError:
+        raise http_responses.PASSWORD_HASHER_BUSY
 
 
 @router.patch("/users/{user_id}/reset", status_code=status.HTTP_200_OK)
@@ -37,7 +44,10 @@ async def reset(
     user: UserResponse = Depends(get_current_admin),
     auth_service: AuthService = Depends(get_auth_service)
 ):
-    await auth_service.reset(user_id, reset_data.new_password)
+    try:
+        await auth_service.reset(user_id, reset_data.new_password)
+    except PasswordHasherBusyError:
+        raise http_responses.PASSWORD_HASHER_BUSY
 
 @router.delete("/projects/{project_id}", status_code=status.HTTP_200_OK)
 async def delete_project(
@@ -51,12 +61,36 @@ async def delete_project(
 
 @router.get("/users", status_code=status.HTTP_200_OK)
 async def get_all_users(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Username of the last user of the previous page"),
+    search: Optional[str] = Query(None, max_length=50, description="Username prefix"),
     user: UserResponse = Depends(get_current_admin),
     auth_service: AuthService = Depends(get_auth_service)
 ):
-    users = await auth_service.get_all_users()
+    users = await auth_service.get_all_users(limit=limit, after=after, search=search)
     return users
 
+@router.get("/metrics/session-cache", status_code=status.HTTP_200_OK)
+async def get_session_cache_metrics(
+    user: UserResponse = Depends(get_current_admin),
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    return auth_service.get_session_cache_stats()
+
+@router.post("/storage/collect-garbage", status_code=status.HTTP_200_OK)
+async def collect_source_garbage(
+    user: UserResponse = Depends(get_current_admin),
+    source_service: SourceCodeService = Depends(get_source_code_service)
+):
+    return await source_service.collect_garbage()
+
+@router.get("/metrics/source-cache", status_code=status.HTTP_200_OK)
+async def get_source_cache_metrics(
+    user: UserResponse = Depends(get_current_admin),
+    source_service: SourceCodeService = Depends(get_source_code_service)
+):
+    return source_service.get_cache_stats()
+
 @router.delete("/users/{user_id}", status_code=status.HTTP_200_OK)
 async def delete_user(
     user_id: int,
@@ -178,22 +212,47 @@ async def get_all_projects(
     projects = await project_service.get_all_projects()
     return projects
 
+def _stage_upload(file: UploadFile, name: str):
+    """Copy an upload into a job's working directory; the upload is gone once the request ends."""
+    async def stage(workdir):
+        def copy():
+            with open(workdir / name, "wb") as target:
+                shutil.copyfileobj(file.file, target)
+        await asyncio.to_thread(copy)
+    return stage
+
+
 @router.post("/projects/", status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_name: str = Form(...),
     file: UploadFile = File(...),
+    background: bool = Query(False, description="Import in a background job and return it with 202"),
     user: UserResponse = Depends(get_current_admin),
-    project_service: ProjectService = Depends(get_project_service)
+    project_service: ProjectService = Depends(get_project_service),
+    jobs: JobQueue = Depends(get_job_queue)
 ):
     if not file.filename or not file.filename.endswith('.xml'):
         raise HTTPException(400, "File must be an .xml file")
 
-    content = await file.read()
+    if background:
+        async def run(job: JobContext) -> dict:
+            project_id = await project_service.create_from_xml_file(
+                project_name, job.workdir / "mutations.xml", job.progress
+            )
+            await project_service.add_user(project_id, user.id)
+            return {"id": project_id, "name": project_name}
+
+        job = await jobs.submit(
+            PROJECT_IMPORT, run, params={"project_name": project_name}, created_by=user.id,
+            stage=_stage_upload(file, "mutations.xml")
+        )
+        return job_accepted(job)
 
-    loop = asyncio.get_running_loop()
+    # Stream the spooled upload through the parser instead of reading it into memory
+    batches = xml_parser.stream_mutation_batches(file.file)
     try:
-        # Pass 0 as temp project_id, we fill it later
-        parsed_data = await loop.run_in_executor(None, xml_parser.parse_mutations, content)
+        # Pull the first batch eagerly so malformed reports are rejected before a project exists
+        first_batch = await anext(batches, None)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -201,20 +260,27 @@ async def create_project(
         raise HTTPException(status_code=400, detail=f"Failed to parse XML: {e}")
 
     try:
-        project_id = await project_service.create(project_name, parsed_data)
+        project_id = await project_service.create_from_batches(
+            project_name, xml_parser.chain_batches(first_batch, batches)
+        )
     except ProjectNameExistsError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     await project_service.add_user(project_id, user.id)
 
     return {"id": project_id, "name": project_name}
 
-@router.put("/project/{project_id}/source", status_code=status.HTTP_201_CREATED)
+@router.put("/project/{project_id}/source", response_model=SourceUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_project_source_code(
     project_id: int,
     file: UploadFile = File(...),
+    background: bool = Query(False, description="Extract in a background job and return it with 202"),
     user: UserResponse = Depends(get_current_admin),
-    source_service: SourceCodeService = Depends(get_source_code_service)
+    source_service: SourceCodeService = Depends(get_source_code_service),
+    project_service: ProjectService = Depends(get_project_service),
+    jobs: JobQueue = Depends(get_job_queue)
 ):
     if not file.filename or not file.filename.endswith('.zip'):
         raise HTTPException(
@@ -222,9 +288,24 @@ async def upload_project_source_code(
             detail="File must be a .zip file"
         )
 
+    if background:
+        # Check before staging the archive; the job row references the project
+        if not await project_service.does_project_exsist(project_id):
+            raise http_responses.PROJECT_NOT_FOUND
+
+        async def run(job: JobContext) -> dict:
+            report = await source_service.upload_project_source_file(project_id, job.workdir / "source.zip")
+            return report.model_dump()
+
+        job = await jobs.submit(
+            SOURCE_UPLOAD, run, project_id=project_id, created_by=user.id,
+            stage=_stage_upload(file, "source.zip")
+        )
+        return job_accepted(job)
+
     try:
         # file.file is the standard python file interface needed by the service
-        await source_service.upload_project_source(project_id, file)
+        report = await source_service.upload_project_source(project_id, file)
     except ValueError as e:
         # Catches zip bombs, invalid class names, or malicious paths
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -236,7 +317,34 @@ async def upload_project_source_code(
             detail="Failed to process source code archive"
         )
 
-    return {"detail": "Source code uploaded and extracted successfully"}
+    return report
+
+@router.put("/project/{project_id}/source/stream", response_model=SourceUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_project_source_code_stream(
+    project_id: int,
+    request: Request,
+    user: UserResponse = Depends(get_current_admin),
+    source_service: SourceCodeService = Depends(get_source_code_service)
+):
+    """Upload a source archive sent as the raw request body (Content-Type: application/zip)."""
+    if request.headers.get("content-type", "").split(";")[0].strip() != "application/zip":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be a .zip file (Content-Type: application/zip)"
+        )
+
+    try:
+        report = await source_service.upload_project_source_stream(project_id, request.stream())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        print(f"Upload error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to process source code archive"
+        )
+
+    return report
 
 
 
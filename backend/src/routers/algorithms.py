@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 
-from dependencies import get_current_admin, get_algorithm_service
+from dependencies import get_current_admin, get_algorithm_service, get_project_service, get_job_queue
+from repositories import http_responses
 from services.algorithm import AlgorithmService, AlgorithmNotFoundError, AlgorithmError
+from services.project import ProjectService
+from services.jobs import JobQueue, JobContext, RANKING
+from routers.jobs import job_accepted
 from models.auth import UserResponse
 from models.algorithm import (
     AlgorithmListResponse,
     AlgorithmInfo,
+    AlgorithmReloadResponse,
     ApplyAlgorithmRequest,
     ApplyAlgorithmResponse
 )
@@ -26,6 +31,15 @@ async def list_algorithms(
     )
 
 
+@router.post("/algorithms/reload", response_model=AlgorithmReloadResponse)
+async def reload_algorithms(
+    user: UserResponse = Depends(get_current_admin),
+    algorithm_service: AlgorithmService = Depends(get_algorithm_service)
+):
+    """Rescan the algorithms directory for new, changed and removed algorithm files."""
+    return AlgorithmReloadResponse(**algorithm_service.reload_algorithms())
+
+
 @router.post(
     "/projects/{project_id}/algorithm",
     response_model=ApplyAlgorithmResponse,
@@ -34,14 +48,39 @@ async def list_algorithms(
 async def apply_algorithm(
     project_id: int,
     request: ApplyAlgorithmRequest,
+    background: bool = Query(False, description="Rank in a background job and return it with 202"),
     user: UserResponse = Depends(get_current_admin),
-    algorithm_service: AlgorithmService = Depends(get_algorithm_service)
+    algorithm_service: AlgorithmService = Depends(get_algorithm_service),
+    project_service: ProjectService = Depends(get_project_service),
+    jobs: JobQueue = Depends(get_job_queue)
 ):
     """Apply a sorting algorithm to all mutants in a project."""
+    if background:
+        if not algorithm_service.has_algorithm(request.algorithm):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Algorithm '{request.algorithm}' not found"
+            )
+        # The job row references the project
+        if not await project_service.does_project_exsist(project_id):
+            raise http_responses.PROJECT_NOT_FOUND
+
+        async def run(job: JobContext) -> dict:
+            return await algorithm_service.apply_algorithm(
+                project_id, request.algorithm, job.progress, full=request.full
+            )
+
+        job = await jobs.submit(
+            RANKING, run, params={"algorithm": request.algorithm, "full": request.full},
+            project_id=project_id, created_by=user.id
+        )
+        return job_accepted(job)
+
     try:
         result = await algorithm_service.apply_algorithm(
             project_id=project_id,
-            algorithm_id=request.algorithm
+            algorithm_id=request.algorithm,
+            full=request.full
         )
         return ApplyAlgorithmResponse(**result)
     except AlgorithmNotFoundError as e:
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, status
+from typing import Literal
 
-from dependencies import get_current_admin, get_export_service
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from dependencies import get_current_admin, get_export_service, get_job_queue
 from repositories import http_responses
 from services.export import ExportService
+from services.jobs import JobQueue, JobContext, EXPORT
+from routers.jobs import job_accepted
 from models.auth import UserResponse
 from models.export import ExportPreviewResponse, ExportDataResponse
 
 
 router = APIRouter(prefix="/api/admin/projects/{project_id}/export", tags=["export"])
 
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
 
 @router.get("/preview", status_code=status.HTTP_200_OK, response_model=ExportPreviewResponse)
 async def get_export_preview(
@@ -40,3 +51,64 @@ async def download_export(
         raise http_responses.PROJECT_NOT_FOUND
 
     return export_data
+
+
+@router.get("/stream", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def stream_export(
+    project_id: int,
+    export_format: Literal["ndjson", "csv", "parquet"] = Query("ndjson", alias="format"),
+    user: UserResponse = Depends(get_current_admin),
+    export_service: ExportService = Depends(get_export_service)
+):
+    """
+    Download all ratings of a project as NDJSON, CSV or Parquet.
+
+    Rows are sent while they are read from the database, so memory use does not grow
+    with the project and the download starts right away. Stats are not included; use
+    the preview endpoint for them.
+    """
+    if not await export_service.does_user_have_access(user.id, project_id):
+        raise http_responses.NO_ACCESS_TO_PROJECT
+
+    chunks = await export_service.stream_export(project_id, export_format)
+    if chunks is None:
+        raise http_responses.PROJECT_NOT_FOUND
+
+    return StreamingResponse(
+        chunks,
+        media_type=STREAM_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="project_{project_id}_ratings.{export_format}"'}
+    )
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def start_export_job(
+    project_id: int,
+    export_format: Literal["ndjson", "csv", "parquet"] = Query("ndjson", alias="format"),
+    user: UserResponse = Depends(get_current_admin),
+    export_service: ExportService = Depends(get_export_service),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """
+    Write the export to a file in a background job. When the job has succeeded,
+    download the file from GET /api/admin/jobs/{job_id}/result.
+    """
+    if not await export_service.does_user_have_access(user.id, project_id):
+        raise http_responses.NO_ACCESS_TO_PROJECT
+
+    file_name = f"project_{project_id}_ratings.{export_format}"
+
+    async def run(job: JobContext) -> dict:
+        job.keep_workdir = True
+        job.workdir.mkdir(parents=True, exist_ok=True)
+        written = await export_service.export_to_file(
+            project_id, export_format, job.workdir / file_name, job.progress
+        )
+        if written is None:
+            raise ValueError("Project not found")
+        return {"file": file_name, **written}
+
+    job = await jobs.submit(
+        EXPORT, run, params={"format": export_format}, project_id=project_id, created_by=user.id
+    )
+    return job_accepted(job)
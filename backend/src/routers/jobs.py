@@ -0,0 +1,75 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse
+
+from dependencies import get_current_admin, get_job_queue
+from repositories import http_responses
+from services.jobs import JobNotFoundError, JobQueue
+from models.auth import UserResponse
+from models.job import JobResponse, JobStatus
+
+
+router = APIRouter(prefix="/api/admin/jobs", tags=["jobs"])
+
+
+def job_accepted(job: dict) -> JSONResponse:
+    """202 response for an operation that was queued as a background job; poll GET /api/admin/jobs/{id}."""
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(JobResponse(**job)))
+
+
+@router.get("", status_code=status.HTTP_200_OK, response_model=list[JobResponse])
+async def list_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    status_filter: Optional[JobStatus] = Query(None, alias="status"),
+    job_type: Optional[str] = Query(None, alias="type", max_length=50),
+    user: UserResponse = Depends(get_current_admin),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """Background jobs, newest first."""
+    return await jobs.list_jobs(limit, status_filter, job_type)
+
+
+@router.get("/{job_id}", status_code=status.HTTP_200_OK, response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    user: UserResponse = Depends(get_current_admin),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """Poll a job for its status, progress and result."""
+    try:
+        return await jobs.get(job_id)
+    except JobNotFoundError:
+        raise http_responses.JOB_NOT_FOUND
+
+
+@router.post("/{job_id}/cancel", status_code=status.HTTP_200_OK, response_model=JobResponse)
+async def cancel_job(
+    job_id: int,
+    user: UserResponse = Depends(get_current_admin),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """Cancel a queued or running job; finished jobs are returned unchanged."""
+    try:
+        return await jobs.cancel(job_id)
+    except JobNotFoundError:
+        raise http_responses.JOB_NOT_FOUND
+
+
+@router.get("/{job_id}/result", status_code=status.HTTP_200_OK, response_class=FileResponse)
+async def download_job_result(
+    job_id: int,
+    user: UserResponse = Depends(get_current_admin),
+    jobs: JobQueue = Depends(get_job_queue)
+):
+    """Download the file produced by a succeeded export job."""
+    try:
+        job = await jobs.get(job_id)
+    except JobNotFoundError:
+        raise http_responses.JOB_NOT_FOUND
+
+    path = jobs.result_path(job)
+    if path is None:
+        raise http_responses.JOB_RESULT_NOT_AVAILABLE
+    return FileResponse(path, filename=job["result"]["file"])
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, status
 
+from core.security import PasswordHasherBusyError
 from repositories import http_responses
 from dependencies import get_auth_service
 from services.auth import AuthService
@@ -13,7 +14,10 @@ async def login(
     request: LoginRequest,
     auth_service: AuthService = Depends(get_auth_service)
 ):
-    success, token = await auth_service.login(request.username, request.password)
+    try:
+        success, token = await auth_service.login(request.username, request.password)
+    except PasswordHasherBusyError:
+        raise http_responses.PASSWORD_HASHER_BUSY
     if not success:
         raise http_responses.INVALID_LOGIN
     return TokenResponse(token=token)
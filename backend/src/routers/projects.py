@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
 
-from dependencies import get_current_user, get_project_service
+from fastapi import APIRouter, Depends, Query, Response, status
+
+from dependencies import get_adaptive_ranker, get_current_user, get_mutant_service, get_project_service
 from repositories import http_responses
-from services.project import ProjectService
+from services.adaptive_ranking import AdaptiveRanker
+from services.mutant import MutantService
+from services.project import InvalidCursorError, ProjectService
 from models.auth import UserResponse
 from models.project import ProjectListResponse
-from models.mutant import MutantOverviewResponse
+from models.mutant import (
+    MutantListFilter, MutantOverviewResponse, MutantStatus, NextMutantsResponse, SuggestedMutantResponse
+)
 
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
@@ -28,11 +34,81 @@ async def list_projects(
 @router.get("/{project_id}/mutants", status_code=status.HTTP_200_OK, response_model=list[MutantOverviewResponse])
 async def list_mutants(
     project_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, max_length=64),
+    status_filter: Optional[MutantStatus] = Query(None, alias="status"),
+    mutator: Optional[str] = Query(None, max_length=255),
+    source_file: Optional[str] = Query(None, max_length=255),
+    rated: Optional[bool] = None,
     user: UserResponse = Depends(get_current_user),
     project_service: ProjectService = Depends(get_project_service)
 ):
+    """
+    List the mutants of a project in ranking order.
+
+    Filter by status, mutator, source_file (a path prefix) and whether the user has rated
+    them. With a limit, pass the X-Next-Cursor header of a response as `cursor` to get the
+    next page; it is absent on the last page. X-Total-Count is the number of matching mutants.
+    """
+    if not await project_service.does_user_belong_to_project(user.id, project_id):
+        raise http_responses.NO_ACCESS_TO_PROJECT
+    filters = MutantListFilter(
+        status=status_filter, mutator=mutator, source_file_prefix=source_file, rated=rated
+    )
+    try:
+        page = await project_service.get_mutant_list(user.id, project_id, limit, cursor, filters)
+    except InvalidCursorError:
+        raise http_responses.INVALID_CURSOR
+    response.headers["X-Total-Count"] = str(page.total)
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.mutants
+
+
+
+@router.get("/{project_id}/mutants/next", status_code=status.HTTP_200_OK, response_model=NextMutantsResponse)
+async def next_mutant(
+    project_id: int,
+    after: Optional[int] = Query(None, gt=0),
+    prefetch: int = Query(0, ge=0, le=10),
+    unrated_only: bool = True,
+    user: UserResponse = Depends(get_current_user),
+    project_service: ProjectService = Depends(get_project_service),
+    mutant_service: MutantService = Depends(get_mutant_service)
+):
+    """
+    The next mutant to review in ranking order, with its class source, the user's
+    rating and the project's form fields, so a review step takes one request.
+
+    Starts after mutant `after` if given, skips mutants the user rated unless
+    unrated_only is false, and includes up to `prefetch` following mutants as well.
+    `mutants` is empty at the end of the list.
+    """
     if not await project_service.does_user_belong_to_project(user.id, project_id):
         raise http_responses.NO_ACCESS_TO_PROJECT
-    mutants = await project_service.get_mutant_list(user.id, project_id)
-    return mutants
+    return await mutant_service.get_next(user.id, project_id, after, prefetch, unrated_only)
+
+
+@router.get(
+    "/{project_id}/mutants/suggested",
+    status_code=status.HTTP_200_OK,
+    response_model=list[SuggestedMutantResponse]
+)
+async def suggest_mutants(
+    project_id: int,
+    limit: int = Query(1, ge=1, le=100),
+    user: UserResponse = Depends(get_current_user),
+    project_service: ProjectService = Depends(get_project_service),
+    ranker: AdaptiveRanker = Depends(get_adaptive_ranker)
+):
+    """
+    The mutants the user should rate next, best first.
 
+    Learned from the ratings given so far: mutants whose mutator, class, method and
+    status received high star ratings come first, and within equally promising ones
+    the project's ranking order is kept. Empty once the user rated every mutant.
+    """
+    if not await project_service.does_user_belong_to_project(user.id, project_id):
+        raise http_responses.NO_ACCESS_TO_PROJECT
+    return await ranker.next_unrated(project_id, user.id, limit)
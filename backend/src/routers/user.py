@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, status, Request, HTTPException
 
+from core.security import PasswordHasherBusyError
 from repositories import http_responses
 from dependencies import get_auth_service, get_current_user
 from services.auth import AuthService
@@ -46,9 +47,12 @@ async def resetPassword(
     user: UserResponse = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ):
-    if not await auth_service.authorize(user.username, reset_data.current_password):
-        raise http_responses.INVALID_LOGIN
-    await auth_service.reset(user.id, reset_data.new_password)
+    try:
+        if not await auth_service.authorize(user.username, reset_data.current_password):
+            raise http_responses.INVALID_LOGIN
+        await auth_service.reset(user.id, reset_data.new_password)
+    except PasswordHasherBusyError:
+        raise http_responses.PASSWORD_HASHER_BUSY
 
 
 @router.patch("/username", status_code=status.HTTP_200_OK, response_model=UserResponse)
@@ -0,0 +1,323 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from core.config import config
+from core.database import db
+from repositories.form_field_repository import FormFieldRepository
+from repositories.mutant_repository import MutantRepository
+from repositories.rating_repository import RatingRepository
+
+# Mutant features whose ratings are learned, and the mutants columns they are read from
+FEATURES = ("mutator", "mutatedclass", "mutatedmethod", "status")
+
+# Values of a "rating" form field run from 1 to RATING_SCALE stars
+RATING_SCALE = 5
+# How many ratings' worth of the project mean a feature value starts out with
+PRIOR_WEIGHT = 2.0
+# Weight of the bonus for feature values with few ratings, so they get explored
+EXPLORATION = 0.1
+# Only the best mutants are sorted: this many more than the most active reviewer rated,
+# so every reviewer has at least this many unrated ones in the sorted part
+SORTED_MARGIN = 1000
+# Projects up to this many mutants have their order refreshed on every lookup after a
+# rating; larger ones in a thread, at most once per refresh interval
+INLINE_REFRESH_MUTANTS = 10000
+
+
+def rating_score(values: Iterable[str]) -> Optional[float]:
+    """Mean of the star values as a score from 0 to 1, None if there is no valid one."""
+    scores = []
+    for value in values:
+        try:
+            stars = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= stars <= RATING_SCALE:
+            scores.append((stars - 1) / (RATING_SCALE - 1))
+    return sum(scores) / len(scores) if scores else None
+
+
+@dataclass
+class SuggestedMutant:
+    id: int
+    # Expected score of a rating (0 to 1), from the ratings of mutants with the same features
+    predicted_score: float
+
+
+def _factorize(values: Sequence) -> Tuple[np.ndarray, int]:
+    """Integer code of every value (in order of first appearance) and the number of distinct values."""
+    codes: Dict[object, int] = {}
+    array = np.fromiter((codes.setdefault(v, len(codes)) for v in values), dtype=np.int32, count=len(values))
+    return array, len(codes)
+
+
+@dataclass
+class _Reviewer:
+    # Rows the reviewer rated
+    rated: Set[int]
+    # Position in the model's order before which every row is rated, valid for `version`
+    cursor: int = 0
+    version: int = -1
+
+
+class ProjectModel:
+    """
+    Warm ranking state of one project.
+
+    A mutant's priority is the mean, over its features (mutator, class, method and
+    status), of the smoothed mean score of the feature's value, plus a bonus for
+    values with few ratings; equal priorities keep the project's ranking order.
+
+    Ratings update the per-value sums in O(1) and mark the order stale. refresh()
+    recomputes every priority with a few vectorized gathers and sorts the best
+    mutants, and between refreshes a reviewer's next suggestion is found by moving
+    a cursor along that order past the mutants they rated.
+    """
+
+    def __init__(self, mutants: Dict[str, Sequence], rating_field_ids: Set[int]):
+        """`mutants`: mutant ids and one sequence per FEATURES column, in ranking order."""
+        self.rating_field_ids = rating_field_ids
+        self.loaded_at = time.monotonic()
+        self.ids = np.asarray(mutants["id"], dtype=np.int64)
+        self._id_order = np.argsort(self.ids, kind="stable")
+        self._sorted_ids = self.ids[self._id_order]
+
+        self._codes = []
+        self.sums = []
+        self.counts = []
+        for feature in FEATURES:
+            codes, distinct = _factorize(mutants[feature])
+            self._codes.append(codes)
+            self.sums.append(np.zeros(distinct))
+            self.counts.append(np.zeros(distinct))
+        self.total_sum = 0.0
+        self.total_count = 0
+        self._scores: Dict[Tuple[int, int], float] = {}
+        self._reviewers: Dict[int, _Reviewer] = {}
+
+        # Rows in suggestion order and the predicted score of every row, as of the last refresh
+        self.order = np.arange(len(self.ids))
+        self.predicted = np.full(len(self.ids), 0.5)
+        self._priority = np.zeros(len(self.ids))
+        self.version = 0
+        self.stale = False
+        self.refreshing = False
+        self.refreshed_at = self.loaded_at
+
+    def score(self, field_values: Iterable[Tuple[int, str]]) -> Optional[float]:
+        """Score of a rating from its (form field id, value) pairs."""
+        return rating_score(value for field_id, value in field_values if field_id in self.rating_field_ids)
+
+    def row_of(self, mutant_id: int) -> Optional[int]:
+        index = np.searchsorted(self._sorted_ids, mutant_id)
+        if index < len(self._sorted_ids) and self._sorted_ids[index] == mutant_id:
+            return int(self._id_order[index])
+        return None
+
+    def record(self, mutant_id: int, user_id: int, score: Optional[float]) -> bool:
+        """
+        Apply a new or changed rating, with `score` None if it has no star values.
+        Returns False if the mutant is not part of the project.
+        """
+        row = self.row_of(mutant_id)
+        if row is None:
+            return False
+        previous = self._scores.pop((row, user_id), None)
+        if previous is not None:
+            self._add(row, -previous, -1)
+        if score is not None:
+            self._scores[(row, user_id)] = score
+            self._add(row, score, 1)
+        self._reviewer(user_id).rated.add(row)
+        return True
+
+    def _add(self, row: int, score: float, count: int) -> None:
+        for f, codes in enumerate(self._codes):
+            self.sums[f][codes[row]] += score
+            self.counts[f][codes[row]] += count
+        self.total_sum += score
+        self.total_count += count
+        self.stale = True
+
+    def _reviewer(self, user_id: int) -> _Reviewer:
+        reviewer = self._reviewers.get(user_id)
+        if reviewer is None:
+            reviewer = self._reviewers[user_id] = _Reviewer(set())
+        return reviewer
+
+    def statistics(self) -> tuple:
+        """Copy of the rating statistics, for compute_order() to work on while ratings keep coming in."""
+        self.stale = False
+        top = SORTED_MARGIN + max((len(r.rated) for r in self._reviewers.values()), default=0)
+        sums, counts = [s.copy() for s in self.sums], [c.copy() for c in self.counts]
+        return sums, counts, self.total_sum, self.total_count, top
+
+    def compute_order(self, statistics: tuple) -> Tuple[Tuple[np.ndarray, np.ndarray], np.ndarray]:
+        """
+        ((predicted score, priority) of every row, rows in suggestion order) for the given
+        statistics. Only the best rows are ordered; see extend(). Safe to run off the event loop.
+        """
+        sums, counts, total_sum, total_count, top = statistics
+        prior = total_sum / total_count if total_count else 0.5
+        predicted = np.zeros(len(self.ids))
+        bonus = np.zeros(len(self.ids))
+        for f, codes in enumerate(self._codes):
+            predicted += ((sums[f] + PRIOR_WEIGHT * prior) / (counts[f] + PRIOR_WEIGHT))[codes]
+            bonus += (1 / np.sqrt(counts[f] + 1))[codes]
+        predicted /= len(FEATURES)
+        priority = predicted + EXPLORATION * bonus / len(FEATURES)
+
+        if top >= len(priority):
+            rows = np.arange(len(priority))
+        else:
+            # The `top` highest priorities; of those equal to the lowest one, the best ranked
+            threshold = np.partition(priority, len(priority) - top)[len(priority) - top]
+            above = np.flatnonzero(priority > threshold)
+            rows = np.concatenate([above, np.flatnonzero(priority == threshold)[:top - len(above)]])
+        # Equal priorities keep the ranking order
+        order = rows[np.lexsort((rows, -priority[rows]))]
+        return (predicted, priority), order
+
+    def extend(self) -> None:
+        """Order all rows, for a reviewer who got past the sorted ones."""
+        priority = self._priority
+        self.order = np.lexsort((np.arange(len(priority)), -priority))
+
+    def install(self, scores: Tuple[np.ndarray, np.ndarray], order: np.ndarray) -> None:
+        (self.predicted, self._priority), self.order = scores, order
+        self.version += 1
+        self.refreshed_at = time.monotonic()
+
+    def refresh(self) -> None:
+        """Recompute the suggestion order from the current ratings."""
+        self.install(*self.compute_order(self.statistics()))
+
+    def next_unrated(self, user_id: int, count: int = 1) -> List[SuggestedMutant]:
+        """The `count` mutants the user has not rated yet that come first in the current order."""
+        reviewer = self._reviewer(user_id)
+        if reviewer.version != self.version:
+            reviewer.cursor, reviewer.version = 0, self.version
+        rated = reviewer.rated
+
+        index = reviewer.cursor
+        suggestions = []
+        while len(suggestions) < count:
+            if index == len(self.order):
+                if len(self.order) == len(self.ids):
+                    break
+                self.extend()
+            row = self.order[index]
+            if row not in rated:
+                suggestions.append(SuggestedMutant(int(self.ids[row]), round(float(self.predicted[row]), 4)))
+            elif not suggestions:
+                reviewer.cursor = index + 1
+            index += 1
+        return suggestions
+
+
+class AdaptiveRanker:
+    """
+    Per-process cache of warm ProjectModels, fed with ratings as they are submitted.
+
+    A project's model is built from the database on first use and kept for `ttl`
+    seconds, at most `max_projects` of them (least recently used are dropped).
+    Ratings submitted through this process update the models at once, including
+    those still being built; ratings submitted through other processes are picked
+    up when the model is rebuilt after the TTL. Large models refresh their order
+    off the event loop at most every `refresh_interval` seconds, and lookups are
+    served from the previous order meanwhile.
+
+    Usage:
+        suggestions = await adaptive_ranker.next_unrated(project_id, user.id, count=5)
+    """
+
+    def __init__(self, mutant_repository: MutantRepository, rating_repository: RatingRepository,
+                 form_field_repository: FormFieldRepository, max_projects: int, ttl: float,
+                 refresh_interval: float):
+        self.mutant_repository = mutant_repository
+        self.rating_repository = rating_repository
+        self.form_field_repository = form_field_repository
+        self.max_projects = max_projects
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.loads = 0
+        self._models: "OrderedDict[int, ProjectModel]" = OrderedDict()
+        # One list per model being built, collecting the ratings recorded meanwhile
+        self._pending: List[List[Tuple[int, int, List[Tuple[int, str]]]]] = []
+
+    async def next_unrated(self, project_id: int, user_id: int, count: int = 1) -> List[SuggestedMutant]:
+        model = await self.get_model(project_id)
+        if model.stale:
+            await self._refresh(model)
+        return model.next_unrated(user_id, count)
+
+    async def get_model(self, project_id: int) -> ProjectModel:
+        model = self._models.get(project_id)
+        if model is not None and time.monotonic() - model.loaded_at < self.ttl:
+            self._models.move_to_end(project_id)
+            return model
+        return await self._load(project_id)
+
+    def record_rating(self, mutant_id: int, user_id: int, field_values: List[Tuple[int, str]]) -> None:
+        """Apply a submitted rating to the model of the mutant's project, if it is warm."""
+        for pending in self._pending:
+            pending.append((mutant_id, user_id, field_values))
+        for model in self._models.values():
+            if model.record(mutant_id, user_id, model.score(field_values)):
+                return
+
+    def invalidate(self, project_id: int) -> None:
+        """Drop a project's model, e.g. after its mutants were re-ranked."""
+        self._models.pop(project_id, None)
+
+    async def _refresh(self, model: ProjectModel, force: bool = False) -> None:
+        if len(model.ids) <= INLINE_REFRESH_MUTANTS:
+            model.refresh()
+            return
+        if model.refreshing or (not force and time.monotonic() - model.refreshed_at < self.refresh_interval):
+            return
+        model.refreshing = True
+        try:
+            model.install(*await asyncio.to_thread(model.compute_order, model.statistics()))
+        finally:
+            model.refreshing = False
+
+    async def _load(self, project_id: int) -> ProjectModel:
+        pending = []
+        self._pending.append(pending)
+        try:
+            mutants = await self.mutant_repository.get_all_for_adaptive_ranking(project_id)
+            ratings = await self.rating_repository.find_rating_values_by_project(project_id)
+            fields = await self.form_field_repository.find_by_project_id(project_id)
+            columns = {name: [m[name] for m in mutants] for name in ("id",) + FEATURES}
+            model = await asyncio.to_thread(
+                ProjectModel, columns, {f["id"] for f in fields if f["type"] == "rating"}
+            )
+        finally:
+            self._pending = [other for other in self._pending if other is not pending]
+
+        for rating in ratings:
+            model.record(rating["mutant_id"], rating["user_id"], rating_score(rating["rating_values"]))
+        # Replaying is harmless for ratings the queries already saw: a rating replaces the previous one
+        for mutant_id, user_id, field_values in pending:
+            model.record(mutant_id, user_id, model.score(field_values))
+
+        self.loads += 1
+        self._models[project_id] = model
+        self._models.move_to_end(project_id)
+        while len(self._models) > self.max_projects:
+            self._models.popitem(last=False)
+        await self._refresh(model, force=True)
+        return model
+
+
+# Create a singleton instance to be imported by other modules
+adaptive_ranker = AdaptiveRanker(
+    MutantRepository(db), RatingRepository(db), FormFieldRepository(db),
+    config.ADAPTIVE_RANKING_PROJECTS, config.ADAPTIVE_RANKING_TTL, config.ADAPTIVE_RANKING_REFRESH_INTERVAL
+)
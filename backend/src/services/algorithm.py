@@ -1,20 +1,28 @@
-import importlib
-import importlib.util
-import os
-import sys
-from pathlib import Path
-from typing import Dict, List, Type
+from typing import Callable, Dict, List, Optional
 import math
 
+from core.algorithm_runner import AlgorithmRunner, AlgorithmRunnerError, algorithm_runner
 from repositories.mutant_repository import MutantRepository
 from repositories.project_repository import ProjectRepository
+from services.adaptive_ranking import AdaptiveRanker, adaptive_ranker
+# Puts backend/ on the path, so it comes before the algorithms import
+from services.algorithm_registry import AlgorithmEntry, AlgorithmRegistry, algorithm_registry
 
-# Add parent directory (backend/) to path so we can import algorithms
-BACKEND_DIR = Path(__file__).parent.parent.parent
-if str(BACKEND_DIR) not in sys.path:
-    sys.path.insert(0, str(BACKEND_DIR))
+from algorithms.base import MutantBatch
 
-from algorithms.base import RankingStrategy, MutantData
+
+# MutantData fields and the mutants columns they are read from
+MUTANT_COLUMNS = {
+    "id": "id",
+    "source_file": "sourcefile",
+    "mutated_class": "mutatedclass",
+    "mutated_method": "mutatedmethod",
+    "line_number": "linenumber",
+    "mutator": "mutator",
+    "status": "status",
+    "detected": "detected",
+    "description": "description",
+}
 
 
 class AlgorithmError(Exception):
@@ -31,124 +39,134 @@ class AlgorithmService:
     def __init__(
         self,
         mutant_repository: MutantRepository,
-        project_repository: ProjectRepository
+        project_repository: ProjectRepository,
+        runner: AlgorithmRunner = algorithm_runner,
+        registry: AlgorithmRegistry = algorithm_registry,
+        ranker: AdaptiveRanker = adaptive_ranker
     ):
         self.mutant_repository = mutant_repository
         self.project_repository = project_repository
-        self._algorithms: Dict[str, Type[RankingStrategy]] = {}
-        self._load_algorithms()
-
-    def _load_algorithms(self) -> None:
-        """Dynamically load all algorithm classes from the algorithms directory."""
-        algorithms_dir = BACKEND_DIR / "algorithms"
-        for file_path in algorithms_dir.glob("*.py"):
-            if file_path.name.startswith("_") or file_path.name == "base.py":
-                continue
+        self.runner = runner
+        self.registry = registry
+        self.ranker = ranker
 
-            module_name = file_path.stem
-            try:
-                spec = importlib.util.spec_from_file_location(
-                    f"algorithms.{module_name}",
-                    file_path
-                )
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and
-                            issubclass(attr, RankingStrategy) and
-                            attr is not RankingStrategy):
-                            algorithm_id = self._class_to_id(attr_name)
-                            self._algorithms[algorithm_id] = attr
-            except Exception as e:
-                print(f"Warning: Failed to load algorithm from {file_path}: {e}")
-
-    def _class_to_id(self, class_name: str) -> str:
-        """Convert class name to algorithm ID (e.g., LexicographicalRank -> lexicographical_rank)."""
-        result = []
-        for i, char in enumerate(class_name):
-            if char.isupper() and i > 0:
-                result.append('_')
-            result.append(char.lower())
-        return ''.join(result)
+    def has_algorithm(self, algorithm_id: str) -> bool:
+        return self.registry.get(algorithm_id) is not None
 
     def get_available_algorithms(self) -> List[Dict]:
         """Get list of all available algorithms."""
-        algorithms = []
-        for algorithm_id, algorithm_class in self._algorithms.items():
-            instance = algorithm_class()
-            algorithms.append({
-                "id": algorithm_id,
-                "name": instance.name,
-                "description": instance.description
-            })
-        return sorted(algorithms, key=lambda x: x["name"])
+        return [
+            {"id": entry.id, "name": entry.name, "description": entry.description}
+            for entry in self.registry.entries()
+        ]
+
+    def reload_algorithms(self) -> Dict:
+        """Pick up new, changed and removed files in the algorithms directory."""
+        result = self.registry.reload()
+        return {
+            "added": result.added,
+            "updated": result.updated,
+            "removed": result.removed,
+            "failed": result.failed,
+            "algorithms": self.get_available_algorithms()
+        }
 
     async def apply_algorithm(
         self,
         project_id: int,
-        algorithm_id: str
+        algorithm_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        full: bool = False
     ) -> Dict:
         """
         Apply a ranking algorithm to all mutants in a project.
 
-        Returns dict with success status, algorithm name, and count of ranked mutants.
-        """
-        if algorithm_id not in self._algorithms:
-            raise AlgorithmNotFoundError(f"Algorithm '{algorithm_id}' not found")
+        Algorithms with a sort key are applied incrementally when they (in the same
+        version, from an unchanged file) produced the project's current ordering:
+        only mutants without a stored key are loaded and keyed, and the others keep
+        theirs. `full` forces every key to be recomputed. Runs for the same project
+        are serialized.
 
-        algorithm_class = self._algorithms[algorithm_id]
-        algorithm = algorithm_class()
-
-        mutants_data = await self.mutant_repository.get_all_for_ranking(project_id)
-        if not mutants_data:
-            return {
-                "success": True,
-                "algorithm_name": algorithm.name,
-                "mutants_ranked": 0,
-                "message": "No mutants found in project"
-            }
-
-        mutants = [
-            MutantData(
-                id=m["id"],
-                source_file=m["sourcefile"],
-                mutated_class=m["mutatedclass"],
-                mutated_method=m["mutatedmethod"],
-                line_number=m["linenumber"],
-                mutator=m["mutator"],
-                status=m["status"],
-                detected=m["detected"],
-                description=m["description"]
-            )
-            for m in mutants_data
-        ]
+        on_progress is called with (steps done, 3) after loading, ranking and saving.
 
-        try:
-            ranked_ids = algorithm.rank(mutants)
-        except Exception as e:
-            raise AlgorithmError(f"Algorithm execution failed: {str(e)}")
-
-        ranked_ids = self._validate_and_fix_ranking(ranked_ids, mutants)
-
-        rankings = {mutant_id: rank for rank, mutant_id in enumerate(ranked_ids)}
-
-        await self.mutant_repository.bulk_update_rankings(project_id, rankings)
-        await self.project_repository.update_last_algorithm(project_id, algorithm.name)
+        Returns dict with success status, algorithm name, count of ranked mutants,
+        count of mutants whose ranking actually changed and whether the run was incremental.
+        """
+        report = on_progress or (lambda done, total: None)
+        entry = self.registry.get(algorithm_id)
+        if entry is None:
+            raise AlgorithmNotFoundError(f"Algorithm '{algorithm_id}' not found")
+        version = entry.version
+
+        async with self.mutant_repository.db.transaction():
+            # Concurrent runs would mix their keys; the decision below needs the lock too
+            await self.project_repository.lock_ranking(project_id)
+            incremental = False
+            if entry.keyed and not full:
+                current = await self.project_repository.get_ranking_algorithm(project_id)
+                incremental = current is not None and (
+                    current["ranking_algorithm"], current["ranking_algorithm_version"]
+                ) == (entry.id, version)
+
+            mutants_data = await self.mutant_repository.get_all_for_ranking(project_id, without_sort_key=incremental)
+            report(1, 3)
+            if not mutants_data and not incremental:
+                return {
+                    "success": True,
+                    "algorithm_name": entry.name,
+                    "mutants_ranked": 0,
+                    "mutants_changed": 0,
+                    "incremental": False,
+                    "message": "No mutants found in project"
+                }
+
+            batch = MutantBatch.from_columns({
+                field: [m[column] for m in mutants_data]
+                for field, column in MUTANT_COLUMNS.items()
+            })
+            mutant_ids = batch.id.tolist()
+
+            if entry.keyed:
+                sort_keys = await self._run(entry, self.runner.sort_keys, batch) if mutant_ids else []
+                report(2, 3)
+                await self.mutant_repository.bulk_update_sort_keys(project_id, mutant_ids, sort_keys)
+                ranked, changed = await self.mutant_repository.update_rankings_from_sort_keys(project_id)
+            else:
+                ranked_ids = await self._run(entry, self.runner.rank, batch)
+                ranked_ids = self._validate_and_fix_ranking(ranked_ids, mutant_ids)
+                report(2, 3)
+                rankings = {mutant_id: rank for rank, mutant_id in enumerate(ranked_ids)}
+                changed = await self.mutant_repository.bulk_update_rankings(project_id, rankings)
+                ranked = len(rankings)
+            await self.project_repository.update_last_algorithm(project_id, entry.name, entry.id, version)
+        # The adaptive ranking keeps the ranking order within its groups
+        self.ranker.invalidate(project_id)
+        report(3, 3)
 
         return {
             "success": True,
-            "algorithm_name": algorithm.name,
-            "mutants_ranked": len(rankings),
-            "message": f"Successfully applied '{algorithm.name}' to {len(rankings)} mutants"
+            "algorithm_name": entry.name,
+            "mutants_ranked": ranked,
+            "mutants_changed": changed,
+            "incremental": incremental,
+            "message": f"Successfully applied '{entry.name}' to {ranked} mutants ({changed} changed)"
         }
 
+    async def _run(self, entry: AlgorithmEntry, operation, batch: MutantBatch) -> list:
+        """Run one of the runner's operations for the algorithm, mapping its failures to AlgorithmError."""
+        strategy_class = entry.strategy_class
+        try:
+            return await operation(
+                entry.file_path, entry.module_name, strategy_class.__name__, batch,
+                timeout=strategy_class.timeout, memory_limit_mb=strategy_class.memory_limit_mb
+            )
+        except AlgorithmRunnerError as e:
+            raise AlgorithmError(f"Algorithm execution failed: {str(e)}")
+
     def _validate_and_fix_ranking(
         self,
         ranked_ids: List[int],
-        original_mutants: List[MutantData]
+        original_ids: List[int]
     ) -> List[int]:
         """
         Validate and fix the ranking output according to the algorithm contract.
@@ -157,7 +175,7 @@ class AlgorithmService:
         - Adds missing mutants at the end
         - Validates all values are valid integers
         """
-        original_ids = {m.id for m in original_mutants}
+        original_ids = set(original_ids)
         seen = set()
         valid_ranked = []
 
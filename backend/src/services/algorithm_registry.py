@@ -0,0 +1,177 @@
+import hashlib
+import importlib.util
+import inspect
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+# Add parent directory (backend/) to path so we can import algorithms
+BACKEND_DIR = Path(__file__).parent.parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from algorithms.base import RankingStrategy
+
+ALGORITHMS_DIR = BACKEND_DIR / "algorithms"
+
+
+@dataclass
+class AlgorithmEntry:
+    """A discovered ranking algorithm and where it is defined."""
+    id: str
+    strategy_class: Type[RankingStrategy]
+    name: str
+    description: str
+    # Module file and module name, so a worker process can load the class itself
+    file_path: str
+    module_name: str
+    # Whether the class defines a sort key, so stored keys allow incremental re-ranking
+    keyed: bool = False
+    # SHA-256 of the module file
+    digest: str = ""
+
+    @property
+    def version(self) -> str:
+        """The class's declared version and its file's hash; stored sort keys are reused only while it matches."""
+        return f"{self.strategy_class.version}:{self.digest[:16]}"
+
+
+@dataclass
+class _LoadedFile:
+    mtime_ns: int
+    size: int
+    digest: str
+    algorithm_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ReloadResult:
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # File name -> error, for files that could not be loaded
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+def class_to_id(class_name: str) -> str:
+    """Convert class name to algorithm ID (e.g., LexicographicalRank -> lexicographical_rank)."""
+    result = []
+    for i, char in enumerate(class_name):
+        if char.isupper() and i > 0:
+            result.append('_')
+        result.append(char.lower())
+    return ''.join(result)
+
+
+class AlgorithmRegistry:
+    """
+    Process-wide registry of the ranking algorithms in the algorithms directory.
+
+    Modules are discovered and executed once, on the first lookup or at startup,
+    and again only when `reload()` is called. A reload only re-executes files
+    whose contents changed (checked by modification time and size first, then by
+    hash), drops algorithms whose file is gone and picks up new files. Lookups
+    never touch the file system.
+
+    Usage:
+        entry = algorithm_registry.get("lexicographical_rank")
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._entries: Dict[str, AlgorithmEntry] = {}
+        self._files: Dict[Path, _LoadedFile] = {}
+        self._loaded = False
+
+    def get(self, algorithm_id: str) -> Optional[AlgorithmEntry]:
+        self._ensure_loaded()
+        return self._entries.get(algorithm_id)
+
+    def entries(self) -> List[AlgorithmEntry]:
+        """All algorithms, sorted by name."""
+        self._ensure_loaded()
+        return sorted(self._entries.values(), key=lambda entry: entry.name)
+
+    def reload(self) -> ReloadResult:
+        """Rescan the algorithms directory and load new or changed files."""
+        result = ReloadResult()
+        entries = dict(self._entries)
+        files = {}
+
+        for file_path in sorted(self.directory.glob("*.py")):
+            if file_path.name.startswith("_") or file_path.name == "base.py":
+                continue
+            stat = file_path.stat()
+            known = self._files.get(file_path)
+            if known is not None and (known.mtime_ns, known.size) == (stat.st_mtime_ns, stat.st_size):
+                files[file_path] = known
+                continue
+
+            content = file_path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if known is not None and known.digest == digest:
+                files[file_path] = _LoadedFile(stat.st_mtime_ns, stat.st_size, digest, known.algorithm_ids)
+                continue
+
+            try:
+                loaded = self._load_file(file_path, digest)
+            except Exception as e:
+                print(f"Warning: Failed to load algorithm from {file_path}: {e}")
+                result.failed[file_path.name] = str(e)
+                # Keep serving what the file defined before it broke
+                if known is not None:
+                    files[file_path] = known
+                continue
+
+            previous = set(known.algorithm_ids) if known is not None else set()
+            for algorithm_id in previous - loaded.keys():
+                entries.pop(algorithm_id, None)
+                result.removed.append(algorithm_id)
+            for algorithm_id, entry in loaded.items():
+                (result.updated if algorithm_id in previous else result.added).append(algorithm_id)
+                entries[algorithm_id] = entry
+            files[file_path] = _LoadedFile(stat.st_mtime_ns, stat.st_size, digest, list(loaded))
+
+        for file_path, known in self._files.items():
+            if file_path not in files:
+                for algorithm_id in known.algorithm_ids:
+                    entries.pop(algorithm_id, None)
+                    result.removed.append(algorithm_id)
+
+        # Swap in the new state at once, so lookups never see a half-done reload
+        self._entries, self._files = entries, files
+        self._loaded = True
+        return result
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+
+    def _load_file(self, file_path: Path, digest: str) -> Dict[str, AlgorithmEntry]:
+        """Execute one module and return the algorithms it defines."""
+        module_name = f"algorithms.{file_path.stem}"
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load {file_path.name}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        loaded = {}
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if (isinstance(attr, type) and
+                issubclass(attr, RankingStrategy) and
+                not inspect.isabstract(attr) and
+                attr.__module__ == module_name):
+                instance = attr()
+                algorithm_id = class_to_id(attr_name)
+                loaded[algorithm_id] = AlgorithmEntry(
+                    algorithm_id, attr, instance.name, instance.description, str(file_path), module_name,
+                    keyed=attr.sort_key is not RankingStrategy.sort_key, digest=digest
+                )
+        return loaded
+
+
+# Create a singleton instance to be imported by other modules
+algorithm_registry = AlgorithmRegistry(ALGORITHMS_DIR)
@@ -2,6 +2,7 @@ import secrets
 from typing import Optional
 
 from core import security
+from core.session_cache import SessionCache
 from models.auth import UserResponse
 from repositories.user_repository import UserRepository
 from repositories.session_repository import SessionRepository
@@ -14,16 +15,20 @@ class AuthService:
         user_repository: UserRepository,
         session_repository: SessionRepository,
         rating_repository: RatingRepository,
+        session_cache: SessionCache,
     ):
         self.user_repo = user_repository
         self.session_repo = session_repository
         self.rating_repo = rating_repository
+        self.session_cache = session_cache
 
     async def logout(self, token: str) -> None:
         await self.session_repo.delete_by_token(token)
+        self.session_cache.invalidate_token(token)
 
     async def reset(self, user_id: int, password: str) -> None:
-        password_hash = security.hash_password(password)
+        """Raises security.PasswordHasherBusyError when the bcrypt pool is saturated."""
+        password_hash = await security.hash_password_async(password)
         await self.user_repo.update_password(user_id, password_hash)
 
     async def change_username(self, user_id: int, new_username: str) -> None:
@@ -41,17 +46,25 @@ class AuthService:
             raise http_responses.USERNAME_TAKEN
 
         await self.user_repo.update_username(user_id, new_username)
+        self.session_cache.invalidate_user(user_id)
 
     async def get_user_from_token(self, token: str) -> Optional[UserResponse]:
+        generation = self.session_cache.generation
+        user = self.session_cache.get(token)
+        if user is not None:
+            return user
+
         row = await self.session_repo.find_user_by_token(token)
         if row is None:
             return None
-        return UserResponse(
+        user = UserResponse(
             id=row["id"],
             username=row["username"],
             is_admin=row["is_admin"],
             is_active=row["is_active"]
         )
+        self.session_cache.put(token, user.id, user, generation, row["expires_at"])
+        return user
 
     async def get_user_from_username(self, username: str) -> Optional[UserResponse]:
         row = await self.user_repo.find_by_username(username)
@@ -65,25 +78,22 @@ class AuthService:
         )
     
 
-    async def get_all_users(self) -> list[UserResponse]:
-        rows = await self.user_repo.find_all_users()
-        users = []
-        for row in rows:
-            mutants_reviewed = await self.rating_repo.count_total_by_user(row["id"])
-            users.append(UserResponse(
-                id=row["id"],
-                username=row["username"],
-                is_admin=row["is_admin"],
-                is_active=row["is_active"],
-                mutants_reviewed=mutants_reviewed,
-            ))
-        return users
+    async def get_all_users(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> list[UserResponse]:
+        rows = await self.user_repo.find_users_with_review_counts(limit, after, search)
+        return [UserResponse(**row) for row in rows]
 
     async def delete_user(self, user_id: int) -> None:
         await self.user_repo.delete_by_id(user_id)
+        self.session_cache.invalidate_user(user_id)
 
     async def set_user_admin_status(self, user_id: int, is_admin: bool) -> None:
         await self.user_repo.update_admin_status(user_id, is_admin)
+        self.session_cache.invalidate_user(user_id)
 
     async def is_admin(self, token: str) -> bool:
         user = await self.get_user_from_token(token)
@@ -92,16 +102,18 @@ class AuthService:
         return user.is_admin
 
     async def register(self, username: str, password: str) -> None:
-        password_hash = security.hash_password(password)
+        """Raises security.PasswordHasherBusyError when the bcrypt pool is saturated."""
+        password_hash = await security.hash_password_async(password)
         await self.user_repo.create(username, password_hash)
 
     async def authorize(self, username: str, password: str) -> bool:
+        """Raises security.PasswordHasherBusyError when the bcrypt pool is saturated."""
         row = await self.user_repo.find_by_username_with_password(username)
         if row is None:
             return False
         if not row["is_active"]:
             return False
-        return security.verify_password(password, row["password_hash"])
+        return await security.verify_password_async(password, row["password_hash"])
 
     async def login(self, username: str, password: str) -> tuple[bool, str]:
         is_valid = await self.authorize(username, password)
@@ -120,9 +132,14 @@ class AuthService:
     async def disable_user(self, user_id: int) -> None:
         await self.user_repo.update_active_status(user_id, False)
         await self.session_repo.disable_by_user_id(user_id)
+        self.session_cache.invalidate_user(user_id)
 
     async def enable_user(self, user_id: int) -> None:
         await self.user_repo.update_active_status(user_id, True)
+        self.session_cache.invalidate_user(user_id)
+
+    def get_session_cache_stats(self) -> dict:
+        return self.session_cache.stats()
 
     async def get_user_by_id(self, user_id: int) -> Optional[UserResponse]:
         row = await self.user_repo.find_by_id(user_id)
@@ -1,7 +1,15 @@
-from typing import List, Optional
+import asyncio
+import csv
+import io
+from contextlib import aclosing
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Optional, Union
 from datetime import datetime
 from collections import defaultdict
 
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 from repositories.export_repository import ExportRepository
 from repositories.project_repository import ProjectRepository
 from models.export import (
@@ -13,6 +21,70 @@ from models.export import (
 )
 
 
+# Columns of the streamed CSV export, followed by one column per form field
+CSV_COLUMNS = [
+    "mutant_id", "source_file", "mutated_class", "mutated_method", "line_number", "mutator",
+    "status", "description", "ranking", "additional_fields", "reviewer_username"
+]
+
+# Typed columns of the Parquet export, followed by one typed column per form field
+PARQUET_COLUMNS = [
+    ("mutant_id", pa.int32()),
+    ("source_file", pa.string()),
+    ("mutated_class", pa.string()),
+    ("mutated_method", pa.string()),
+    ("line_number", pa.int32()),
+    ("mutator", pa.string()),
+    ("status", pa.string()),
+    ("description", pa.string()),
+    ("ranking", pa.int32()),
+    ("additional_fields", pa.string()),
+    ("reviewer_username", pa.string()),
+]
+
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+# Form field values are stored as text; values that do not parse become null
+PARQUET_FIELD_TYPES = {
+    "rating": (pa.int32(), _to_int),
+    "integer": (pa.int64(), _to_int),
+    "checkbox": (pa.bool_(), {"true": True, "false": False}.get),
+    "text": (pa.string(), str),
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects the output of a ParquetWriter so it can be sent in pieces."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
 class ExportService:
     def __init__(
         self,
@@ -26,32 +98,16 @@ class ExportService:
         return await self.project_repository.does_user_belong_to_project(user_id, project_id)
 
     async def get_export_preview(self, project_id: int, sample_limit: int = 5) -> Optional[ExportPreviewResponse]:
+        """Stats and the first `sample_limit` entries of the export; reads only those ratings."""
         project_info = await self.export_repository.get_project_info(project_id)
         if not project_info:
             return None
 
-        stats_data = await self.export_repository.get_export_stats(project_id)
-        total_mutants = stats_data["total_mutants"]
-
-        stats = ExportPreviewStats(
-            total_mutants=total_mutants,
-            total_ratings=stats_data["total_ratings"],
-            unique_reviewers=stats_data["unique_reviewers"],
-            mutants_with_ratings=stats_data["mutants_with_ratings"],
-            completion_percentage=round(
-                (stats_data["mutants_with_ratings"] / total_mutants * 100) if total_mutants > 0 else 0,
-                2
-            )
-        )
-
-        all_entries = await self._build_rating_entries(project_id)
-        sample_entries = all_entries[:sample_limit]
-
         return ExportPreviewResponse(
             project_id=project_id,
             project_name=project_info["name"],
-            stats=stats,
-            sample_entries=sample_entries
+            stats=await self._build_stats(project_id),
+            sample_entries=await self._build_rating_entries(project_id, limit=sample_limit)
         )
 
     async def get_export_data(self, project_id: int) -> Optional[ExportDataResponse]:
@@ -59,10 +115,20 @@ class ExportService:
         if not project_info:
             return None
 
+        return ExportDataResponse(
+            project_id=project_id,
+            project_name=project_info["name"],
+            exported_at=datetime.utcnow(),
+            stats=await self._build_stats(project_id),
+            ratings=await self._build_rating_entries(project_id)
+        )
+
+    async def _build_stats(self, project_id: int) -> ExportPreviewStats:
+        # Read from the progress counters, so this does not grow with the project
         stats_data = await self.export_repository.get_export_stats(project_id)
         total_mutants = stats_data["total_mutants"]
 
-        stats = ExportPreviewStats(
+        return ExportPreviewStats(
             total_mutants=total_mutants,
             total_ratings=stats_data["total_ratings"],
             unique_reviewers=stats_data["unique_reviewers"],
@@ -73,18 +139,136 @@ class ExportService:
             )
         )
 
-        all_entries = await self._build_rating_entries(project_id)
+    async def stream_export(
+        self, project_id: int, export_format: str, on_rows: Optional[Callable[[int], None]] = None
+    ) -> Optional[AsyncIterator[Union[str, bytes]]]:
+        """
+        Stream every rating of a project as NDJSON (one ExportRatingEntry per line),
+        CSV (one row per rating, one column per form field) or Parquet (like CSV, but
+        with typed columns and written in row groups).
 
-        return ExportDataResponse(
-            project_id=project_id,
-            project_name=project_info["name"],
-            exported_at=datetime.utcnow(),
-            stats=stats,
-            ratings=all_entries
+        Returns None if the project does not exist, otherwise an iterator of chunks
+        that reads the ratings batch by batch while it is consumed. on_rows is called
+        with the number of ratings read so far.
+        """
+        if not await self.export_repository.get_project_info(project_id):
+            return None
+        batches = self._rating_batches(project_id, on_rows)
+        if export_format == "ndjson":
+            return self._stream_ndjson(batches)
+        form_fields = await self.export_repository.get_form_fields(project_id)
+        if export_format == "parquet":
+            return self._stream_parquet(batches, form_fields)
+        return self._stream_csv(batches, form_fields)
+
+    async def export_to_file(
+        self, project_id: int, export_format: str, path: Path,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Optional[dict]:
+        """
+        Write a streamed export to a file, e.g. in a background job.
+
+        on_progress is called with (ratings written, total ratings).
+        Returns the number of rows and bytes written, None if the project does not exist.
+        """
+        total = (await self.export_repository.get_export_stats(project_id))["total_ratings"]
+        rows = 0
+
+        def on_rows(count: int) -> None:
+            nonlocal rows
+            rows = count
+            if on_progress:
+                on_progress(count, total)
+
+        chunks = await self.stream_export(project_id, export_format, on_rows)
+        if chunks is None:
+            return None
+        with open(path, "wb") as output:
+            async for chunk in chunks:
+                output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        return {"rows": rows, "bytes": path.stat().st_size}
+
+    async def _rating_batches(
+        self, project_id: int, on_rows: Optional[Callable[[int], None]]
+    ) -> AsyncIterator[List[dict]]:
+        rows = 0
+        async with aclosing(self.export_repository.stream_ratings(project_id)) as batches:
+            async for batch in batches:
+                yield batch
+                rows += len(batch)
+                if on_rows:
+                    on_rows(rows)
+
+    async def _stream_ndjson(self, batches: AsyncIterator[List[dict]]) -> AsyncIterator[str]:
+        async with aclosing(batches):
+            async for batch in batches:
+                yield "".join(ExportRatingEntry(**row).model_dump_json() + "\n" for row in batch)
+
+    async def _stream_csv(self, batches: AsyncIterator[List[dict]], form_fields: List[dict]) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS + [field["label"] for field in form_fields])
+        yield buffer.getvalue()
+
+        async with aclosing(batches):
+            async for batch in batches:
+                buffer.seek(0)
+                buffer.truncate()
+                for row in batch:
+                    values = {value["form_field_id"]: value["value"] for value in row["field_values"]}
+                    writer.writerow(
+                        [row[column] for column in CSV_COLUMNS]
+                        + [values.get(field["id"], "") for field in form_fields]
+                    )
+                yield buffer.getvalue()
+
+    async def _stream_parquet(
+        self, batches: AsyncIterator[List[dict]], form_fields: List[dict]
+    ) -> AsyncIterator[bytes]:
+        names = {name for name, _ in PARQUET_COLUMNS}
+        field_columns = []
+        for field in form_fields:
+            # Column names must be unique for pandas and DuckDB
+            name = field["label"] if field["label"] not in names else f"{field['label']}_{field['id']}"
+            names.add(name)
+            field_type, convert = PARQUET_FIELD_TYPES[field["type"]]
+            field_columns.append((field["id"], name, field_type, convert))
+        schema = pa.schema(
+            PARQUET_COLUMNS + [(name, field_type) for _, name, field_type, _ in field_columns]
         )
 
-    async def _build_rating_entries(self, project_id: int) -> List[ExportRatingEntry]:
-        ratings_data = await self.export_repository.get_all_ratings_with_details(project_id)
+        def to_table(rows: List[dict]) -> pa.Table:
+            columns = {name: [row[name] for row in rows] for name, _ in PARQUET_COLUMNS}
+            values = [{v["form_field_id"]: v["value"] for v in row["field_values"]} for row in rows]
+            for field_id, name, _, convert in field_columns:
+                columns[name] = [
+                    convert(row_values[field_id]) if field_id in row_values else None
+                    for row_values in values
+                ]
+            return pa.Table.from_pydict(columns, schema=schema)
+
+        def write_row_group(rows: List[dict]) -> None:
+            writer.write_table(to_table(rows))
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        rows = []
+        async with aclosing(batches):
+            async for batch in batches:
+                rows.extend(batch)
+                if len(rows) >= PARQUET_ROW_GROUP_SIZE:
+                    while len(rows) >= PARQUET_ROW_GROUP_SIZE:
+                        # Building and compressing a row group is CPU-bound; keep it off the event loop
+                        await asyncio.to_thread(write_row_group, rows[:PARQUET_ROW_GROUP_SIZE])
+                        rows = rows[PARQUET_ROW_GROUP_SIZE:]
+                    yield sink.drain()
+        if rows:
+            await asyncio.to_thread(write_row_group, rows)
+        await asyncio.to_thread(writer.close)
+        yield sink.drain()
+
+    async def _build_rating_entries(self, project_id: int, limit: Optional[int] = None) -> List[ExportRatingEntry]:
+        ratings_data = await self.export_repository.get_all_ratings_with_details(project_id, limit)
 
         if not ratings_data:
             return []
@@ -4,6 +4,7 @@ from repositories.form_field_repository import FormFieldRepository
 from repositories.form_field_value_repository import FormFieldValueRepository
 from repositories.rating_repository import RatingRepository
 from repositories.project_repository import ProjectRepository
+from services.adaptive_ranking import AdaptiveRanker, adaptive_ranker
 from models.form_field import (
     FormFieldCreate,
     FormFieldUpdate,
@@ -21,11 +22,13 @@ class FormFieldService:
         form_field_value_repository: FormFieldValueRepository,
         rating_repository: RatingRepository,
         project_repository: ProjectRepository,
+        ranker: AdaptiveRanker = adaptive_ranker,
     ):
         self.form_field_repo = form_field_repository
         self.form_field_value_repo = form_field_value_repository
         self.rating_repo = rating_repository
         self.project_repo = project_repository
+        self.ranker = ranker
 
     async def get_form_fields(self, project_id: int) -> List[FormFieldResponse]:
         fields = await self.form_field_repo.find_by_project_id(project_id)
@@ -76,6 +79,9 @@ class FormFieldService:
             for fv in data.field_values
         ]
         field_values = await self.form_field_value_repo.upsert_many(rating_id, field_values_data)
+        self.ranker.record_rating(
+            mutant_id, user_id, [(fv["form_field_id"], fv["value"]) for fv in field_values]
+        )
 
         return RatingWithValuesResponse(
             id=rating_id,
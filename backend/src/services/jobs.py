@@ -0,0 +1,250 @@
+import asyncio
+import os
+import shutil
+import socket
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from core.config import config
+from core.database import db
+from core.storage import storage
+from repositories.job_repository import JobRepository
+
+# Job types and the operations they run
+PROJECT_IMPORT = "project_import"
+SOURCE_UPLOAD = "source_upload"
+RANKING = "ranking"
+EXPORT = "export"
+
+
+class JobNotFoundError(Exception):
+    """Raised when a job does not exist"""
+    pass
+
+
+def parse_concurrency(spec: str) -> Dict[str, int]:
+    """Parse per job type limits written as "type=limit,type=limit"."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        job_type, _, limit = item.partition("=")
+        limits[job_type.strip()] = max(1, int(limit))
+    return limits
+
+
+class JobContext:
+    """Handed to a running job: its parameters, a working directory and progress reporting."""
+
+    def __init__(self, job_id: int, params: dict):
+        self.job_id = job_id
+        self.params = params
+        self.workdir: Path = storage.get_job_path(job_id)
+        self.current = 0
+        self.total: Optional[int] = None
+        # Set by jobs whose result is a file in workdir; otherwise workdir is removed when they end
+        self.keep_workdir = False
+
+    def progress(self, current: int, total: Optional[int] = None) -> None:
+        """Record progress; it is written to the database with the next heartbeat."""
+        self.current = current
+        if total is not None:
+            self.total = total
+
+
+# A job: runs with its context and returns the job's result
+JobHandler = Callable[[JobContext], Awaitable[Optional[dict]]]
+
+
+@dataclass
+class _Job:
+    job_type: str
+    handler: JobHandler
+    context: JobContext
+    task: Optional[asyncio.Task] = None
+
+
+class JobQueue:
+    """
+    In-process queue for long-running admin operations, with persistent job records.
+
+    Jobs run as tasks of the process that accepted them, at most `limit(type)` at
+    a time per job type; the others wait in FIFO order. The jobs table is how
+    clients, and other worker processes, follow them: `maintain()` regularly writes
+    the progress of running jobs, refreshes their heartbeat, picks up cancellations
+    requested through other processes and fails the jobs of processes that died.
+    Jobs do not survive a restart of the process running them.
+
+    Usage:
+        job = await job_queue.submit(RANKING, handler, params={...}, created_by=user.id)
+    """
+
+    def __init__(self, repository: JobRepository, concurrency: Dict[str, int]):
+        self.repository = repository
+        self.concurrency = concurrency
+        # Identifies this process in the jobs table
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._jobs: Dict[int, _Job] = {}
+        self._pending: Dict[str, Deque[_Job]] = {}
+        self._running: Dict[str, int] = {}
+        self._shutting_down = False
+
+    def limit(self, job_type: str) -> int:
+        return self.concurrency.get(job_type, 1)
+
+    async def submit(
+        self,
+        job_type: str,
+        handler: JobHandler,
+        params: Optional[dict] = None,
+        project_id: Optional[int] = None,
+        created_by: Optional[int] = None,
+        stage: Optional[Callable[[Path], Awaitable[None]]] = None
+    ) -> dict:
+        """
+        Record a job and queue it. Returns the job record.
+
+        `stage` is awaited with the job's working directory before the job is queued,
+        e.g. to copy an upload there before the request ends; if it raises, the job is
+        recorded as failed and the exception propagates.
+        """
+        record = await self.repository.create(job_type, self.owner, params or {}, project_id, created_by)
+        context = JobContext(record["id"], record["params"])
+        if stage is not None:
+            context.workdir.mkdir(parents=True, exist_ok=True)
+            try:
+                await stage(context.workdir)
+            except BaseException as e:
+                await self.repository.finish(record["id"], "failed", error=str(e) or type(e).__name__)
+                _remove_workdir(context.workdir)
+                raise
+
+        job = _Job(job_type, handler, context)
+        self._jobs[context.job_id] = job
+        self._pending.setdefault(job_type, deque()).append(job)
+        self._start_next(job_type)
+        return record
+
+    async def get(self, job_id: int) -> dict:
+        """Job record, with the latest progress if the job runs in this process."""
+        record = await self.repository.find_by_id(job_id)
+        if record is None:
+            raise JobNotFoundError(f"Job {job_id} not found")
+        job = self._jobs.get(job_id)
+        if job is not None and record["status"] == "running":
+            record["progress_current"] = job.context.current
+            record["progress_total"] = job.context.total
+        return record
+
+    async def list_jobs(self, limit: int, status: Optional[str] = None, job_type: Optional[str] = None) -> List[dict]:
+        return await self.repository.find_all(limit, status, job_type)
+
+    def result_path(self, record: dict) -> Optional[Path]:
+        """File produced by a succeeded job (its result names it under "file"), None if there is none."""
+        if record["status"] != "succeeded" or not (record["result"] or {}).get("file"):
+            return None
+        path = storage.get_job_path(record["id"]) / Path(record["result"]["file"]).name
+        return path if path.is_file() else None
+
+    async def cancel(self, job_id: int) -> dict:
+        """
+        Cancel a queued or running job. A job of another process stops at its next heartbeat.
+        Finished jobs are left as they are. Returns the job record.
+        """
+        if await self.repository.request_cancel(job_id) is None:
+            raise JobNotFoundError(f"Job {job_id} not found")
+        await self._cancel_local(job_id)
+        return await self.get(job_id)
+
+    async def maintain(self) -> None:
+        """Write progress and heartbeats, apply remote cancellations, fail dead jobs and purge old ones."""
+        progress = [
+            (job_id, job.context.current, job.context.total)
+            for job_id, job in self._jobs.items() if job.task is not None
+        ]
+        for job_id in await self.repository.heartbeat(self.owner, progress):
+            await self._cancel_local(job_id)
+
+        await self.repository.fail_stale(config.JOB_STALE_AFTER)
+        for job_id in await self.repository.delete_finished_before(config.JOB_RETENTION):
+            _remove_workdir(storage.get_job_path(job_id))
+
+    async def shutdown(self) -> None:
+        """Stop all jobs of this process; they are recorded as failed."""
+        self._shutting_down = True
+        for queue in self._pending.values():
+            while queue:
+                job = queue.popleft()
+                self._jobs.pop(job.context.job_id, None)
+                await self._finish(job, "failed", error="Interrupted: the server shut down")
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_next(self, job_type: str) -> None:
+        queue = self._pending.get(job_type)
+        while queue and self._running.get(job_type, 0) < self.limit(job_type):
+            job = queue.popleft()
+            self._running[job_type] = self._running.get(job_type, 0) + 1
+            job.task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: _Job) -> None:
+        status, result, error = "succeeded", None, None
+        try:
+            await self.repository.mark_running(job.context.job_id)
+            result = await job.handler(job.context)
+        except asyncio.CancelledError:
+            if self._shutting_down:
+                status, error = "failed", "Interrupted: the server shut down"
+            else:
+                status = "cancelled"
+        except Exception as e:
+            status, error = "failed", str(e) or type(e).__name__
+        finally:
+            self._jobs.pop(job.context.job_id, None)
+            self._running[job.job_type] -= 1
+            if not self._shutting_down:
+                self._start_next(job.job_type)
+        await self._finish(job, status, result, error)
+
+    async def _cancel_local(self, job_id: int) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        if job.task is not None:
+            job.task.cancel()
+            return
+        self._pending[job.job_type].remove(job)
+        self._jobs.pop(job_id, None)
+        await self._finish(job, "cancelled")
+
+    async def _finish(self, job: _Job, status: str, result: Optional[dict] = None,
+                      error: Optional[str] = None) -> None:
+        context = job.context
+        try:
+            await self.repository.finish(
+                context.job_id, status, result, error, context.current, context.total
+            )
+        finally:
+            if status != "succeeded" or not context.keep_workdir:
+                _remove_workdir(context.workdir)
+
+
+def _remove_workdir(path: Path) -> None:
+    shutil.rmtree(path, ignore_errors=True)
+
+
+async def run_job_maintenance(queue: JobQueue, interval_seconds: float) -> None:
+    """Background task: call queue.maintain() every interval_seconds, until cancelled."""
+    while True:
+        try:
+            await queue.maintain()
+        except Exception as e:
+            print(f"Job maintenance failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+# Create a singleton instance to be imported by other modules
+job_queue = JobQueue(JobRepository(db), parse_concurrency(config.JOB_CONCURRENCY))
@@ -1,9 +1,16 @@
-from models.mutant import MutantResponse
+import asyncio
+from typing import Optional
+
+from models.form_field import FormFieldResponse, FormFieldValueResponse, RatingWithValuesResponse
+from models.mutant import MutantResponse, NextMutantsResponse, ReviewMutantResponse
+from models.source_code import SourceClassQuery, SourceCodeResponse
 from repositories.project_repository import ProjectRepository
 from repositories.mutant_repository import MutantRepository
 from repositories.form_field_repository import FormFieldRepository
+from repositories.form_field_value_repository import FormFieldValueRepository
 from repositories.rating_repository import RatingRepository
 from repositories.http_responses import MUTANT_NOT_FOUND
+from services.source_code import SourceCodeService
 
 class MutantService:
     def __init__(
@@ -11,17 +18,96 @@ class MutantService:
         project_repository: ProjectRepository,
         mutant_repository: MutantRepository,
         form_field_repository: FormFieldRepository,
-        rating_repository: RatingRepository
+        rating_repository: RatingRepository,
+        form_field_value_repository: FormFieldValueRepository,
+        source_code_service: SourceCodeService
     ):
         self.project_repo = project_repository
         self.mutant_repo = mutant_repository
         self.form_field_repo = form_field_repository
         self.rating_repo = rating_repository
+        self.form_field_value_repo = form_field_value_repository
+        self.source_code_service = source_code_service
 
     async def get(self, mutant_id):
         mutant = await self.mutant_repo.get_mutant(mutant_id)
         if mutant is None:
             raise MUTANT_NOT_FOUND
+        return self._to_response(mutant)
+
+    async def get_next(
+        self, user_id: int, project_id: int, after: Optional[int] = None, prefetch: int = 0,
+        unrated_only: bool = True
+    ) -> NextMutantsResponse:
+        """
+        The user's next unrated mutant in ranking order, ranking 0 first (after mutant `after` if given) and
+        up to `prefetch` more, each with its class source and the user's rating, plus the
+        project's form fields: everything the review page needs, in one call. Without
+        unrated_only, rated mutants are included too.
+
+        Raises MUTANT_NOT_FOUND if `after` is not a mutant of the project.
+        """
+        position = None
+        if after is not None:
+            mutant = await self.mutant_repo.get_mutant(after)
+            if mutant is None or mutant['project_id'] != project_id:
+                raise MUTANT_NOT_FOUND
+            position = (mutant['ranking'], mutant['id'])
+
+        listed = await self.project_repo.get_mutant_list(
+            user_id, project_id, limit=1 + prefetch, after=position,
+            rated=False if unrated_only else None
+        )
+        mutant_ids = [m['id'] for m in listed]
+        mutants = await self.mutant_repo.get_mutants(mutant_ids) if mutant_ids else []
+        form_fields = await self.form_field_repo.find_by_project_id(project_id)
+        remaining = await self.project_repo.count_mutants(user_id, project_id, rated=False)
+        ratings = await self._get_ratings(user_id, mutant_ids)
+
+        # Neighbouring mutants often share their class; read each class once, concurrently
+        class_names = list(dict.fromkeys(m['mutatedclass'] for m in mutants))
+        sources = dict(zip(class_names, await asyncio.gather(
+            *(self._get_source(project_id, name) for name in class_names)
+        )))
+
+        return NextMutantsResponse(
+            form_fields=[FormFieldResponse(**f) for f in form_fields],
+            mutants=[
+                ReviewMutantResponse(
+                    mutant=self._to_response(m),
+                    source=sources[m['mutatedclass']],
+                    rating=ratings.get(m['id'])
+                )
+                for m in mutants
+            ],
+            remaining=remaining
+        )
+
+    async def _get_ratings(self, user_id: int, mutant_ids: list) -> dict:
+        """mutant id -> the user's rating of it, for those they rated."""
+        ratings = await self.rating_repo.find_by_user_and_mutants(user_id, mutant_ids) if mutant_ids else []
+        if not ratings:
+            return {}
+        values = await self.form_field_value_repo.find_by_rating_ids([r['id'] for r in ratings])
+        return {
+            r['mutant_id']: RatingWithValuesResponse(
+                id=r['id'],
+                mutant_id=r['mutant_id'],
+                user_id=r['user_id'],
+                field_values=[FormFieldValueResponse(**v) for v in values if v['rating_id'] == r['id']]
+            )
+            for r in ratings
+        }
+
+    async def _get_source(self, project_id: int, fully_qualified_name: str) -> SourceCodeResponse:
+        try:
+            SourceClassQuery(fully_qualified_name=fully_qualified_name)
+        except ValueError:
+            return SourceCodeResponse(project_id=project_id, fully_qualified_name=fully_qualified_name, found=False)
+        return await self.source_code_service.get_class_source_code(project_id, fully_qualified_name)
+
+    @staticmethod
+    def _to_response(mutant: dict) -> MutantResponse:
         return MutantResponse(
             id=mutant['id'],
             project_id=mutant['project_id'],
@@ -39,6 +125,3 @@ class MutantService:
             ranking=mutant['ranking'],
             additionalFields=mutant['additionalfields']
         )
-
-
-    
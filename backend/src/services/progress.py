@@ -0,0 +1,37 @@
+import asyncio
+
+from asyncpg.exceptions import LockNotAvailableError
+
+from repositories.progress_repository import ProgressRepository
+
+
+class ProgressService:
+    def __init__(self, progress_repository: ProgressRepository):
+        self.progress_repo = progress_repository
+
+    async def reconcile(self) -> int:
+        """Rebuild the progress counters of every project, one project per transaction.
+
+        Projects that are busy with a long write are skipped until the next run.
+
+        Returns the number of counter rows that had drifted.
+        """
+        corrected = 0
+        for project_id in await self.progress_repo.find_project_ids():
+            try:
+                corrected += await self.progress_repo.rebuild_project(project_id)
+            except LockNotAvailableError:
+                print(f"Progress reconciliation skipped busy project {project_id}.")
+        return corrected
+
+
+async def run_reconciliation(service: ProgressService, interval_seconds: float) -> None:
+    """Background job: reconcile the progress counters every interval_seconds, until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            corrected = await service.reconcile()
+            if corrected:
+                print(f"Progress reconciliation corrected {corrected} counter rows.")
+        except Exception as e:
+            print(f"Progress reconciliation failed: {e}")
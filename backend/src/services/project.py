@@ -1,14 +1,19 @@
-from typing import List
+from pathlib import Path
+from typing import AsyncIterable, Callable, List, Optional, Tuple
 
 from asyncpg.exceptions import UniqueViolationError
 
 from models.project import ProjectListResponse
-from models.mutant import MutantOverviewResponse
+from models.mutant import MutantListFilter, MutantOverviewResponse, MutantPage
 from repositories.project_repository import ProjectRepository
 from repositories.mutant_repository import MutantRepository
 from repositories.form_field_repository import FormFieldRepository
 from repositories.rating_repository import RatingRepository
 from services.source_code import SourceCodeService
+from services import xml_parser
+
+# Range of PostgreSQL INTEGER columns
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
 
 
 class ProjectNameExistsError(Exception):
@@ -16,6 +21,11 @@ class ProjectNameExistsError(Exception):
     pass
 
 
+class InvalidCursorError(Exception):
+    """Raised when a mutant list cursor cannot be decoded"""
+    pass
+
+
 class ProjectService:
     def __init__(
         self,
@@ -34,23 +44,63 @@ class ProjectService:
     async def create(self, project_name: str, mutants: List[list]) -> int:
         """Create a new project with mutants.
 
+        The project, its default form field and all mutants are written in one transaction.
+
         Returns the project id.
         Raises ProjectNameExistsError if a project with that name already exists.
         """
-        try:
-            project_id = await self.project_repo.create(project_name)
+        async def single_batch():
+            yield mutants
+
+        return await self.create_from_batches(project_name, single_batch())
 
-            # Add default rating form field
-            await self.form_field_repo.create(project_id, "Rating", "rating", True)
+    async def create_from_batches(self, project_name: str, batches: AsyncIterable[List[list]]) -> int:
+        """Create a new project from a stream of mutant batches.
 
-            for mutant in mutants:
-                mutant[0] = project_id
+        Each batch is bulk loaded as soon as it arrives, so only one batch is held in memory.
+        Everything runs in one transaction: if the stream fails part way through,
+        no trace of the project is left behind.
 
-            await self.mutant_repo.create_many(mutants)
-            return project_id
+        Returns the project id.
+        Raises ProjectNameExistsError if a project with that name already exists.
+        """
+        try:
+            async with self.project_repo.db.transaction():
+                project_id = await self.project_repo.create(project_name)
+
+                # Add default rating form field
+                await self.form_field_repo.create(project_id, "Rating", "rating", True)
+
+                async for batch in batches:
+                    for mutant in batch:
+                        mutant[0] = project_id
+                    await self.mutant_repo.create_many(batch)
         except UniqueViolationError:
             raise ProjectNameExistsError(f"Project with name '{project_name}' already exists")
 
+        return project_id
+
+    async def create_from_xml_file(
+        self, project_name: str, path: Path, on_progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """Create a project from a mutations report saved to disk, e.g. by a background job.
+
+        on_progress is called with the number of mutants loaded so far.
+        Raises ProjectNameExistsError, or MutationParseError for a malformed report.
+        """
+        async def counted(batches):
+            loaded = 0
+            async for batch in batches:
+                yield batch
+                loaded += len(batch)
+                if on_progress:
+                    on_progress(loaded)
+
+        with open(path, "rb") as source:
+            return await self.create_from_batches(
+                project_name, counted(xml_parser.stream_mutation_batches(source))
+            )
+
     async def delete(self, project_id: int):
         await self.source_code_service.delete_source_folder(project_id)
         await self.project_repo.delete(project_id)
@@ -77,14 +127,12 @@ class ProjectService:
 
     async def get_user_projects(self, user_id: int) -> List[ProjectListResponse]:
         """Get all projects assigned to a user with aggregated metrics."""
-        projects = await self.project_repo.find_by_user_id(user_id)
+        projects = await self.project_repo.find_by_user_id_with_counts(user_id)
 
         result = []
         for project in projects:
-            mutant_count = await self.mutant_repo.count_by_project_id(project['id'])
-            reviewed_count = await self.rating_repo.count_reviewed_by_project_and_user(
-                project['id'], user_id
-            )
+            mutant_count = project['total_mutants']
+            reviewed_count = project['reviewed_mutants']
 
             if mutant_count == 0:
                 status = 'empty'
@@ -114,33 +162,66 @@ class ProjectService:
     async def does_project_exsist(self, project_id):
         return await self.project_repo.does_project_exsist(project_id)
     
-    async def get_mutant_list(self, user_id, project_id):
-        
-        mutants = await self.project_repo.get_mutant_list(user_id, project_id)
-        
-        result = []
-        for mutant in mutants:
-            result.append(MutantOverviewResponse(
-                id=mutant['id'],
-                detected=mutant['detected'],
-                status=mutant['status'],
-                sourceFile=mutant['sourcefile'],
-                lineNumber=mutant['linenumber'],
-                mutator=mutant['mutator'],
-                ranking=mutant['ranking'],
-                rated=mutant['rated']
-            ))
-        return result
-            
-
+    async def get_mutant_list(
+        self,
+        user_id: int,
+        project_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        filters: Optional[MutantListFilter] = None
+    ) -> MutantPage:
+        """List a project's mutants in ranking order, one page at a time.
+
+        Without a limit the whole (filtered) list is returned in one page.
+        Raises InvalidCursorError if the cursor was not returned by a previous call.
+        """
+        filters = filters or MutantListFilter()
+        after = self._decode_cursor(cursor) if cursor is not None else None
+        mutants = await self.project_repo.get_mutant_list(
+            user_id, project_id, limit=limit, after=after, **filters.model_dump()
+        )
+        total = await self.project_repo.count_mutants(user_id, project_id, **filters.model_dump())
+
+        next_cursor = None
+        if limit is not None and len(mutants) == limit:
+            next_cursor = f"{mutants[-1]['ranking']}:{mutants[-1]['id']}"
+
+        return MutantPage(
+            mutants=[
+                MutantOverviewResponse(
+                    id=mutant['id'],
+                    detected=mutant['detected'],
+                    status=mutant['status'],
+                    sourceFile=mutant['sourcefile'],
+                    lineNumber=mutant['linenumber'],
+                    mutator=mutant['mutator'],
+                    ranking=mutant['ranking'],
+                    rated=mutant['rated']
+                )
+                for mutant in mutants
+            ],
+            total=total,
+            next_cursor=next_cursor
+        )
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[int, int]:
+        ranking, _, mutant_id = cursor.partition(":")
+        try:
+            decoded = int(ranking), int(mutant_id)
+        except ValueError:
+            raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+        # Both are INTEGER columns; larger values would fail in the database
+        if not all(INT32_MIN <= value <= INT32_MAX for value in decoded):
+            raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+        return decoded
 
-    
     async def get_all_projects(self) -> List[ProjectListResponse]:
-        projects = await self.project_repo.find_all_projects()
+        projects = await self.project_repo.find_all_projects_with_counts()
 
         result = []
         for project in projects:
-            mutant_count = await self.mutant_repo.count_by_project_id(project['id'])
+            mutant_count = project['total_mutants']
 
             result.append(ProjectListResponse(
                 id=project['id'],
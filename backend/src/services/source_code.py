@@ -1,21 +1,64 @@
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
 from fastapi import UploadFile
+from repositories.mutant_repository import MutantRepository
 from repositories.source_code_repository import SourceCodeRepository
-from models.source_code import SourceCodeResponse
+from models.source_code import SourceCodeResponse, SourceUploadResponse
+
+# Unresolved classes listed in an upload report; the mutant count covers all of them
+UNRESOLVED_CLASSES_SHOWN = 100
+
 
 class SourceCodeService:
-    def __init__(self, repository: SourceCodeRepository):
+    def __init__(self, repository: SourceCodeRepository, mutant_repository: Optional[MutantRepository] = None):
         self.repository = repository
+        self.mutant_repo = mutant_repository
 
-    async def upload_project_source(self, project_id: int, file: UploadFile):
+    async def upload_project_source(self, project_id: int, file: UploadFile) -> SourceUploadResponse:
         if not file.filename or not file.filename.endswith('.zip'):
             raise ValueError("File must be a .zip file")
 
         # file.file is the binary file object
-        await self.repository.save_project_source(project_id, file.file)
+        index = await self.repository.save_project_source(project_id, file.file)
+        return await self._upload_report(project_id, index)
+
+    async def upload_project_source_file(self, project_id: int, path: Path) -> SourceUploadResponse:
+        """Extract a source archive that was saved to disk, e.g. by a background job."""
+        index = await self.repository.save_project_source(project_id, path)
+        return await self._upload_report(project_id, index)
+
+    async def upload_project_source_stream(self, project_id: int, chunks: AsyncIterator[bytes]) -> SourceUploadResponse:
+        """Store a source archive sent as the raw request body, without buffering it in memory."""
+        index = await self.repository.save_project_source_stream(project_id, chunks)
+        return await self._upload_report(project_id, index)
+
+    async def _upload_report(self, project_id: int, index: Dict[str, str]) -> SourceUploadResponse:
+        """Which of the project's mutated classes the uploaded sources do not declare."""
+        unresolved = {}
+        if self.mutant_repo is not None:
+            for row in await self.mutant_repo.count_by_class(project_id):
+                if row['mutatedclass'].split("$", 1)[0] not in index:
+                    unresolved[row['mutatedclass']] = row['mutants']
+        return SourceUploadResponse(
+            detail="Source code uploaded and extracted successfully",
+            indexed_classes=len(index),
+            unresolved_classes=sorted(unresolved)[:UNRESOLVED_CLASSES_SHOWN],
+            unresolved_mutants=sum(unresolved.values())
+        )
 
     async def delete_source_folder(self, project_id: int):
         await self.repository.delete_project_source(project_id)
 
+    async def collect_garbage(self) -> dict:
+        """Reclaim source blobs that no project references any more."""
+        return await self.repository.collect_garbage()
+
+    def get_cache_stats(self) -> dict:
+        if self.repository.cache is None:
+            return {"enabled": False}
+        return self.repository.cache.stats()
+
     async def get_class_source_code(self, project_id: int, fully_qualified_name: str) -> SourceCodeResponse:
         content = await self.repository.get_source_file(project_id, fully_qualified_name)
         
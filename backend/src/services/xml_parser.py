@@ -1,5 +1,60 @@
+import asyncio
 import defusedxml.ElementTree as ET
 import json
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional
+
+# Number of mutant rows handed to the database at once when streaming a report.
+DEFAULT_BATCH_SIZE = 5000
+
+
+class MutationParseError(ValueError):
+    """Raised when a mutations report cannot be parsed."""
+    pass
+
+
+def _mutation_to_row(mutation) -> list:
+    """Convert a single <mutation> element into a mutant row."""
+    detected = mutation.get('detected') == 'true'
+    status = mutation.get('status')
+    numberOfTestsRun = int(mutation.get('numberOfTestsRun', 0))
+
+    sourceFile = mutation.findtext('sourceFile', '')
+    mutatedClass = mutation.findtext('mutatedClass', '')
+    mutatedMethod = mutation.findtext('mutatedMethod', '')
+    methodDescription = mutation.findtext('methodDescription', '')
+    lineNumber = int(mutation.findtext('lineNumber', 0))
+    mutator = mutation.findtext('mutator', '')
+
+    killingTest_elem = mutation.find('killingTest')
+    killingTest = killingTest_elem.text if killingTest_elem is not None and killingTest_elem.text else None
+
+    description = mutation.findtext('description', '')
+
+    additionalFields = {}
+
+    additionalFields_element = mutation.find('additionalFields')
+    if additionalFields_element is not None:
+        for field in additionalFields_element:
+            additionalFields[field.tag] = field.text
+
+    additionalFields_json = json.dumps(additionalFields) if additionalFields else None
+
+    return [
+        0,  # project_id (placeholder)
+        detected,
+        status,
+        numberOfTestsRun,
+        sourceFile,
+        mutatedClass,
+        mutatedMethod,
+        methodDescription,
+        lineNumber,
+        mutator,
+        killingTest,
+        description,
+        additionalFields_json
+    ]
+
 
 def parse_mutations(xml_bytes: bytes):
     """
@@ -7,51 +62,66 @@ def parse_mutations(xml_bytes: bytes):
     This will be run in a thread pool to avoid blocking the main event loop.
     """
     root = ET.fromstring(xml_bytes)
-    mutants_data = []
-    
-    for mutation in root.findall('mutation'):
-        
-        detected = mutation.get('detected') == 'true'
-        status = mutation.get('status')
-        numberOfTestsRun = int(mutation.get('numberOfTestsRun', 0))
-        
-        sourceFile = mutation.findtext('sourceFile', '')
-        mutatedClass = mutation.findtext('mutatedClass', '')
-        mutatedMethod = mutation.findtext('mutatedMethod', '')
-        methodDescription = mutation.findtext('methodDescription', '')
-        lineNumber = int(mutation.findtext('lineNumber', 0))
-        mutator = mutation.findtext('mutator', '')
-        
-        killingTest_elem = mutation.find('killingTest')
-        killingTest = killingTest_elem.text if killingTest_elem is not None and killingTest_elem.text else None
-        
-        description = mutation.findtext('description', '')
-
-        additionalFields = {}
-
-        additionalFields_element = mutation.find('additionalFields')
-        if additionalFields_element is not None:
-            for field in additionalFields_element:
-                additionalFields[field.tag] = field.text
-        
-        additionalFields_json = json.dumps(additionalFields) if additionalFields else None
-        
-        mutant_row = [
-            0,  # project_id (placeholder)
-            detected,
-            status,
-            numberOfTestsRun,
-            sourceFile,
-            mutatedClass,
-            mutatedMethod,
-            methodDescription,
-            lineNumber,
-            mutator,
-            killingTest,
-            description,
-            additionalFields_json
-        ]
-        
-        mutants_data.append(mutant_row)
-    
-    return mutants_data
+    return [_mutation_to_row(mutation) for mutation in root.findall('mutation')]
+
+
+def iter_mutation_batches(source: BinaryIO, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[list]]:
+    """
+    Incrementally parse a mutations report from a binary file object.
+
+    The file is read in chunks and every <mutation> element is cleared from the
+    tree as soon as it has been converted, so peak memory is bounded by
+    batch_size rather than by the size of the report.
+
+    Yields lists of at most batch_size mutant rows.
+    Raises MutationParseError if the report is malformed.
+    """
+    batch = []
+    root = None
+    depth = 0
+
+    try:
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+
+            depth -= 1
+            # Only direct children of the root are mutations, matching root.findall('mutation')
+            if depth != 1 or elem.tag != 'mutation':
+                continue
+
+            batch.append(_mutation_to_row(elem))
+            root.clear()
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    except (ET.ParseError, ValueError) as e:
+        raise MutationParseError(f"Failed to parse XML: {e}")
+
+    if batch:
+        yield batch
+
+
+async def stream_mutation_batches(source: BinaryIO, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[List[list]]:
+    """
+    Async wrapper around iter_mutation_batches.
+    Each batch is parsed in a worker thread to avoid blocking the main event loop.
+    """
+    batches = iter_mutation_batches(source, batch_size)
+    while True:
+        batch = await asyncio.to_thread(next, batches, None)
+        if batch is None:
+            return
+        yield batch
+
+
+async def chain_batches(first_batch: Optional[List[list]], batches: AsyncIterator[List[list]]) -> AsyncIterator[List[list]]:
+    """Re-attach a batch that was already pulled from a stream to the rest of it."""
+    if first_batch:
+        yield first_batch
+    async for batch in batches:
+        yield batch
@@ -13,6 +13,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from main import app
 from core.database import db
+from core.migrations import apply_migrations
+from core.session_cache import session_cache
+from core.source_cache import source_cache
 
 
 # Test credentials - can be overridden via environment variables
@@ -39,5 +42,8 @@ async def client():
 async def setup_database():
     """Setup and teardown database connection for each test."""
     await db.connect()
+    await apply_migrations(db)
+    session_cache.clear()
+    source_cache.clear()
     yield
     await db.disconnect()
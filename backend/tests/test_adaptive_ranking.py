@@ -0,0 +1,165 @@
+"""
+Adaptive ranking (services/adaptive_ranking.py): the per-project model learned from
+ratings, its cache of warm models and GET /api/projects/{id}/mutants/suggested.
+"""
+import uuid
+from io import BytesIO
+
+import pytest
+from httpx import AsyncClient
+
+from services.adaptive_ranking import ProjectModel, adaptive_ranker, rating_score
+from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
+
+RATING_FIELD = 7
+
+
+def _model() -> ProjectModel:
+    # Ids in ranking order: 10, 11 and 13 share their features, 12 and 14 too
+    return ProjectModel({
+        "id": [10, 12, 11, 14, 13],
+        "mutator": ["MATH", "NEGATE", "MATH", "NEGATE", "MATH"],
+        "mutatedclass": ["com.A"] * 5,
+        "mutatedmethod": ["run"] * 5,
+        "status": ["SURVIVED"] * 5,
+    }, {RATING_FIELD})
+
+
+def _ids(suggestions) -> list:
+    return [s.id for s in suggestions]
+
+
+def test_rating_score():
+    assert rating_score(["1", "5"]) == 0.5
+    assert rating_score(["4", "text", "9"]) == 0.75
+    assert rating_score([]) is None
+
+
+class TestProjectModel:
+
+    def test_without_ratings_keeps_ranking_order(self):
+        model = _model()
+        assert _ids(model.next_unrated(user_id=1, count=5)) == [10, 12, 11, 14, 13]
+        assert _ids(model.next_unrated(user_id=1)) == [10]
+
+    def test_ratings_move_similar_mutants_up_for_everyone(self):
+        model = _model()
+        model.next_unrated(user_id=2)
+        model.record(14, user_id=1, score=model.score([(RATING_FIELD, "5")]))
+        model.record(10, user_id=1, score=model.score([(RATING_FIELD, "1")]))
+        assert _ids(model.next_unrated(user_id=2, count=2)) == [10, 12]
+        model.refresh()
+
+        # User 1 rated 14 and 10; the group of 14 comes first for both users
+        assert _ids(model.next_unrated(user_id=1, count=3)) == [12, 11, 13]
+        assert _ids(model.next_unrated(user_id=2, count=5)) == [12, 14, 10, 11, 13]
+        suggestions = model.next_unrated(user_id=2, count=5)
+        assert suggestions[0].predicted_score > suggestions[-1].predicted_score
+
+    def test_rerating_replaces_the_previous_score(self):
+        model = _model()
+        model.record(14, user_id=1, score=1.0)
+        model.record(14, user_id=1, score=0.0)
+        assert model.total_count == 1
+        model.refresh()
+        assert _ids(model.next_unrated(user_id=2)) == [10]
+        # Values of fields that are not star ratings do not count
+        model.record(14, user_id=1, score=model.score([(RATING_FIELD + 1, "5")]))
+        assert model.total_count == 0
+
+    def test_every_mutant_rated(self):
+        model = _model()
+        for mutant_id in (10, 11, 12, 13, 14):
+            assert model.record(mutant_id, user_id=1, score=0.5)
+        assert not model.record(99, user_id=1, score=0.5)
+        assert model.next_unrated(user_id=1, count=3) == []
+
+
+class TestSuggestedMutantsEndpoint:
+
+    XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<mutations>""" + b"".join(
+        f"""
+    <mutation detected='false' status='SURVIVED' numberOfTestsRun='1'>
+        <sourceFile>Foo.java</sourceFile>
+        <mutatedClass>com.example.Foo</mutatedClass>
+        <mutatedMethod>run</mutatedMethod>
+        <methodDescription>()V</methodDescription>
+        <lineNumber>{line}</lineNumber>
+        <mutator>{mutator}</mutator>
+        <killingTest></killingTest>
+        <description>changed</description>
+    </mutation>""".encode() for line, mutator in [(1, "MATH"), (2, "MATH"), (3, "NEGATE_CONDITIONALS")]
+    ) + b"\n</mutations>"
+
+    @pytest.mark.asyncio
+    async def test_suggestions_without_ratings_follow_the_applied_algorithm(self, client: AsyncClient):
+        response = await client.post(
+            "/api/login", json={"username": TEST_ADMIN_USERNAME, "password": TEST_ADMIN_PASSWORD}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        response = await client.post(
+            "/api/admin/projects/",
+            headers=headers,
+            data={"project_name": f"adaptive_{uuid.uuid4().hex[:8]}"},
+            files={"file": ("mutations.xml", BytesIO(self.XML), "application/xml")}
+        )
+        project_id = response.json()["id"]
+
+        try:
+            response = await client.post(
+                f"/api/projects/{project_id}/algorithm",
+                headers=headers,
+                json={"algorithm": "lexicographical_rank"}
+            )
+            assert response.status_code == 200
+            mutants = (await client.get(f"/api/projects/{project_id}/mutants", headers=headers)).json()
+            by_rank = [m["id"] for m in sorted(mutants, key=lambda m: m["ranking"])]
+
+            suggested = (await client.get(
+                f"/api/projects/{project_id}/mutants/suggested", headers=headers, params={"limit": 3}
+            )).json()
+            assert [s["id"] for s in suggested] == by_rank
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_ratings_steer_suggestions(self, client: AsyncClient):
+        response = await client.post(
+            "/api/login", json={"username": TEST_ADMIN_USERNAME, "password": TEST_ADMIN_PASSWORD}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        response = await client.post(
+            "/api/admin/projects/",
+            headers=headers,
+            data={"project_name": f"adaptive_{uuid.uuid4().hex[:8]}"},
+            files={"file": ("mutations.xml", BytesIO(self.XML), "application/xml")}
+        )
+        assert response.status_code == 201, response.text
+        project_id = response.json()["id"]
+
+        try:
+            url = f"/api/projects/{project_id}/mutants/suggested"
+            assert (await client.get(url)).status_code == 401
+            suggested = (await client.get(url, headers=headers, params={"limit": 3})).json()
+            assert len(suggested) == 3
+            loads = adaptive_ranker.loads
+
+            fields = (await client.get(f"/api/projects/{project_id}/form-fields", headers=headers)).json()
+            rating_field = next(f for f in fields if f["type"] == "rating")
+            mutants = (await client.get(f"/api/projects/{project_id}/mutants", headers=headers)).json()
+            negate = next(m["id"] for m in mutants if m["mutator"] == "NEGATE_CONDITIONALS")
+            math = [m["id"] for m in mutants if m["mutator"] == "MATH"]
+            response = await client.post(
+                f"/api/mutants/{math[0]}/ratings",
+                headers=headers,
+                json={"field_values": [{"form_field_id": rating_field["id"], "value": "1"}]}
+            )
+            assert response.status_code == 201
+
+            # The warm model learned the rating without being rebuilt
+            suggested = (await client.get(url, headers=headers, params={"limit": 3})).json()
+            assert [s["id"] for s in suggested] == [negate, math[1]]
+            assert adaptive_ranker.loads == loads
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
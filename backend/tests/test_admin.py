@@ -5,9 +5,12 @@ from httpx import AsyncClient
 from io import BytesIO
 
 from main import app
+from core.database import db
+from repositories.rating_repository import RatingRepository
 from dependencies import get_current_admin, get_auth_service, get_project_service, get_form_field_service
 from models.auth import UserResponse
 from services.project import ProjectNameExistsError
+from services import xml_parser
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
 
@@ -107,6 +110,27 @@ class TestAdmin:
         )
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_get_all_users_passes_page_and_search(self, client: AsyncClient, override_dependencies):
+        mock_auth, _, _ = override_dependencies
+        mock_auth.get_all_users.return_value = [FAKE_USER]
+        response = await client.get(
+            "/api/admin/users",
+            headers={"Authorization": "Bearer faketoken"},
+            params={"limit": 20, "after": "alice", "search": "b"}
+        )
+        assert response.status_code == 200
+        mock_auth.get_all_users.assert_called_once_with(limit=20, after="alice", search="b")
+
+    @pytest.mark.asyncio
+    async def test_get_all_users_rejects_invalid_limit(self, client: AsyncClient, override_dependencies):
+        response = await client.get(
+            "/api/admin/users",
+            headers={"Authorization": "Bearer faketoken"},
+            params={"limit": 0}
+        )
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_delete_user_success(self, client: AsyncClient, override_dependencies):
         mock_auth, _, _ = override_dependencies
@@ -250,7 +274,7 @@ class TestAdmin:
     @pytest.mark.asyncio
     async def test_create_project_success(self, client: AsyncClient, override_dependencies):
         _, mock_project, _ = override_dependencies
-        mock_project.create.return_value = 42
+        mock_project.create_from_batches.return_value = 42
         response = await client.post(
             "/api/admin/projects/",
             headers={"Authorization": "Bearer faketoken"},
@@ -263,7 +287,7 @@ class TestAdmin:
     @pytest.mark.asyncio
     async def test_create_project_duplicate_name(self, client: AsyncClient, override_dependencies):
         _, mock_project, _ = override_dependencies
-        mock_project.create.side_effect = ProjectNameExistsError("already exists")
+        mock_project.create_from_batches.side_effect = ProjectNameExistsError("already exists")
         response = await client.post(
             "/api/admin/projects/",
             headers={"Authorization": "Bearer faketoken"},
@@ -646,3 +670,121 @@ class TestAdminIntegration:
 
         await self._delete_user(client, token, user_id)
         await self._delete_project(client, token, project_id)
+
+    @staticmethod
+    def _many_mutations_xml(count: int, tail: str = "</mutations>") -> bytes:
+        mutation = """
+    <mutation detected='true' status='KILLED' numberOfTestsRun='1'>
+        <sourceFile>Batch.java</sourceFile>
+        <mutatedClass>com.Batch</mutatedClass>
+        <mutatedMethod>go</mutatedMethod>
+        <methodDescription>()V</methodDescription>
+        <lineNumber>{line}</lineNumber>
+        <mutator>MATH</mutator>
+        <killingTest>com.BatchTest.test</killingTest>
+        <description>batch mutation</description>
+    </mutation>"""
+        body = "".join(mutation.format(line=i) for i in range(count))
+        return f"<mutations>{body}{tail}".encode()
+
+    @pytest.mark.asyncio
+    async def test_create_project_spanning_multiple_batches(self, client: AsyncClient):
+        """Reports larger than one parser batch are fully ingested."""
+        token = await self._get_admin_token(client)
+        name = f"batched_{uuid.uuid4().hex[:8]}"
+        count = xml_parser.DEFAULT_BATCH_SIZE + 3
+        response = await client.post(
+            "/api/admin/projects/",
+            headers={"Authorization": f"Bearer {token}"},
+            data={"project_name": name},
+            files={"file": ("mutations.xml", BytesIO(self._many_mutations_xml(count)), "application/xml")}
+        )
+        assert response.status_code == 201
+        project_id = response.json()["id"]
+
+        projects = (await client.get(
+            "/api/admin/projects",
+            headers={"Authorization": f"Bearer {token}"}
+        )).json()
+        project = next(p for p in projects if p["id"] == project_id)
+        assert project["total_mutants"] == count
+
+        await self._delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_create_project_malformed_tail_is_rolled_back(self, client: AsyncClient):
+        """A parse error after the first batch was stored removes the partial project."""
+        token = await self._get_admin_token(client)
+        name = f"broken_tail_{uuid.uuid4().hex[:8]}"
+        xml = self._many_mutations_xml(xml_parser.DEFAULT_BATCH_SIZE + 3, tail="<broken")
+        response = await client.post(
+            "/api/admin/projects/",
+            headers={"Authorization": f"Bearer {token}"},
+            data={"project_name": name},
+            files={"file": ("mutations.xml", BytesIO(xml), "application/xml")}
+        )
+        assert response.status_code == 400
+
+        projects = (await client.get(
+            "/api/admin/projects",
+            headers={"Authorization": f"Bearer {token}"}
+        )).json()
+        assert name not in [p["name"] for p in projects]
+
+    @pytest.mark.asyncio
+    async def test_get_users_keyset_pages_and_prefix_search(self, client: AsyncClient):
+        """Pages chained through `after` cover all matching users exactly once."""
+        token = await self._get_admin_token(client)
+        prefix = f"page_{uuid.uuid4().hex[:6]}_"
+        usernames = [f"{prefix}{i}" for i in range(5)]
+        for username in usernames:
+            await self._create_test_user(client, token, username)
+        # Underscores in the prefix must match literally, not as LIKE wildcards
+        await self._create_test_user(client, token, prefix.replace("_", "x") + "0")
+
+        seen = []
+        after = None
+        while True:
+            params = {"limit": 2, "search": prefix}
+            if after is not None:
+                params["after"] = after
+            response = await client.get(
+                "/api/admin/users", headers={"Authorization": f"Bearer {token}"}, params=params
+            )
+            assert response.status_code == 200
+            page = response.json()
+            if not page:
+                break
+            assert len(page) <= 2
+            assert all(u["mutants_reviewed"] == 0 for u in page)
+            seen.extend(u["username"] for u in page)
+            after = page[-1]["username"]
+
+        assert seen == sorted(usernames)
+
+        everyone = (await client.get("/api/admin/users", headers={"Authorization": f"Bearer {token}"})).json()
+        for u in everyone:
+            if u["username"].startswith(prefix) or u["username"] == prefix.replace("_", "x") + "0":
+                await self._delete_user(client, token, u["id"])
+
+    @pytest.mark.asyncio
+    async def test_get_users_reports_review_counts(self, client: AsyncClient):
+        token = await self._get_admin_token(client)
+        project_id = await self._create_test_project(client, token, "review_counts")
+        mutant_id = (await client.get(
+            f"/api/projects/{project_id}/mutants", headers={"Authorization": f"Bearer {token}"}
+        )).json()[0]["id"]
+        admin = (await client.get(
+            "/api/admin/users", headers={"Authorization": f"Bearer {token}"},
+            params={"search": TEST_ADMIN_USERNAME}
+        )).json()[0]
+        before = admin["mutants_reviewed"]
+
+        await RatingRepository(db).upsert(mutant_id, admin["id"])
+        admin = (await client.get(
+            "/api/admin/users", headers={"Authorization": f"Bearer {token}"},
+            params={"search": TEST_ADMIN_USERNAME}
+        )).json()[0]
+        assert admin["mutants_reviewed"] == before + 1
+
+        await self._delete_project(client, token, project_id)
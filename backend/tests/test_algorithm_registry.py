@@ -0,0 +1,97 @@
+"""
+AlgorithmRegistry (services/algorithm_registry.py): discovery of ranking algorithm
+files, and reloads that only re-execute new or changed files.
+"""
+import os
+import textwrap
+
+import pytest
+
+from services.algorithm_registry import AlgorithmRegistry, class_to_id
+
+TEMPLATE = textwrap.dedent('''
+    from algorithms.base import RankingStrategy
+
+
+    class {class_name}(RankingStrategy):
+        name = "{name}"
+        description = "test"
+
+        def rank(self, mutants):
+            return [m.id for m in mutants]
+''')
+
+
+def _write(directory, file_name, class_name, name):
+    path = directory / file_name
+    path.write_text(TEMPLATE.format(class_name=class_name, name=name))
+    return path
+
+
+@pytest.fixture
+def registry(tmp_path):
+    _write(tmp_path, "first.py", "FirstRank", "First")
+    (tmp_path / "_helpers.py").write_text("raise RuntimeError('not a plugin')")
+    return AlgorithmRegistry(tmp_path)
+
+
+def test_class_to_id():
+    assert class_to_id("LexicographicalRank") == "lexicographical_rank"
+
+
+def test_loads_once_on_first_lookup(registry):
+    entry = registry.get("first_rank")
+    assert entry.name == "First"
+    assert entry.module_name == "algorithms.first"
+    assert [e.id for e in registry.entries()] == ["first_rank"]
+    # Lookups reuse the loaded class instead of executing the module again
+    assert registry.get("first_rank").strategy_class is entry.strategy_class
+
+
+def test_reload_without_changes_loads_nothing(registry):
+    strategy_class = registry.get("first_rank").strategy_class
+    path = registry.directory / "first.py"
+    # Same content under a new modification time is recognised by its hash
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+
+    result = registry.reload()
+    assert (result.added, result.updated, result.removed, result.failed) == ([], [], [], {})
+    assert registry.get("first_rank").strategy_class is strategy_class
+
+
+def test_reload_picks_up_added_changed_and_removed_files(registry):
+    registry.get("first_rank")
+    _write(registry.directory, "first.py", "FirstRank", "First, improved")
+    _write(registry.directory, "second.py", "SecondRank", "Second")
+
+    result = registry.reload()
+    assert result.added == ["second_rank"]
+    assert result.updated == ["first_rank"]
+    assert registry.get("first_rank").name == "First, improved"
+
+    (registry.directory / "second.py").unlink()
+    _write(registry.directory, "first.py", "RenamedRank", "Renamed")
+    result = registry.reload()
+    assert sorted(result.removed) == ["first_rank", "second_rank"]
+    assert result.added == ["renamed_rank"]
+    assert [e.id for e in registry.entries()] == ["renamed_rank"]
+
+
+def test_version_changes_with_the_file(registry):
+    version = registry.get("first_rank").version
+    assert version.startswith("1:")
+
+    path = registry.directory / "first.py"
+    path.write_text(path.read_text() + "\n# tuned\n")
+    registry.reload()
+    assert registry.get("first_rank").version.startswith("1:")
+    assert registry.get("first_rank").version != version
+
+
+def test_broken_file_keeps_previous_version(registry):
+    registry.get("first_rank")
+    (registry.directory / "first.py").write_text("this is not python")
+
+    result = registry.reload()
+    assert "first.py" in result.failed
+    assert registry.get("first_rank").name == "First"
@@ -0,0 +1,167 @@
+"""
+AlgorithmRunner (core/algorithm_runner.py): ranking strategies in worker processes,
+with timeouts, memory ceilings and crashing workers reported as errors.
+"""
+import asyncio
+import textwrap
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from algorithms.base import MutantBatch
+from core.algorithm_runner import AlgorithmRunner, AlgorithmRunnerError
+from services.algorithm import AlgorithmService, AlgorithmError
+from services.algorithm_registry import AlgorithmRegistry
+
+STRATEGIES = textwrap.dedent('''
+    import os
+    import time
+    from algorithms.base import RankingStrategy
+
+
+    class _Base(RankingStrategy):
+        name = "test"
+        description = "test"
+
+
+    class Reverse(_Base):
+        def rank(self, mutants):
+            return [m.id for m in sorted(mutants, key=lambda m: (m.source_file, m.line_number), reverse=True)]
+
+
+    class ByLineBatch(_Base):
+        def rank(self, mutants):
+            raise AssertionError("rank_batch is used")
+
+        def rank_batch(self, batch):
+            return batch.line_number.argsort(kind="stable")
+
+
+    class Raising(_Base):
+        def rank(self, mutants):
+            raise ValueError("bad strategy")
+
+
+    class Sleeping(_Base):
+        timeout = 0.5
+
+        def rank(self, mutants):
+            time.sleep(30)
+
+
+    class Crashing(_Base):
+        def rank(self, mutants):
+            os._exit(3)
+
+
+    class Hog(_Base):
+        memory_limit_mb = 512
+
+        def rank(self, mutants):
+            return [len(bytearray(4 * 1024 ** 3))]
+''')
+
+
+def _mutants():
+    return MutantBatch.from_columns({
+        "id": [1, 2, 3],
+        "source_file": ["A.java", "B.java", "A.java"],
+        "mutated_class": ["com.A", "com.B", "com.A"],
+        "mutated_method": ["run", "run", "run"],
+        "line_number": [10, 5, 20],
+        "mutator": ["MATH", "MATH", "MATH"],
+        "status": ["SURVIVED", "KILLED", "SURVIVED"],
+        "detected": [False, True, False],
+        "description": ["d", "d", "d"],
+    })
+
+
+@pytest.fixture
+def strategies(tmp_path):
+    path = tmp_path / "test_strategies.py"
+    path.write_text(STRATEGIES)
+    return str(path)
+
+
+class TestAlgorithmRunner:
+
+    async def _rank(self, runner, strategies, class_name, **kwargs):
+        return await runner.rank(strategies, "algorithms.test_strategies", class_name, _mutants(), **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_ranks_in_worker_process(self, strategies):
+        runner = AlgorithmRunner(workers=1, timeout=30, memory_limit_mb=1024)
+        try:
+            assert await self._rank(runner, strategies, "Reverse") == [2, 3, 1]
+        finally:
+            runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_prefers_rank_batch(self, strategies):
+        runner = AlgorithmRunner(workers=1, timeout=30, memory_limit_mb=1024)
+        try:
+            assert await self._rank(runner, strategies, "ByLineBatch") == [2, 1, 3]
+        finally:
+            runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_ranks_inline_without_workers(self, strategies):
+        runner = AlgorithmRunner(workers=0, timeout=30, memory_limit_mb=1024)
+        assert await self._rank(runner, strategies, "Reverse") == [2, 3, 1]
+        with pytest.raises(AlgorithmRunnerError, match="bad strategy"):
+            await self._rank(runner, strategies, "Raising")
+
+    @pytest.mark.asyncio
+    async def test_failures_are_errors_and_worker_pool_survives(self, strategies):
+        runner = AlgorithmRunner(workers=2, timeout=30, memory_limit_mb=1024)
+        try:
+            with pytest.raises(AlgorithmRunnerError, match="ValueError: bad strategy"):
+                await self._rank(runner, strategies, "Raising")
+            with pytest.raises(AlgorithmRunnerError, match="timed out after 0.5 seconds"):
+                await self._rank(runner, strategies, "Sleeping", timeout=0.5)
+            with pytest.raises(AlgorithmRunnerError, match="crashed"):
+                await self._rank(runner, strategies, "Crashing")
+            with pytest.raises(AlgorithmRunnerError):
+                await self._rank(runner, strategies, "Hog", memory_limit_mb=512)
+            assert (runner.timeouts, runner.crashes) == (1, 1)
+            # Later rankings are unaffected
+            assert await self._rank(runner, strategies, "Reverse") == [2, 3, 1]
+        finally:
+            runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_ranking_frees_its_worker(self, strategies):
+        runner = AlgorithmRunner(workers=1, timeout=30, memory_limit_mb=1024)
+        try:
+            task = asyncio.create_task(self._rank(runner, strategies, "Sleeping", timeout=30))
+            await asyncio.sleep(0.3)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # The only worker thread is released once the killed process is reaped
+            assert await asyncio.wait_for(self._rank(runner, strategies, "Reverse"), 10) == [2, 3, 1]
+        finally:
+            runner.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_service_reports_runner_failure_as_algorithm_error(strategies):
+    mutant_repository = AsyncMock()
+    mutant_repository.get_all_for_ranking.return_value = [
+        {"id": 1, "sourcefile": "A.java", "mutatedclass": "com.A", "mutatedmethod": "run",
+         "linenumber": 1, "mutator": "MATH", "status": "SURVIVED", "detected": False, "description": "d"}
+    ]
+    mutant_repository.db.transaction = nullcontext
+    project_repository = AsyncMock()
+    runner = AlgorithmRunner(workers=1, timeout=30, memory_limit_mb=1024)
+    registry = AlgorithmRegistry(Path(strategies).parent)
+    service = AlgorithmService(mutant_repository, project_repository, runner=runner, registry=registry)
+
+    try:
+        with pytest.raises(AlgorithmError, match="crashed"):
+            await service.apply_algorithm(1, "crashing")
+        mutant_repository.bulk_update_rankings.assert_not_called()
+    finally:
+        runner.shutdown()
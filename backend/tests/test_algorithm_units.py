@@ -1,5 +1,8 @@
+import random
+
+import numpy as np
 import pytest
-from algorithms.base import MutantData
+from algorithms.base import DictionaryColumn, MutantBatch, MutantData, RankingStrategy, encode_sort_keys
 from algorithms.lexicographical_rank import LexicographicalRank
 from algorithms.status_priority_rank import StatusPriorityRank
 
@@ -151,3 +154,73 @@ class TestStatusPriorityRank:
         mutants = [make_mutant(i, "F.java", i, status=statuses[i - 1]) for i in range(1, 6)]
         result = algo.rank(mutants)
         assert sorted(result) == [1, 2, 3, 4, 5]
+
+
+class TestMutantBatch:
+
+    def test_dictionary_column_codes_follow_string_order(self):
+        column = DictionaryColumn.encode(["b.java", "a.java", "b.java", "c.java"])
+        assert column.values == ["a.java", "b.java", "c.java"]
+        assert column.codes.tolist() == [1, 0, 1, 2]
+        assert column.decode() == ["b.java", "a.java", "b.java", "c.java"]
+
+    def test_round_trip(self):
+        mutants = [
+            make_mutant(1, "B.java", 3, mutator="MATH", status="SURVIVED"),
+            make_mutant(2, "A.java", 7, mutator="VOID", status="KILLED"),
+        ]
+        batch = MutantBatch.from_mutants(mutants)
+        assert len(batch) == 2
+        assert batch.id.tolist() == [1, 2]
+        assert batch.line_number.tolist() == [3, 7]
+        assert batch.mutator.values == ["MATH", "VOID"]
+        assert batch.to_mutants() == mutants
+
+    def test_default_rank_batch_falls_back_to_rank(self):
+        class Reversed(RankingStrategy):
+            name = "Reversed"
+            description = "Reverses the input"
+
+            def rank(self, mutants):
+                return [m.id for m in reversed(mutants)] + [999]
+
+        batch = MutantBatch.from_mutants([make_mutant(i, "F.java", i) for i in (10, 20, 30)])
+        assert Reversed().rank_batch(batch).tolist() == [2, 1, 0]
+
+    def test_encoded_sort_keys_compare_like_the_key_columns(self):
+        files = ["a", "ab", "b", "", "a", "ä"]
+        numbers = np.array([5, -3, 0, 2 ** 40, -(2 ** 40), 1])
+        keys = encode_sort_keys([DictionaryColumn.encode(files), numbers])
+        by_bytes = sorted(range(len(files)), key=lambda i: keys[i])
+        by_values = sorted(range(len(files)), key=lambda i: (files[i], int(numbers[i])))
+        assert by_bytes == by_values
+
+        with pytest.raises(TypeError):
+            encode_sort_keys([np.array([0.5])])
+
+    @pytest.mark.parametrize("algo_class", [LexicographicalRank, StatusPriorityRank])
+    def test_rank_batch_matches_sorting_objects(self, algo_class):
+        """The vectorized ranking orders mutants exactly like sorting the objects would."""
+        rng = random.Random(7)
+        statuses = list(StatusPriorityRank.STATUS_PRIORITY) + ["UNKNOWN_STATUS"]
+        mutants = [
+            make_mutant(
+                i, rng.choice(["A.java", "B.java", "a/C.java", "Z.java"]), rng.randint(1, 20),
+                mutator=rng.choice(["MATH", "VOID", "NEGATE_CONDITIONALS"]), status=rng.choice(statuses)
+            )
+            for i in range(500)
+        ]
+        if algo_class is LexicographicalRank:
+            key = lambda m: (m.source_file, m.line_number, m.mutator)
+        else:
+            key = lambda m: (StatusPriorityRank.STATUS_PRIORITY.get(m.status, 99), m.source_file, m.line_number)
+        expected = [m.id for m in sorted(mutants, key=key)]
+
+        batch = MutantBatch.from_mutants(mutants)
+        order = algo_class().rank_batch(batch)
+        assert isinstance(order, np.ndarray)
+        assert batch.id[order].tolist() == expected
+        assert algo_class().rank(mutants) == expected
+        # Stored keys order the mutants the same way, with ties broken by id
+        keys = encode_sort_keys(algo_class().sort_key(batch))
+        assert [m.id for m in sorted(mutants, key=lambda m: (keys[m.id], m.id))] == expected
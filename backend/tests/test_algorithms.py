@@ -1,7 +1,10 @@
+import asyncio
 import pytest
 import uuid
 from httpx import AsyncClient
 from io import BytesIO
+from core.database import db
+from repositories.project_repository import RANKING_LOCK_CLASS
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
 
@@ -89,6 +92,25 @@ class TestAlgorithms:
             assert "name" in algo
             assert "description" in algo
 
+    @pytest.mark.asyncio
+    async def test_reload_algorithms(self, client: AsyncClient):
+        """Reloading without changed files keeps the same algorithms."""
+        token = await self._get_admin_token(client)
+
+        response = await client.post(
+            "/api/algorithms/reload",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["added"], data["updated"], data["removed"], data["failed"]) == ([], [], [], {})
+        algo_ids = [algo["id"] for algo in data["algorithms"]]
+        assert "lexicographical_rank" in algo_ids
+
+        response = await client.post("/api/algorithms/reload")
+        assert response.status_code == 401
+
     @pytest.mark.asyncio
     async def test_list_algorithms_requires_admin(self, client: AsyncClient):
         """Test that listing algorithms requires admin authentication."""
@@ -140,6 +162,122 @@ class TestAlgorithms:
         assert data["algorithm_name"] == "Status Priority Rank"
         assert data["mutants_ranked"] == 3
 
+    @pytest.mark.asyncio
+    async def test_reapplying_algorithm_changes_no_rows(self, client: AsyncClient):
+        """Only mutants whose ranking differs are rewritten."""
+        token = await self._get_admin_token(client)
+        project_id = await self._create_test_project(client, token, "algo_test_changed")
+
+        first = await client.post(
+            f"/api/projects/{project_id}/algorithm",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"algorithm": "lexicographical_rank"}
+        )
+        assert first.status_code == 200
+        # All mutants start at ranking 0, so the one ranked first keeps its value
+        assert first.json()["mutants_changed"] == 2
+
+        second = await client.post(
+            f"/api/projects/{project_id}/algorithm",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"algorithm": "lexicographical_rank"}
+        )
+        assert second.status_code == 200
+        assert second.json()["mutants_ranked"] == 3
+        assert second.json()["mutants_changed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_incremental_reranking_merges_new_mutants(self, client: AsyncClient):
+        """Keyed algorithms only key new mutants once they produced the project's ordering."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = await self._create_test_project(client, token, "algo_test_incremental")
+
+        async def apply(algorithm: str, **options) -> dict:
+            response = await client.post(
+                f"/api/projects/{project_id}/algorithm",
+                headers=headers,
+                json={"algorithm": algorithm, **options}
+            )
+            assert response.status_code == 200, response.text
+            return response.json()
+
+        async def order() -> list:
+            async with db.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT sourcefile, linenumber FROM mutants WHERE project_id = $1 ORDER BY ranking",
+                    project_id
+                )
+            return [(row["sourcefile"], row["linenumber"]) for row in rows]
+
+        first = await apply("lexicographical_rank")
+        assert first["incremental"] is False
+        async with db.acquire() as conn:
+            recorded = await conn.fetchrow(
+                "SELECT ranking_algorithm, ranking_algorithm_version FROM projects WHERE id = $1", project_id
+            )
+            assert recorded["ranking_algorithm"] == "lexicographical_rank"
+            assert recorded["ranking_algorithm_version"].startswith("1:")
+            # A mutant added after the ranking has no sort key yet
+            await conn.execute(
+                """
+                INSERT INTO mutants (project_id, detected, status, numberOfTestsRun, sourceFile,
+                                     mutatedClass, mutatedMethod, methodDescription, lineNumber,
+                                     mutator, description)
+                VALUES ($1, FALSE, 'SURVIVED', 1, 'AFile.java', 'com.example.AFile', 'cMethod', '()V',
+                        7, 'MATH', 'added later')
+                """,
+                project_id
+            )
+
+        second = await apply("lexicographical_rank")
+        assert second["incremental"] is True
+        assert second["mutants_ranked"] == 4
+        assert await order() == [("AFile.java", 5), ("AFile.java", 7), ("AFile.java", 10), ("ZFile.java", 100)]
+
+        assert (await apply("lexicographical_rank", full=True))["incremental"] is False
+        # Keys of another algorithm are never reused
+        assert (await apply("status_priority_rank"))["incremental"] is False
+        assert await order() == [("AFile.java", 7), ("AFile.java", 10), ("AFile.java", 5), ("ZFile.java", 100)]
+        assert (await apply("lexicographical_rank"))["incremental"] is False
+
+    @pytest.mark.asyncio
+    async def test_ranking_runs_of_a_project_are_serialized(self, client: AsyncClient):
+        """A run waits for the ranking lock before it decides anything or loads mutants."""
+        token = await self._get_admin_token(client)
+        project_id = await self._create_test_project(client, token, "algo_test_serialized")
+
+        async with db.pool.acquire() as conn:
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                # Stands in for another ranking run of the project
+                await conn.execute("SELECT pg_advisory_xact_lock($1, $2)", RANKING_LOCK_CLASS, project_id)
+                run = asyncio.create_task(client.post(
+                    f"/api/projects/{project_id}/algorithm",
+                    headers={"Authorization": f"Bearer {token}"},
+                    json={"algorithm": "lexicographical_rank"}
+                ))
+                for _ in range(250):
+                    waiting = await conn.fetchval(
+                        """
+                        SELECT COUNT(*) FROM pg_locks
+                        WHERE locktype = 'advisory' AND classid = $1 AND objid = $2 AND NOT granted
+                        """,
+                        RANKING_LOCK_CLASS, project_id
+                    )
+                    if waiting or run.done():
+                        break
+                    await asyncio.sleep(0.02)
+                assert waiting == 1
+                assert not run.done()
+            finally:
+                await transaction.rollback()
+
+        response = await run
+        assert response.status_code == 200
+        assert response.json()["mutants_ranked"] == 3
+
     @pytest.mark.asyncio
     async def test_apply_unknown_algorithm(self, client: AsyncClient):
         """Test applying a non-existent algorithm returns 404."""
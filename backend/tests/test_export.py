@@ -1,4 +1,9 @@
+import csv
+import io
+import json
+import pyarrow.parquet as pq
 import pytest
+import threading
 import uuid
 from unittest.mock import AsyncMock
 from datetime import datetime
@@ -13,6 +18,7 @@ from models.export import (
     ExportPreviewStats,
     ExportDataResponse,
 )
+from services import export as export_service
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
 
@@ -140,6 +146,56 @@ class TestExport:
             app.dependency_overrides.clear()
 
 
+    @pytest.mark.asyncio
+    async def test_stream_export_sends_chunks(self, client: AsyncClient):
+        async def chunks():
+            yield '{"mutant_id": 1}\n'
+            yield '{"mutant_id": 2}\n'
+
+        mock_service = AsyncMock()
+        mock_service.does_user_have_access.return_value = True
+        mock_service.stream_export.return_value = chunks()
+
+        app.dependency_overrides[get_current_admin] = lambda: FAKE_ADMIN
+        app.dependency_overrides[get_export_service] = lambda: mock_service
+        try:
+            response = await client.get(
+                "/api/admin/projects/1/export/stream",
+                headers={"Authorization": "Bearer faketoken"},
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert "attachment" in response.headers["content-disposition"]
+            assert response.text == '{"mutant_id": 1}\n{"mutant_id": 2}\n'
+            mock_service.stream_export.assert_called_once_with(1, "ndjson")
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_stream_export_errors(self, client: AsyncClient):
+        mock_service = AsyncMock()
+        mock_service.does_user_have_access.return_value = True
+        mock_service.stream_export.return_value = None
+
+        app.dependency_overrides[get_current_admin] = lambda: FAKE_ADMIN
+        app.dependency_overrides[get_export_service] = lambda: mock_service
+        try:
+            headers = {"Authorization": "Bearer faketoken"}
+            response = await client.get("/api/admin/projects/1/export/stream", headers=headers)
+            assert response.status_code == 404
+
+            response = await client.get(
+                "/api/admin/projects/1/export/stream", headers=headers, params={"format": "xml"}
+            )
+            assert response.status_code == 422
+
+            mock_service.does_user_have_access.return_value = False
+            response = await client.get("/api/admin/projects/1/export/stream", headers=headers)
+            assert response.status_code == 401
+        finally:
+            app.dependency_overrides.clear()
+
+
 class TestExportIntegration:
     """Integration tests for export endpoints using a real database."""
 
@@ -297,3 +353,110 @@ class TestExportIntegration:
             f"/api/admin/projects/{project_id}",
             headers={"Authorization": f"Bearer {token}"}
         )
+
+    @pytest.mark.asyncio
+    async def test_stream_export_ndjson_and_csv(self, client: AsyncClient):
+        """Streamed exports contain the same ratings as the JSON export."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = await self._create_test_project(client, token, "export_stream_int")
+
+        try:
+            form_field = (await client.get(f"/api/projects/{project_id}/form-fields", headers=headers)).json()[0]
+            mutants = (await client.get(f"/api/projects/{project_id}/mutants", headers=headers)).json()
+            for mutant, value in zip(mutants, ["3", "5"]):
+                response = await client.post(
+                    f"/api/mutants/{mutant['id']}/ratings",
+                    headers=headers,
+                    json={"field_values": [{"form_field_id": form_field["id"], "value": value}]}
+                )
+                assert response.status_code == 201
+
+            expected = (await client.get(f"/api/admin/projects/{project_id}/export", headers=headers)).json()
+
+            response = await client.get(f"/api/admin/projects/{project_id}/export/stream", headers=headers)
+            assert response.status_code == 200
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert sorted(lines, key=lambda e: e["mutant_id"]) == sorted(
+                expected["ratings"], key=lambda e: e["mutant_id"]
+            )
+
+            response = await client.get(
+                f"/api/admin/projects/{project_id}/export/stream", headers=headers, params={"format": "csv"}
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/csv")
+            rows = list(csv.DictReader(io.StringIO(response.text)))
+            assert len(rows) == 2
+            assert {row["mutant_id"] for row in rows} == {str(m["id"]) for m in mutants}
+            assert sorted(row[form_field["label"]] for row in rows) == ["3", "5"]
+            assert all(row["reviewer_username"] == TEST_ADMIN_USERNAME for row in rows)
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_stream_export_parquet_has_typed_field_columns(self, client: AsyncClient, monkeypatch):
+        """Parquet exports have one typed column per form field, written in row groups off the event loop."""
+        monkeypatch.setattr(export_service, "PARQUET_ROW_GROUP_SIZE", 1)
+        write_threads = []
+        write_table = pq.ParquetWriter.write_table
+
+        def recording_write_table(writer, table, *args, **kwargs):
+            write_threads.append(threading.current_thread())
+            return write_table(writer, table, *args, **kwargs)
+
+        monkeypatch.setattr(pq.ParquetWriter, "write_table", recording_write_table)
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = await self._create_test_project(client, token, "export_parquet_int")
+
+        try:
+            rating_field = (await client.get(f"/api/projects/{project_id}/form-fields", headers=headers)).json()[0]
+            extra_fields = []
+            for label, field_type in [("Equivalent", "checkbox"), ("Notes", "text"), ("Effort", "integer")]:
+                response = await client.post(
+                    f"/api/admin/projects/{project_id}/form-fields",
+                    headers=headers,
+                    json={"label": label, "type": field_type}
+                )
+                extra_fields.append(response.json())
+
+            mutants = (await client.get(f"/api/projects/{project_id}/mutants", headers=headers)).json()
+            for mutant, values in zip(mutants, [["4", "true", "looks fine", "12"], ["2", "false", "", "x"]]):
+                await client.post(
+                    f"/api/mutants/{mutant['id']}/ratings",
+                    headers=headers,
+                    json={"field_values": [
+                        {"form_field_id": field["id"], "value": value}
+                        for field, value in zip([rating_field] + extra_fields, values)
+                    ]}
+                )
+
+            response = await client.get(
+                f"/api/admin/projects/{project_id}/export/stream", headers=headers, params={"format": "parquet"}
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+            parquet = pq.ParquetFile(io.BytesIO(response.content))
+            assert parquet.metadata.num_row_groups == 2
+            assert len(write_threads) == 2
+            assert threading.current_thread() not in write_threads
+            table = parquet.read()
+            assert str(table.schema.field(rating_field["label"]).type) == "int32"
+            assert str(table.schema.field("Equivalent").type) == "bool"
+            assert str(table.schema.field("Notes").type) == "string"
+            assert str(table.schema.field("Effort").type) == "int64"
+
+            rows = sorted(table.to_pylist(), key=lambda row: row["mutant_id"])
+            by_mutant = {row["mutant_id"]: row for row in rows}
+            first, second = by_mutant[mutants[0]["id"]], by_mutant[mutants[1]["id"]]
+            assert (first[rating_field["label"]], first["Equivalent"], first["Notes"], first["Effort"]) == (
+                4, True, "looks fine", 12
+            )
+            # Unparseable values become null
+            assert second["Equivalent"] is False
+            assert second["Effort"] is None
+            assert second["reviewer_username"] == TEST_ADMIN_USERNAME
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
@@ -0,0 +1,330 @@
+"""
+Background jobs: the in-process queue (services/jobs.py), its persistent records
+(repositories/job_repository.py), the /api/admin/jobs endpoints and the background
+mode of project import, source upload, ranking and export.
+"""
+import asyncio
+import io
+import json
+import shutil
+import uuid
+import zipfile
+from io import BytesIO
+
+import pytest
+from httpx import AsyncClient
+
+from core.database import db
+from core.storage import storage
+from repositories.job_repository import JobRepository
+from services.jobs import JobQueue, parse_concurrency
+from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
+
+FINISHED = {"succeeded", "failed", "cancelled"}
+
+MUTATIONS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<mutations>
+    <mutation detected='true' status='KILLED' numberOfTestsRun='3'>
+        <sourceFile>Bar.java</sourceFile>
+        <mutatedClass>com.example.Bar</mutatedClass>
+        <mutatedMethod>compute</mutatedMethod>
+        <methodDescription>()I</methodDescription>
+        <lineNumber>42</lineNumber>
+        <mutator>MATH</mutator>
+        <killingTest>com.example.BarTest.test1</killingTest>
+        <description>replaced + with -</description>
+    </mutation>
+    <mutation detected='false' status='SURVIVED' numberOfTestsRun='1'>
+        <sourceFile>Bar.java</sourceFile>
+        <mutatedClass>com.example.Bar</mutatedClass>
+        <mutatedMethod>compute</mutatedMethod>
+        <methodDescription>()I</methodDescription>
+        <lineNumber>55</lineNumber>
+        <mutator>NEGATE_CONDITIONALS</mutator>
+        <killingTest></killingTest>
+        <description>negated condition</description>
+    </mutation>
+</mutations>"""
+
+
+async def _wait_for(queue: JobQueue, job_id: int, timeout: float = 10) -> dict:
+    async def poll():
+        while True:
+            job = await queue.get(job_id)
+            if job["status"] in FINISHED:
+                return job
+            await asyncio.sleep(0.01)
+    return await asyncio.wait_for(poll(), timeout)
+
+
+def test_parse_concurrency():
+    assert parse_concurrency("ranking=2, export=3,,import=0") == {"ranking": 2, "export": 3, "import": 1}
+    assert parse_concurrency("") == {}
+
+
+class TestJobQueue:
+    """JobQueue against the real jobs table, with handlers defined by the tests."""
+
+    def _queue(self, **concurrency) -> JobQueue:
+        return JobQueue(JobRepository(db), concurrency)
+
+    @pytest.mark.asyncio
+    async def test_job_succeeds_with_result_and_progress(self):
+        queue = self._queue()
+
+        async def handler(job):
+            job.progress(3, 4)
+            return {"answer": job.params["question"] * 2}
+
+        record = await queue.submit("test", handler, params={"question": 21})
+        assert record["status"] == "queued"
+        job = await _wait_for(queue, record["id"])
+
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"answer": 42}
+        assert (job["progress_current"], job["progress_total"]) == (3, 4)
+        assert job["started_at"] is not None and job["finished_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_failing_job_records_error(self):
+        queue = self._queue()
+
+        async def handler(job):
+            raise ValueError("broken input")
+
+        job = await _wait_for(queue, (await queue.submit("test", handler))["id"])
+        assert job["status"] == "failed"
+        assert job["error"] == "broken input"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_per_type(self):
+        queue = self._queue(limited=1)
+        release = asyncio.Event()
+        running = []
+
+        async def handler(job):
+            running.append(job.job_id)
+            await release.wait()
+
+        first = await queue.submit("limited", handler)
+        second = await queue.submit("limited", handler)
+        other = await queue.submit("other", handler)
+        await asyncio.sleep(0.1)
+
+        assert sorted(running) == sorted([first["id"], other["id"]])
+        assert (await queue.get(second["id"]))["status"] == "queued"
+
+        release.set()
+        assert (await _wait_for(queue, second["id"]))["status"] == "succeeded"
+        assert running[-1] == second["id"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_and_queued_jobs(self):
+        queue = self._queue(limited=1)
+        started = asyncio.Event()
+
+        async def handler(job):
+            started.set()
+            await asyncio.sleep(60)
+
+        running = await queue.submit("limited", handler)
+        queued = await queue.submit("limited", handler)
+        await started.wait()
+
+        assert (await queue.cancel(queued["id"]))["status"] == "cancelled"
+        await queue.cancel(running["id"])
+        assert (await _wait_for(queue, running["id"]))["status"] == "cancelled"
+        # Cancelling a finished job leaves it as it is
+        assert (await queue.cancel(running["id"]))["status"] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_maintain_applies_cancellation_requested_elsewhere(self):
+        queue = self._queue()
+        started = asyncio.Event()
+
+        async def handler(job):
+            job.progress(5)
+            started.set()
+            await asyncio.sleep(60)
+
+        record = await queue.submit("test", handler)
+        await started.wait()
+        # Another process flags the job through the database
+        await JobRepository(db).request_cancel(record["id"])
+        await queue.maintain()
+
+        job = await _wait_for(queue, record["id"])
+        assert job["status"] == "cancelled"
+        assert job["progress_current"] == 5
+
+    @pytest.mark.asyncio
+    async def test_jobs_of_dead_processes_are_failed(self):
+        repository = JobRepository(db)
+        record = await repository.create("test", "dead-process", {})
+        async with db.acquire() as conn:
+            await conn.execute(
+                "UPDATE jobs SET heartbeat_at = CURRENT_TIMESTAMP - INTERVAL '1 hour' WHERE id = $1",
+                record["id"]
+            )
+        assert record["id"] in await repository.fail_stale(60)
+        job = await repository.find_by_id(record["id"])
+        assert job["status"] == "failed"
+        assert "Interrupted" in job["error"]
+
+
+class TestJobsIntegration:
+    """Background mode of the admin operations, followed through /api/admin/jobs."""
+
+    async def _headers(self, client: AsyncClient) -> dict:
+        response = await client.post(
+            "/api/login", json={"username": TEST_ADMIN_USERNAME, "password": TEST_ADMIN_PASSWORD}
+        )
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    async def _wait(self, client: AsyncClient, headers: dict, job_id: int) -> dict:
+        for _ in range(500):
+            response = await client.get(f"/api/admin/jobs/{job_id}", headers=headers)
+            assert response.status_code == 200
+            if response.json()["status"] in FINISHED:
+                return response.json()
+            await asyncio.sleep(0.02)
+        raise AssertionError(f"Job {job_id} did not finish")
+
+    async def _import_project(self, client: AsyncClient, headers: dict) -> int:
+        response = await client.post(
+            "/api/admin/projects/",
+            headers=headers,
+            params={"background": "true"},
+            data={"project_name": f"job_{uuid.uuid4().hex[:8]}"},
+            files={"file": ("mutations.xml", BytesIO(MUTATIONS_XML), "application/xml")}
+        )
+        assert response.status_code == 202, response.text
+        assert response.json()["type"] == "project_import"
+        job = await self._wait(client, headers, response.json()["id"])
+        assert job["status"] == "succeeded", job["error"]
+        assert job["progress_current"] == 2
+        return job["result"]["id"]
+
+    @pytest.mark.asyncio
+    async def test_jobs_endpoints_require_admin(self, client: AsyncClient):
+        assert (await client.get("/api/admin/jobs")).status_code == 401
+        headers = await self._headers(client)
+        assert (await client.get("/api/admin/jobs/999999999", headers=headers)).status_code == 404
+        assert (await client.post("/api/admin/jobs/999999999/cancel", headers=headers)).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_background_import_ranking_and_export(self, client: AsyncClient):
+        headers = await self._headers(client)
+        project_id = await self._import_project(client, headers)
+
+        try:
+            mutants = (await client.get(f"/api/projects/{project_id}/mutants", headers=headers)).json()
+            assert len(mutants) == 2
+
+            response = await client.post(
+                f"/api/projects/{project_id}/algorithm",
+                headers=headers,
+                params={"background": "true"},
+                json={"algorithm": "lexicographical_rank"}
+            )
+            assert response.status_code == 202, response.text
+            job = await self._wait(client, headers, response.json()["id"])
+            assert job["status"] == "succeeded", job["error"]
+            assert job["result"]["mutants_ranked"] == 2
+            assert (job["progress_current"], job["progress_total"]) == (3, 3)
+
+            form_field = (await client.get(f"/api/projects/{project_id}/form-fields", headers=headers)).json()[0]
+            await client.post(
+                f"/api/mutants/{mutants[0]['id']}/ratings",
+                headers=headers,
+                json={"field_values": [{"form_field_id": form_field["id"], "value": "4"}]}
+            )
+            response = await client.post(f"/api/admin/projects/{project_id}/export/jobs", headers=headers)
+            assert response.status_code == 202
+            job = await self._wait(client, headers, response.json()["id"])
+            assert job["status"] == "succeeded", job["error"]
+            assert job["result"]["rows"] == 1
+            assert (job["progress_current"], job["progress_total"]) == (1, 1)
+
+            response = await client.get(f"/api/admin/jobs/{job['id']}/result", headers=headers)
+            assert response.status_code == 200
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert [line["mutant_id"] for line in lines] == [mutants[0]["id"]]
+
+            listed = (await client.get("/api/admin/jobs", headers=headers, params={"type": "export"})).json()
+            assert listed[0]["id"] == job["id"]
+            shutil.rmtree(storage.get_job_path(job["id"]))
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_background_source_upload(self, client: AsyncClient):
+        headers = await self._headers(client)
+        project_id = await self._import_project(client, headers)
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("com/example/Bar.java", "class Bar {}")
+        archive.seek(0)
+
+        try:
+            response = await client.put(
+                f"/api/admin/project/{project_id}/source",
+                headers=headers,
+                params={"background": "true"},
+                files={"file": ("source.zip", archive, "application/zip")}
+            )
+            assert response.status_code == 202
+            job = await self._wait(client, headers, response.json()["id"])
+            assert job["status"] == "succeeded", job["error"]
+            # Only export jobs produce a file
+            response = await client.get(f"/api/admin/jobs/{job['id']}/result", headers=headers)
+            assert response.status_code == 409
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_background_jobs_for_unknown_project(self, client: AsyncClient):
+        headers = await self._headers(client)
+        response = await client.put(
+            "/api/admin/project/999999999/source",
+            headers=headers,
+            params={"background": "true"},
+            files={"file": ("source.zip", io.BytesIO(b"PK"), "application/zip")}
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Project not found"
+
+        response = await client.post(
+            "/api/projects/999999999/algorithm",
+            headers=headers,
+            params={"background": "true"},
+            json={"algorithm": "lexicographical_rank"}
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Project not found"
+
+    @pytest.mark.asyncio
+    async def test_failed_background_import_reports_error(self, client: AsyncClient):
+        headers = await self._headers(client)
+        response = await client.post(
+            "/api/admin/projects/",
+            headers=headers,
+            params={"background": "true"},
+            data={"project_name": f"job_bad_{uuid.uuid4().hex[:8]}"},
+            files={"file": ("mutations.xml", BytesIO(b"<mutations><broken"), "application/xml")}
+        )
+        assert response.status_code == 202
+        job = await self._wait(client, headers, response.json()["id"])
+        assert job["status"] == "failed"
+        assert "Failed to parse XML" in job["error"]
+
+    @pytest.mark.asyncio
+    async def test_background_ranking_with_unknown_algorithm(self, client: AsyncClient):
+        headers = await self._headers(client)
+        response = await client.post(
+            "/api/projects/1/algorithm",
+            headers=headers,
+            params={"background": "true"},
+            json={"algorithm": "no_such_algorithm"}
+        )
+        assert response.status_code == 404
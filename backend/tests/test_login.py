@@ -1,5 +1,12 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
 import pytest
 from httpx import AsyncClient
+
+from core import security
+from core.security import PasswordHasher, PasswordHasherBusyError
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
 
@@ -78,3 +85,59 @@ class TestLogin:
             }
         )
         assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_login_returns_503_when_password_hasher_is_saturated(self, client: AsyncClient):
+        """Logins beyond the bcrypt queue limit are turned away instead of queueing."""
+        saturated = PasswordHasher(workers=1, max_queue=0)
+        saturated.in_flight = 1
+        with patch("core.security.password_hasher", saturated):
+            response = await client.post(
+                "/api/login",
+                json={"username": TEST_ADMIN_USERNAME, "password": TEST_ADMIN_PASSWORD}
+            )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert saturated.rejected == 1
+
+
+class TestPasswordHasher:
+    """Unit tests for the bounded bcrypt pool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop_thread(self):
+        hasher = PasswordHasher(workers=2, max_queue=2)
+        try:
+            thread_name = await hasher.run(lambda: threading.current_thread().name)
+            assert thread_name.startswith("bcrypt")
+            assert hasher.in_flight == 0
+        finally:
+            hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_workers_plus_queue(self):
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            running = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with pytest.raises(PasswordHasherBusyError):
+                await hasher.run(release.wait)
+            release.set()
+            await asyncio.gather(*running)
+            assert hasher.in_flight == 0
+            assert hasher.rejected == 1
+        finally:
+            release.set()
+            hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_zero_workers_runs_inline(self):
+        hasher = PasswordHasher(workers=0, max_queue=0)
+        assert await hasher.run(lambda: threading.current_thread()) is threading.current_thread()
+
+    @pytest.mark.asyncio
+    async def test_async_hash_round_trip(self):
+        password_hash = await security.hash_password_async("secret-password")
+        assert await security.verify_password_async("secret-password", password_hash)
+        assert not await security.verify_password_async("wrong-password", password_hash)
@@ -0,0 +1,74 @@
+"""
+Tests for the versioned migration runner.
+Covers:
+  - core/migrations.py (discover_migrations, apply_migrations)
+  - migrations/ (every shipped migration has been applied)
+"""
+import pytest
+
+from core.database import db
+from core.migrations import apply_migrations, discover_migrations, MIGRATIONS_DIR
+
+
+class TestDiscoverMigrations:
+
+    def test_orders_by_version(self, tmp_path):
+        (tmp_path / "0010_later.sql").write_text("SELECT 1;")
+        (tmp_path / "0002_earlier.sql").write_text("SELECT 1;")
+        migrations = discover_migrations(tmp_path)
+        assert [(m.version, m.name) for m in migrations] == [(2, "earlier"), (10, "later")]
+
+    def test_invalid_file_name_raises(self, tmp_path):
+        (tmp_path / "add_indexes.sql").write_text("SELECT 1;")
+        with pytest.raises(ValueError, match="Invalid migration file name"):
+            discover_migrations(tmp_path)
+
+    def test_duplicate_versions_raise(self, tmp_path):
+        (tmp_path / "0001_a.sql").write_text("SELECT 1;")
+        (tmp_path / "001_b.sql").write_text("SELECT 1;")
+        with pytest.raises(ValueError, match="Duplicate"):
+            discover_migrations(tmp_path)
+
+
+class TestApplyMigrations:
+
+    @pytest.mark.asyncio
+    async def test_shipped_migrations_are_applied(self):
+        async with db.acquire() as conn:
+            applied = {r["version"] for r in await conn.fetch("SELECT version FROM schema_migrations")}
+        assert {m.version for m in discover_migrations(MIGRATIONS_DIR)} <= applied
+
+    @pytest.mark.asyncio
+    async def test_applies_pending_migrations_once(self, tmp_path):
+        (tmp_path / "9001_migration_runner_probe.sql").write_text(
+            "CREATE TABLE migration_runner_probe (id INTEGER);"
+        )
+        try:
+            assert await apply_migrations(db, tmp_path) == [9001]
+            assert await apply_migrations(db, tmp_path) == []
+        finally:
+            async with db.acquire() as conn:
+                await conn.execute("DROP TABLE IF EXISTS migration_runner_probe")
+                await conn.execute("DELETE FROM schema_migrations WHERE version = 9001")
+
+    @pytest.mark.asyncio
+    async def test_failed_migration_is_not_recorded(self, tmp_path):
+        (tmp_path / "9002_broken.sql").write_text(
+            "CREATE TABLE migration_runner_broken (id INTEGER); SELECT * FROM missing_table;"
+        )
+        with pytest.raises(Exception):
+            await apply_migrations(db, tmp_path)
+        async with db.acquire() as conn:
+            assert await conn.fetchval("SELECT to_regclass('migration_runner_broken')") is None
+            assert await conn.fetchval("SELECT COUNT(*) FROM schema_migrations WHERE version = 9002") == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_table_ownership_explains_upgrade(self, tmp_path):
+        (tmp_path / "9003_not_owner.sql").write_text(
+            "DO $$ BEGIN RAISE EXCEPTION 'must be owner of table mutants' "
+            "USING ERRCODE = 'insufficient_privilege'; END $$;"
+        )
+        with pytest.raises(RuntimeError, match="fix-table-ownership.sql"):
+            await apply_migrations(db, tmp_path)
+        async with db.acquire() as conn:
+            assert await conn.fetchval("SELECT COUNT(*) FROM schema_migrations WHERE version = 9003") == 0
@@ -1,5 +1,6 @@
 import pytest
 import uuid
+import zipfile
 from unittest.mock import AsyncMock
 from httpx import AsyncClient
 from io import BytesIO
@@ -206,3 +207,117 @@ class TestMutantsIntegration:
             f"/api/admin/projects/{project_id}",
             headers={"Authorization": f"Bearer {token}"}
         )
+
+    @pytest.mark.asyncio
+    async def test_next_mutant_follows_the_applied_algorithm(self, client: AsyncClient):
+        """The first mutant handed out is the one the algorithm ranked 0."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        mutation = """
+    <mutation detected='{detected}' status='{status}' numberOfTestsRun='1'>
+        <sourceFile>Foo.java</sourceFile>
+        <mutatedClass>com.example.Foo</mutatedClass>
+        <mutatedMethod>run</mutatedMethod>
+        <methodDescription>()V</methodDescription>
+        <lineNumber>{line}</lineNumber>
+        <mutator>MATH</mutator>
+        <killingTest></killingTest>
+        <description>changed</description>
+    </mutation>"""
+        xml = "<mutations>" + "".join(
+            mutation.format(detected=detected, status=status, line=line)
+            for detected, status, line in [("true", "KILLED", 1), ("false", "SURVIVED", 2)]
+        ) + "</mutations>"
+        response = await client.post(
+            "/api/admin/projects/",
+            headers=headers,
+            data={"project_name": f"next_rank_{uuid.uuid4().hex[:8]}"},
+            files={"file": ("mutations.xml", BytesIO(xml.encode()), "application/xml")}
+        )
+        project_id = response.json()["id"]
+
+        try:
+            response = await client.post(
+                f"/api/projects/{project_id}/algorithm",
+                headers=headers,
+                json={"algorithm": "status_priority_rank"}
+            )
+            assert response.status_code == 200
+            url = f"/api/projects/{project_id}/mutants/next"
+
+            first = (await client.get(url, headers=headers)).json()["mutants"][0]["mutant"]
+            assert (first["status"], first["ranking"]) == ("SURVIVED", 0)
+            second = (await client.get(url, headers=headers, params={"after": first["id"]})).json()
+            assert [m["mutant"]["status"] for m in second["mutants"]] == ["KILLED"]
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_next_mutant_with_prefetch(self, client: AsyncClient):
+        """One call returns the next unrated mutant, its source, rating and the form fields."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        mutation = """
+    <mutation detected='false' status='SURVIVED' numberOfTestsRun='1'>
+        <sourceFile>{cls}.java</sourceFile>
+        <mutatedClass>com.example.{cls}</mutatedClass>
+        <mutatedMethod>run</mutatedMethod>
+        <methodDescription>()V</methodDescription>
+        <lineNumber>{line}</lineNumber>
+        <mutator>MATH</mutator>
+        <killingTest></killingTest>
+        <description>changed</description>
+    </mutation>"""
+        xml = "<mutations>" + "".join(
+            mutation.format(cls=cls, line=line) for cls, line in [("Foo", 1), ("Foo", 2), ("Bar", 3)]
+        ) + "</mutations>"
+        response = await client.post(
+            "/api/admin/projects/",
+            headers=headers,
+            data={"project_name": f"next_{uuid.uuid4().hex[:8]}"},
+            files={"file": ("mutations.xml", BytesIO(xml.encode()), "application/xml")}
+        )
+        project_id = response.json()["id"]
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("com/example/Foo.java", "class Foo {}")
+        archive.seek(0)
+        await client.put(
+            f"/api/admin/project/{project_id}/source",
+            headers=headers,
+            files={"file": ("source.zip", archive, "application/zip")}
+        )
+
+        try:
+            ids = [m["id"] for m in (await client.get(f"/api/projects/{project_id}/mutants", headers=headers)).json()]
+            form_field = (await client.get(f"/api/projects/{project_id}/form-fields", headers=headers)).json()[0]
+            await client.post(
+                f"/api/mutants/{ids[0]}/ratings",
+                headers=headers,
+                json={"field_values": [{"form_field_id": form_field["id"], "value": "3"}]}
+            )
+            url = f"/api/projects/{project_id}/mutants/next"
+
+            data = (await client.get(url, headers=headers, params={"prefetch": 5})).json()
+            assert [m["mutant"]["id"] for m in data["mutants"]] == ids[1:]
+            assert data["remaining"] == 2
+            assert data["form_fields"][0]["id"] == form_field["id"]
+            foo, bar = data["mutants"]
+            assert foo["source"]["content"] == "class Foo {}" and foo["rating"] is None
+            assert bar["source"]["found"] is False
+
+            data = (await client.get(url, headers=headers, params={"after": ids[1]})).json()
+            assert [m["mutant"]["id"] for m in data["mutants"]] == [ids[2]]
+            data = (await client.get(url, headers=headers, params={"after": ids[2]})).json()
+            assert data["mutants"] == []
+
+            # Stepping through rated mutants too shows the user's rating
+            data = (await client.get(url, headers=headers, params={"unrated_only": "false"})).json()
+            current = data["mutants"][0]
+            assert current["mutant"]["id"] == ids[0]
+            assert current["rating"]["field_values"][0]["value"] == "3"
+
+            assert (await client.get(url, headers=headers, params={"after": 999999999})).status_code == 404
+            assert (await client.get(url)).status_code == 401
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
@@ -7,6 +7,8 @@ from io import BytesIO
 from main import app
 from dependencies import get_current_user, get_project_service
 from models.auth import UserResponse
+from models.mutant import MutantListFilter, MutantPage
+from services.project import InvalidCursorError
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
 
@@ -47,7 +49,7 @@ class TestProjects:
     async def test_list_mutants_success(self, client: AsyncClient):
         mock_project_svc = AsyncMock()
         mock_project_svc.does_user_belong_to_project.return_value = True
-        mock_project_svc.get_mutant_list.return_value = []
+        mock_project_svc.get_mutant_list.return_value = MutantPage(mutants=[], total=0)
 
         app.dependency_overrides[get_current_user] = lambda: FAKE_USER
         app.dependency_overrides[get_project_service] = lambda: mock_project_svc
@@ -58,6 +60,56 @@ class TestProjects:
             )
             assert response.status_code == 200
             assert response.json() == []
+            assert response.headers["X-Total-Count"] == "0"
+            assert "X-Next-Cursor" not in response.headers
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_list_mutants_passes_filters(self, client: AsyncClient):
+        mock_project_svc = AsyncMock()
+        mock_project_svc.does_user_belong_to_project.return_value = True
+        mock_project_svc.get_mutant_list.return_value = MutantPage(mutants=[], total=7, next_cursor="3:12")
+
+        app.dependency_overrides[get_current_user] = lambda: FAKE_USER
+        app.dependency_overrides[get_project_service] = lambda: mock_project_svc
+        try:
+            response = await client.get(
+                "/api/projects/1/mutants",
+                headers={"Authorization": "Bearer faketoken"},
+                params={
+                    "limit": 5, "cursor": "4:10", "status": "SURVIVED",
+                    "mutator": "MATH", "source_file": "src/", "rated": "false"
+                }
+            )
+            assert response.status_code == 200
+            assert response.headers["X-Total-Count"] == "7"
+            assert response.headers["X-Next-Cursor"] == "3:12"
+            mock_project_svc.get_mutant_list.assert_called_once_with(
+                FAKE_USER.id, 1, 5, "4:10",
+                MutantListFilter(status="SURVIVED", mutator="MATH", source_file_prefix="src/", rated=False)
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_list_mutants_rejects_invalid_parameters(self, client: AsyncClient):
+        mock_project_svc = AsyncMock()
+        mock_project_svc.does_user_belong_to_project.return_value = True
+        mock_project_svc.get_mutant_list.side_effect = InvalidCursorError("bad")
+
+        app.dependency_overrides[get_current_user] = lambda: FAKE_USER
+        app.dependency_overrides[get_project_service] = lambda: mock_project_svc
+        try:
+            headers = {"Authorization": "Bearer faketoken"}
+            response = await client.get("/api/projects/1/mutants", headers=headers, params={"cursor": "x"})
+            assert response.status_code == 400
+
+            response = await client.get("/api/projects/1/mutants", headers=headers, params={"limit": 0})
+            assert response.status_code == 422
+
+            response = await client.get("/api/projects/1/mutants", headers=headers, params={"status": "BROKEN"})
+            assert response.status_code == 422
         finally:
             app.dependency_overrides.clear()
 
@@ -185,6 +237,101 @@ class TestProjectsIntegration:
             headers={"Authorization": f"Bearer {token}"}
         )
 
+    @pytest.mark.asyncio
+    async def test_list_mutants_pages_with_cursor(self, client: AsyncClient):
+        """Pages follow the unpaginated order and the cursor ends on the last page."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = await self._create_test_project(client, token, "mutpage_int")
+        url = f"/api/projects/{project_id}/mutants"
+
+        try:
+            everything = (await client.get(url, headers=headers)).json()
+
+            first = await client.get(url, headers=headers, params={"limit": 1})
+            assert first.status_code == 200
+            assert first.headers["X-Total-Count"] == "2"
+            assert first.json() == everything[:1]
+
+            second = await client.get(
+                url, headers=headers, params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]}
+            )
+            assert second.json() == everything[1:2]
+
+            last = await client.get(
+                url, headers=headers, params={"limit": 1, "cursor": second.headers["X-Next-Cursor"]}
+            )
+            assert last.json() == []
+            assert "X-Next-Cursor" not in last.headers
+
+            response = await client.get(url, headers=headers, params={"cursor": "not-a-cursor"})
+            assert response.status_code == 400
+            response = await client.get(url, headers=headers, params={"cursor": "99999999999:1"})
+            assert response.status_code == 400
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_list_mutants_pages_start_with_the_first_ranked_mutant(self, client: AsyncClient):
+        """Ranking 0 is the mutant to review first, so it opens the first page."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = await self._create_test_project(client, token, "mutrank_int")
+        url = f"/api/projects/{project_id}/mutants"
+
+        try:
+            response = await client.post(
+                f"/api/projects/{project_id}/algorithm",
+                headers=headers,
+                json={"algorithm": "lexicographical_rank"}
+            )
+            assert response.status_code == 200
+
+            rankings = [m["ranking"] for m in (await client.get(url, headers=headers)).json()]
+            assert rankings == [0, 1]
+            first = (await client.get(url, headers=headers, params={"limit": 1})).json()
+            assert first[0]["ranking"] == 0
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
+    @pytest.mark.asyncio
+    async def test_list_mutants_filters(self, client: AsyncClient):
+        """Status, mutator, source file prefix and rated filters narrow the list and its total."""
+        token = await self._get_admin_token(client)
+        headers = {"Authorization": f"Bearer {token}"}
+        project_id = await self._create_test_project(client, token, "mutfilter_int")
+        url = f"/api/projects/{project_id}/mutants"
+
+        async def listed(**params):
+            response = await client.get(url, headers=headers, params=params)
+            assert response.status_code == 200
+            mutants = response.json()
+            assert response.headers["X-Total-Count"] == str(len(mutants))
+            return mutants
+
+        try:
+            assert [m["status"] for m in await listed(status="SURVIVED")] == ["SURVIVED"]
+            assert [m["mutator"] for m in await listed(mutator="MATH")] == ["MATH"]
+            assert len(await listed(source_file="Bar")) == 2
+            assert await listed(source_file="Ba_") == []
+            assert await listed(status="KILLED", mutator="NEGATE_CONDITIONALS") == []
+
+            survived = (await listed(status="SURVIVED"))[0]
+            form_fields = (await client.get(f"/api/projects/{project_id}/form-fields", headers=headers)).json()
+            response = await client.post(
+                f"/api/mutants/{survived['id']}/ratings",
+                headers=headers,
+                json={"field_values": [{"form_field_id": form_fields[0]["id"], "value": "4"}]}
+            )
+            assert response.status_code == 201
+
+            assert [m["id"] for m in await listed(rated="true")] == [survived["id"]]
+            assert survived["id"] not in [m["id"] for m in await listed(rated="false")]
+            assert len(await listed(rated="false")) == 1
+            assert await listed(rated="true", mutator="MATH") == []
+        finally:
+            await client.delete(f"/api/admin/projects/{project_id}", headers=headers)
+
     @pytest.mark.asyncio
     async def test_project_not_visible_to_unassigned_user(self, client: AsyncClient):
         """A project created by admin is not visible to a user who wasn't added to it."""
@@ -0,0 +1,430 @@
+"""
+EXPLAIN (ANALYZE, BUFFERS) regression suite for the repository layer.
+
+Seeds a database with QUERY_PLAN_SEED_MUTANTS mutants (50k by default,
+sized for CI) inside a transaction, runs every repository query against it and
+asserts that none of them falls back to a sequential scan on one of the large
+tables. Set QUERY_PLAN_SEED_MUTANTS=1000000 to check the plans at production
+scale. All seeded data is rolled back at the end, so the suite leaves the
+database untouched.
+
+Covers:
+  - repositories/*_repository.py (every database query)
+  - migrations/ (the indexes the queries rely on)
+"""
+import json
+import os
+
+import pytest
+
+from core.database import db
+from repositories.export_repository import ExportRepository
+from repositories.form_field_repository import FormFieldRepository
+from repositories.form_field_value_repository import FormFieldValueRepository
+from repositories.job_repository import JobRepository
+from repositories.mutant_repository import MutantRepository
+from repositories.project_repository import ProjectRepository
+from repositories.progress_repository import ProgressRepository
+from repositories.rating_repository import RatingRepository
+from repositories.session_repository import SessionRepository
+from repositories.user_repository import UserRepository
+
+SEED_MUTANTS = int(os.getenv("QUERY_PLAN_SEED_MUTANTS", "50000"))
+SEED_PROJECTS = 200
+SEED_USERS = 200
+
+# Tables that grow with the number of mutants, ratings and reviewers
+LARGE_TABLES = {
+    "mutants", "rating", "form_field_values", "sessions", "project_assignments", "project_user_progress"
+}
+
+pytestmark = pytest.mark.slow
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _PlanRecorder:
+    """Connection proxy that captures the plan of every query before running it."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.label = None
+        self.plans = []
+
+    async def _explain(self, query, args):
+        try:
+            async with self.conn.transaction():
+                plan = await self.conn.fetchval(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", *args
+                )
+                self.plans.append((self.label, query, json.loads(plan)[0]["Plan"]))
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    async def fetch(self, query, *args):
+        await self._explain(query, args)
+        return await self.conn.fetch(query, *args)
+
+    async def fetchrow(self, query, *args):
+        await self._explain(query, args)
+        return await self.conn.fetchrow(query, *args)
+
+    async def fetchval(self, query, *args):
+        await self._explain(query, args)
+        return await self.conn.fetchval(query, *args)
+
+    async def execute(self, query, *args):
+        if args:
+            await self._explain(query, args)
+        return await self.conn.execute(query, *args)
+
+    async def executemany(self, query, args):
+        args = list(args)
+        if args:
+            await self._explain(query, args[0])
+        return await self.conn.executemany(query, args)
+
+    async def copy_records_to_table(self, *args, **kwargs):
+        return await self.conn.copy_records_to_table(*args, **kwargs)
+
+    async def cursor(self, query, *args):
+        await self._explain(query, args)
+        return await self.conn.cursor(query, *args)
+
+    def transaction(self, **kwargs):
+        # Runs inside the seeding transaction, so it can only be a savepoint
+        return self.conn.transaction()
+
+
+class _Bound:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def _seed(conn) -> dict:
+    user_ids = [r["id"] for r in await conn.fetch(
+        """
+        INSERT INTO users (username, password_hash)
+        SELECT 'query_plan_user_' || g, 'x' FROM generate_series(1, $1) g
+        RETURNING id
+        """,
+        SEED_USERS
+    )]
+    project_ids = [r["id"] for r in await conn.fetch(
+        """
+        INSERT INTO projects (name)
+        SELECT 'query_plan_project_' || g FROM generate_series(1, $1) g
+        RETURNING id
+        """,
+        SEED_PROJECTS
+    )]
+    await conn.execute(
+        """
+        INSERT INTO mutants
+        (project_id, detected, status, numberoftestsrun, sourcefile, mutatedclass,
+         mutatedmethod, methoddescription, linenumber, mutator, killingtest, description)
+        SELECT ($2::int[])[1 + g % array_length($2::int[], 1)],
+               g % 3 = 0,
+               (ARRAY['KILLED', 'SURVIVED', 'NO_COVERAGE'])[1 + g % 3],
+               g % 7,
+               'File' || (g % 500) || '.java',
+               'com.example.File' || (g % 500),
+               'method' || (g % 20),
+               '()V',
+               g % 2000,
+               (ARRAY['MATH', 'NEGATE_CONDITIONALS', 'VOID_METHOD_CALLS'])[1 + g % 3],
+               NULL,
+               'seeded mutant'
+        FROM generate_series(1, $1) g
+        """,
+        SEED_MUTANTS, project_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO form_fields (project_id, label, type, is_required, position)
+        SELECT p, 'Rating', 'rating', TRUE, 0 FROM unnest($1::int[]) p
+        UNION ALL
+        SELECT p, 'Notes', 'text', FALSE, 1 FROM unnest($1::int[]) p
+        """,
+        project_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO rating (mutant_id, user_id)
+        SELECT m.id, ($2::int[])[1 + (m.id / ($3 * 5)) % array_length($2::int[], 1)]
+        FROM mutants m
+        -- Consecutive mutants of a project are SEED_PROJECTS ids apart; rate every fifth one
+        WHERE m.project_id = ANY($1) AND (m.id / $3) % 5 = 0
+        """,
+        project_ids, user_ids, SEED_PROJECTS
+    )
+    await conn.execute(
+        """
+        INSERT INTO form_field_values (form_field_id, rating_id, value)
+        SELECT ff.id, r.id, '3'
+        FROM rating r
+        INNER JOIN mutants m ON m.id = r.mutant_id
+        INNER JOIN form_fields ff ON ff.project_id = m.project_id AND ff.position = 0
+        WHERE m.project_id = ANY($1)
+        """,
+        project_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO sessions (user_id, token)
+        SELECT u, 'query_plan_token_' || u || '_' || g
+        FROM unnest($1::int[]) u, generate_series(1, 100) g
+        """,
+        user_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO project_assignments (user_id, project_id)
+        SELECT u, p
+        FROM unnest($1::int[]) WITH ORDINALITY AS us(u, ui),
+             unnest($2::int[]) WITH ORDINALITY AS ps(p, pi)
+        WHERE (ui + pi) % 4 = 0
+        """,
+        user_ids, project_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO project_progress (project_id, total_mutants, rated_mutants)
+        SELECT p, (SELECT COUNT(*) FROM mutants WHERE project_id = p),
+               (SELECT COUNT(DISTINCT mutant_id) FROM rating WHERE project_id = p)
+        FROM unnest($1::int[]) p
+        """,
+        project_ids
+    )
+    await conn.execute(
+        """
+        INSERT INTO project_user_progress (project_id, user_id, reviewed_mutants)
+        SELECT project_id, user_id, COUNT(*) FROM rating
+        WHERE project_id = ANY($1)
+        GROUP BY project_id, user_id
+        """,
+        project_ids
+    )
+    for table in ("users", "projects", "form_fields") + tuple(sorted(LARGE_TABLES)):
+        await conn.execute(f"ANALYZE {table}")
+
+    project_id = project_ids[0]
+    rating = await conn.fetchrow(
+        """
+        SELECT r.id, r.mutant_id, r.user_id FROM rating r
+        INNER JOIN mutants m ON m.id = r.mutant_id
+        WHERE m.project_id = $1 LIMIT 1
+        """,
+        project_id
+    )
+    user_id = rating["user_id"]
+    await conn.execute(
+        "INSERT INTO project_assignments (user_id, project_id) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+        user_id, project_id
+    )
+    other_user_id = next(u for u in user_ids if u != user_id)
+    await conn.execute(
+        "DELETE FROM project_assignments WHERE user_id = $1 AND project_id = $2",
+        other_user_id, project_id
+    )
+    return {
+        "project_id": project_id,
+        "other_project_id": project_ids[1],
+        "user_id": user_id,
+        "other_user_id": other_user_id,
+        "mutant_id": rating["mutant_id"],
+        "rating_id": rating["id"],
+        "form_field_id": await conn.fetchval(
+            "SELECT id FROM form_fields WHERE project_id = $1 AND position = 0", project_id
+        ),
+        "token": f"query_plan_token_{user_id}_1",
+        "username": await conn.fetchval("SELECT username FROM users WHERE id = $1", user_id),
+    }
+
+
+async def _drain(batches) -> None:
+    async for _ in batches:
+        pass
+
+
+async def _exercise_repositories(recorder: _PlanRecorder, s: dict) -> None:
+    users = UserRepository(db)
+    sessions = SessionRepository(db)
+    projects = ProjectRepository(db)
+    mutants = MutantRepository(db)
+    form_fields = FormFieldRepository(db)
+    values = FormFieldValueRepository(db)
+    ratings = RatingRepository(db)
+    export = ExportRepository(db)
+    progress = ProgressRepository(db)
+    jobs = JobRepository(db)
+
+    calls = [
+        ("UserRepository.find_by_username", lambda: users.find_by_username(s["username"])),
+        ("UserRepository.find_by_username_with_password",
+         lambda: users.find_by_username_with_password(s["username"])),
+        ("UserRepository.find_by_id", lambda: users.find_by_id(s["user_id"])),
+        ("UserRepository.find_all_users", lambda: users.find_all_users()),
+        ("UserRepository.find_users_with_review_counts",
+         lambda: users.find_users_with_review_counts(limit=50, after="query_plan_user_1", search="query_plan")),
+        ("UserRepository.create", lambda: users.create("query_plan_new_user", "x")),
+        ("UserRepository.update_password", lambda: users.update_password(s["user_id"], "y")),
+        ("UserRepository.update_username",
+         lambda: users.update_username(s["user_id"], s["username"] + "_renamed")),
+        ("UserRepository.update_admin_status", lambda: users.update_admin_status(s["user_id"], False)),
+        ("UserRepository.update_active_status", lambda: users.update_active_status(s["user_id"], True)),
+        ("SessionRepository.find_user_by_token", lambda: sessions.find_user_by_token(s["token"])),
+        ("SessionRepository.create", lambda: sessions.create(s["user_id"], "query_plan_new_token")),
+        ("SessionRepository.delete_by_token", lambda: sessions.delete_by_token("query_plan_new_token")),
+        ("ProjectRepository.find_by_user_id", lambda: projects.find_by_user_id(s["user_id"])),
+        ("ProjectRepository.find_by_user_id_with_counts",
+         lambda: projects.find_by_user_id_with_counts(s["user_id"])),
+        ("ProjectRepository.find_users_by_project_id",
+         lambda: projects.find_users_by_project_id(s["project_id"])),
+        ("ProjectRepository.does_user_belong_to_project",
+         lambda: projects.does_user_belong_to_project(s["user_id"], s["project_id"])),
+        ("ProjectRepository.get_mutant_list", lambda: projects.get_mutant_list(s["user_id"], s["project_id"])),
+        ("ProjectRepository.get_mutant_list (page)", lambda: projects.get_mutant_list(
+            s["user_id"], s["project_id"], limit=50, after=(0, s["mutant_id"]), status="SURVIVED", rated=False
+        )),
+        ("ProjectRepository.count_mutants", lambda: projects.count_mutants(
+            s["user_id"], s["project_id"], status="SURVIVED", mutator="MATH", source_file_prefix="src/"
+        )),
+        ("ProjectRepository.does_project_exsist", lambda: projects.does_project_exsist(s["project_id"])),
+        ("ProjectRepository.find_all_projects", lambda: projects.find_all_projects()),
+        ("ProjectRepository.find_all_projects_with_counts", lambda: projects.find_all_projects_with_counts()),
+        ("ProjectRepository.update_name", lambda: projects.update_name(s["project_id"], "query_plan_renamed")),
+        ("ProjectRepository.update_last_algorithm",
+         lambda: projects.update_last_algorithm(s["project_id"], "Lexicographical Rank", "lexicographical_rank", "1:0123456789abcdef")),
+        ("ProjectRepository.lock_ranking", lambda: projects.lock_ranking(s["project_id"])),
+        ("ProjectRepository.get_ranking_algorithm", lambda: projects.get_ranking_algorithm(s["project_id"])),
+        ("ProjectRepository.add_user", lambda: projects.add_user(s["project_id"], s["other_user_id"])),
+        ("ProjectRepository.remove_user", lambda: projects.remove_user(s["project_id"], s["other_user_id"])),
+        ("ProjectRepository.create", lambda: projects.create("query_plan_new_project")),
+        ("MutantRepository.count_by_project_id", lambda: mutants.count_by_project_id(s["project_id"])),
+        ("MutantRepository.get_mutant", lambda: mutants.get_mutant(s["mutant_id"])),
+        ("MutantRepository.get_mutants", lambda: mutants.get_mutants([s["mutant_id"], s["mutant_id"] + 1])),
+        ("MutantRepository.count_by_class", lambda: mutants.count_by_class(s["project_id"])),
+        ("MutantRepository.get_all_for_ranking", lambda: mutants.get_all_for_ranking(s["project_id"])),
+        ("MutantRepository.bulk_update_rankings",
+         lambda: mutants.bulk_update_rankings(s["project_id"], {s["mutant_id"]: 7})),
+        ("MutantRepository.get_all_for_ranking (without sort key)",
+         lambda: mutants.get_all_for_ranking(s["project_id"], without_sort_key=True)),
+        ("MutantRepository.get_all_for_adaptive_ranking",
+         lambda: mutants.get_all_for_adaptive_ranking(s["project_id"])),
+        ("MutantRepository.bulk_update_sort_keys",
+         lambda: mutants.bulk_update_sort_keys(s["project_id"], [s["mutant_id"]], [b"key"])),
+        ("MutantRepository.update_rankings_from_sort_keys",
+         lambda: mutants.update_rankings_from_sort_keys(s["project_id"])),
+        ("MutantRepository.insert_many", lambda: mutants.insert_many([[
+            s["project_id"], True, "KILLED", 1, "New.java", "com.New", "m", "()V", 1, "MATH", None, "new", None
+        ]])),
+        ("FormFieldRepository.find_by_project_id", lambda: form_fields.find_by_project_id(s["project_id"])),
+        ("FormFieldRepository.find_by_id", lambda: form_fields.find_by_id(s["form_field_id"])),
+        ("FormFieldRepository.create", lambda: form_fields.create(s["project_id"], "Extra", "text", False)),
+        ("FormFieldRepository.update", lambda: form_fields.update(s["form_field_id"], label="Score")),
+        ("FormFieldRepository.reorder_fields",
+         lambda: form_fields.reorder_fields(s["project_id"], [s["form_field_id"]])),
+        ("FormFieldValueRepository.find_by_rating_id", lambda: values.find_by_rating_id(s["rating_id"])),
+        ("FormFieldValueRepository.find_by_rating_ids", lambda: values.find_by_rating_ids([s["rating_id"]])),
+        ("FormFieldValueRepository.upsert_many", lambda: values.upsert_many(
+            s["rating_id"], [{"form_field_id": s["form_field_id"], "value": "4"}]
+        )),
+        ("FormFieldValueRepository.create", lambda: values.create(s["form_field_id"], s["rating_id"], "5")),
+        ("FormFieldValueRepository.create_many", lambda: values.create_many(
+            s["rating_id"], [{"form_field_id": s["form_field_id"], "value": "5"}]
+        )),
+        ("FormFieldValueRepository.find_by_id", lambda: values.find_by_id(1)),
+        ("FormFieldValueRepository.update", lambda: values.update(1, "5")),
+        ("RatingRepository.find_by_id", lambda: ratings.find_by_id(s["rating_id"])),
+        ("RatingRepository.find_by_mutant_and_user",
+         lambda: ratings.find_by_mutant_and_user(s["mutant_id"], s["user_id"])),
+        ("RatingRepository.find_by_user_and_mutants",
+         lambda: ratings.find_by_user_and_mutants(s["user_id"], [s["mutant_id"], s["mutant_id"] + 1])),
+        ("RatingRepository.upsert", lambda: ratings.upsert(s["mutant_id"], s["user_id"])),
+        ("RatingRepository.count_reviewed_by_project_and_user",
+         lambda: ratings.count_reviewed_by_project_and_user(s["project_id"], s["user_id"])),
+        ("RatingRepository.count_total_by_user", lambda: ratings.count_total_by_user(s["user_id"])),
+        ("RatingRepository.find_by_project_and_user",
+         lambda: ratings.find_by_project_and_user(s["project_id"], s["user_id"])),
+        ("RatingRepository.find_by_project", lambda: ratings.find_by_project(s["project_id"])),
+        ("RatingRepository.find_rating_values_by_project",
+         lambda: ratings.find_rating_values_by_project(s["project_id"])),
+        ("ExportRepository.get_project_info", lambda: export.get_project_info(s["project_id"])),
+        ("ExportRepository.get_export_stats", lambda: export.get_export_stats(s["project_id"])),
+        ("ExportRepository.get_all_ratings_with_details",
+         lambda: export.get_all_ratings_with_details(s["project_id"])),
+        ("ExportRepository.get_all_ratings_with_details (preview)",
+         lambda: export.get_all_ratings_with_details(s["project_id"], limit=5)),
+        ("ExportRepository.get_form_field_values_for_ratings",
+         lambda: export.get_form_field_values_for_ratings([s["rating_id"]])),
+        ("ExportRepository.get_form_fields", lambda: export.get_form_fields(s["project_id"])),
+        ("ExportRepository.stream_ratings", lambda: _drain(export.stream_ratings(s["project_id"]))),
+        ("ProgressRepository.find_project_ids", lambda: progress.find_project_ids()),
+        ("ProgressRepository.rebuild_project", lambda: progress.rebuild_project(s["project_id"])),
+        ("JobRepository.create", lambda: jobs.create("query_plan", "query_plan_owner", {}, s["project_id"])),
+        ("JobRepository.find_by_id", lambda: jobs.find_by_id(1)),
+        ("JobRepository.find_all", lambda: jobs.find_all(50, status="running", job_type="export")),
+        ("JobRepository.mark_running", lambda: jobs.mark_running(1)),
+        ("JobRepository.heartbeat", lambda: jobs.heartbeat("query_plan_owner", [(1, 5, 10)])),
+        ("JobRepository.request_cancel", lambda: jobs.request_cancel(1)),
+        ("JobRepository.finish", lambda: jobs.finish(1, "succeeded", {"ok": True})),
+        ("JobRepository.fail_stale", lambda: jobs.fail_stale(60)),
+        ("JobRepository.delete_finished_before", lambda: jobs.delete_finished_before(86400)),
+        # Destructive calls last
+        ("FormFieldValueRepository.delete_by_rating_id", lambda: values.delete_by_rating_id(s["rating_id"])),
+        ("RatingRepository.delete", lambda: ratings.delete(s["rating_id"])),
+        ("RatingRepository.create", lambda: ratings.create(s["mutant_id"], s["user_id"])),
+        ("FormFieldRepository.delete", lambda: form_fields.delete(s["form_field_id"])),
+        ("SessionRepository.disable_by_user_id", lambda: sessions.disable_by_user_id(s["user_id"])),
+        ("UserRepository.delete_by_id", lambda: users.delete_by_id(s["other_user_id"])),
+        ("ProjectRepository.delete", lambda: projects.delete(s["other_project_id"])),
+    ]
+
+    for label, call in calls:
+        recorder.label = label
+        await call()
+
+
+@pytest.mark.asyncio
+async def test_repository_queries_use_indexes(monkeypatch):
+    async with db.pool.acquire() as conn:
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            # At seed size a parallel seq scan can undercut an index path that wins on a
+            # production sized table; the suite is about access paths, so plan serially
+            await conn.execute("SET LOCAL max_parallel_workers_per_gather = 0")
+            seed = await _seed(conn)
+            recorder = _PlanRecorder(conn)
+            monkeypatch.setattr(db, "acquire", lambda: _Bound(recorder))
+            await _exercise_repositories(recorder, seed)
+        finally:
+            monkeypatch.undo()
+            await transaction.rollback()
+
+    assert recorder.plans
+    failures = [
+        f"{label}: sequential scan on {', '.join(scans)}\n{query.strip()}"
+        for label, query, plan in recorder.plans
+        if (scans := _seq_scans(plan))
+    ]
+    assert not failures, "\n\n".join(failures)
@@ -3,15 +3,29 @@ Direct repository unit tests for methods not exercised via the API layer.
 Covers:
   - repositories/form_field_value_repository.py (create, create_many, find_by_id, update, delete_by_rating_id)
   - repositories/rating_repository.py (create, find_by_id, delete, find_by_project_and_user, find_by_project)
+  - repositories/mutant_repository.py (create_many via COPY and multi-row INSERT)
+  - repositories/project_repository.py (project listings with aggregated counts)
+  - repositories/progress_repository.py and the counters kept by the rating/mutant repositories
+  - repositories/export_repository.py (limited rating list of the export preview)
 """
+import asyncio
+import json
 import uuid
 import pytest
 from io import BytesIO
+from unittest.mock import AsyncMock
+from asyncpg.exceptions import LockNotAvailableError
 from httpx import AsyncClient
 
 from core.database import db
+from repositories.export_repository import ExportRepository
 from repositories.form_field_value_repository import FormFieldValueRepository
 from repositories.rating_repository import RatingRepository
+from repositories.mutant_repository import MutantRepository, INSERT_BATCH_SIZE
+from repositories.project_repository import ProjectRepository
+from repositories.progress_repository import ProgressRepository, lock_project_progress
+from repositories.user_repository import UserRepository
+from services.progress import ProgressService
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
 
@@ -313,3 +327,300 @@ class TestRatingRepository:
             assert rows == []
         finally:
             await _delete_project(client, token, project_id)
+
+
+# ---------------------------------------------------------------------------
+# ProjectRepository
+# ---------------------------------------------------------------------------
+
+class TestProjectRepositoryCounts:
+    """Covers the aggregated project listing queries of ProjectRepository."""
+
+    @pytest.mark.asyncio
+    async def test_find_by_user_id_with_counts(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, mutant_id, _ = await _create_project(client, token)
+        admin_id = await _get_admin_id(client, token)
+        project_repo = ProjectRepository(db)
+        rating_repo = RatingRepository(db)
+
+        try:
+            rows = await project_repo.find_by_user_id_with_counts(admin_id)
+            project = next(r for r in rows if r["id"] == project_id)
+            assert project["total_mutants"] == 1
+            assert project["reviewed_mutants"] == 0
+
+            await rating_repo.create(mutant_id, admin_id)
+            rows = await project_repo.find_by_user_id_with_counts(admin_id)
+            project = next(r for r in rows if r["id"] == project_id)
+            assert project["reviewed_mutants"] == 1
+        finally:
+            await _delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_find_by_user_id_with_counts_only_assigned(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, _, _ = await _create_project(client, token)
+        admin_id = await _get_admin_id(client, token)
+        project_repo = ProjectRepository(db)
+
+        try:
+            await project_repo.remove_user(project_id, admin_id)
+            rows = await project_repo.find_by_user_id_with_counts(admin_id)
+            assert all(r["id"] != project_id for r in rows)
+        finally:
+            await _delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_find_all_projects_with_counts(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, _, _ = await _create_project(client, token)
+        project_repo = ProjectRepository(db)
+
+        try:
+            rows = await project_repo.find_all_projects_with_counts()
+            project = next(r for r in rows if r["id"] == project_id)
+            assert project["total_mutants"] == 1
+        finally:
+            await _delete_project(client, token, project_id)
+
+
+# ---------------------------------------------------------------------------
+# Progress counters
+# ---------------------------------------------------------------------------
+
+async def _progress(project_id: int) -> dict:
+    async with db.acquire() as conn:
+        project = await conn.fetchrow(
+            "SELECT total_mutants, rated_mutants FROM project_progress WHERE project_id = $1",
+            project_id
+        )
+        users = await conn.fetch(
+            "SELECT user_id, reviewed_mutants FROM project_user_progress WHERE project_id = $1",
+            project_id
+        )
+    return {
+        "total": project["total_mutants"],
+        "rated": project["rated_mutants"],
+        "reviewed": {row["user_id"]: row["reviewed_mutants"] for row in users if row["reviewed_mutants"]},
+    }
+
+
+class TestProgressCounters:
+    """Covers the progress counters kept by the repositories and their reconciliation."""
+
+    @pytest.mark.asyncio
+    async def test_project_creation_counts_mutants(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, _, _ = await _create_project(client, token)
+
+        try:
+            assert await _progress(project_id) == {"total": 1, "rated": 0, "reviewed": {}}
+        finally:
+            await _delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_rating_writes_update_counters(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, mutant_id, _ = await _create_project(client, token)
+        admin_id = await _get_admin_id(client, token)
+        user_repo = UserRepository(db)
+        other_id = await user_repo.create(f"progress_{uuid.uuid4().hex[:8]}", "x")
+        rating_repo = RatingRepository(db)
+
+        try:
+            admin_rating = await rating_repo.upsert(mutant_id, admin_id)
+            assert await rating_repo.upsert(mutant_id, admin_id) == admin_rating
+            assert await _progress(project_id) == {"total": 1, "rated": 1, "reviewed": {admin_id: 1}}
+
+            other_rating = await rating_repo.create(mutant_id, other_id)
+            assert await _progress(project_id) == {
+                "total": 1, "rated": 1, "reviewed": {admin_id: 1, other_id: 1}
+            }
+            assert await rating_repo.count_total_by_user(other_id) == 1
+
+            await rating_repo.delete(admin_rating)
+            assert await _progress(project_id) == {"total": 1, "rated": 1, "reviewed": {other_id: 1}}
+
+            await rating_repo.delete(other_rating)
+            assert await _progress(project_id) == {"total": 1, "rated": 0, "reviewed": {}}
+        finally:
+            await _delete_project(client, token, project_id)
+            await user_repo.delete_by_id(other_id)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_project_corrects_drift(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, mutant_id, _ = await _create_project(client, token)
+        admin_id = await _get_admin_id(client, token)
+        progress_repo = ProgressRepository(db)
+
+        try:
+            await RatingRepository(db).create(mutant_id, admin_id)
+            async with db.acquire() as conn:
+                await conn.execute(
+                    "UPDATE project_progress SET total_mutants = 7, rated_mutants = 0 WHERE project_id = $1",
+                    project_id
+                )
+                await conn.execute(
+                    "DELETE FROM project_user_progress WHERE project_id = $1", project_id
+                )
+
+            assert await progress_repo.rebuild_project(project_id) == 2
+            assert await _progress(project_id) == {"total": 1, "rated": 1, "reviewed": {admin_id: 1}}
+            assert await progress_repo.rebuild_project(project_id) == 0
+        finally:
+            await _delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_deleting_a_user_uncounts_mutants_left_unrated(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, mutant_id, _ = await _create_project(client, token)
+        admin_id = await _get_admin_id(client, token)
+        user_repo = UserRepository(db)
+        rating_repo = RatingRepository(db)
+        sole_id = await user_repo.create(f"progress_{uuid.uuid4().hex[:8]}", "x")
+        shared_id = await user_repo.create(f"progress_{uuid.uuid4().hex[:8]}", "x")
+
+        try:
+            await rating_repo.create(mutant_id, sole_id)
+            await user_repo.delete_by_id(sole_id)
+            assert await _progress(project_id) == {"total": 1, "rated": 0, "reviewed": {}}
+
+            await rating_repo.create(mutant_id, shared_id)
+            await rating_repo.create(mutant_id, admin_id)
+            await user_repo.delete_by_id(shared_id)
+            assert await _progress(project_id) == {"total": 1, "rated": 1, "reviewed": {admin_id: 1}}
+        finally:
+            await _delete_project(client, token, project_id)
+            await user_repo.delete_by_id(sole_id)
+            await user_repo.delete_by_id(shared_id)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_lock_only_blocks_its_project(self, client: AsyncClient):
+        token = await _admin_token(client)
+        locked_project_id, locked_mutant_id, _ = await _create_project(client, token)
+        project_id, mutant_id, _ = await _create_project(client, token)
+        admin_id = await _get_admin_id(client, token)
+        rating_repo = RatingRepository(db)
+
+        try:
+            async with db.pool.acquire() as conn:
+                async with conn.transaction():
+                    await lock_project_progress(conn, [locked_project_id], exclusive=True)
+
+                    await asyncio.wait_for(rating_repo.create(mutant_id, admin_id), timeout=5)
+                    blocked = asyncio.create_task(rating_repo.create(locked_mutant_id, admin_id))
+                    await asyncio.sleep(0.2)
+                    assert not blocked.done()
+            await asyncio.wait_for(blocked, timeout=5)
+
+            assert (await _progress(project_id))["rated"] == 1
+            assert (await _progress(locked_project_id))["rated"] == 1
+        finally:
+            await _delete_project(client, token, locked_project_id)
+            await _delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_skips_busy_projects(self):
+        progress_repo = AsyncMock()
+        progress_repo.find_project_ids.return_value = [1, 2, 3]
+        progress_repo.rebuild_project.side_effect = [1, LockNotAvailableError("busy"), 2]
+
+        assert await ProgressService(progress_repo).reconcile() == 3
+        assert progress_repo.rebuild_project.await_count == 3
+
+
+# ---------------------------------------------------------------------------
+# MutantRepository
+# ---------------------------------------------------------------------------
+
+def _mutant_row(project_id: int, line_number: int, additional_fields=None) -> list:
+    return [
+        project_id, False, "SURVIVED", 2, "Bulk.java", "com.example.Bulk", "run",
+        "()V", line_number, "MATH", None, "bulk loaded mutant", additional_fields,
+    ]
+
+
+class TestMutantRepositoryBulkLoad:
+    """Covers the COPY and multi-row INSERT paths of MutantRepository.create_many."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method", ["copy", "insert"])
+    async def test_create_many_loads_all_rows(self, client: AsyncClient, method):
+        token = await _admin_token(client)
+        project_id, _, _ = await _create_project(client, token)
+        mutant_repo = MutantRepository(db)
+
+        try:
+            rows = [_mutant_row(project_id, i) for i in range(INSERT_BATCH_SIZE + 5)]
+            rows[0][12] = '{"severity": "HIGH"}'
+            await mutant_repo.create_many(rows, method=method)
+
+            assert await mutant_repo.count_by_project_id(project_id) == len(rows) + 1
+            loaded = [m for m in await mutant_repo.get_all_for_ranking(project_id)
+                      if m["sourcefile"] == "Bulk.java"]
+            assert sorted(m["linenumber"] for m in loaded) == list(range(len(rows)))
+            with_fields = [m for m in loaded if m["additionalfields"] is not None]
+            assert len(with_fields) == 1
+            assert json.loads(with_fields[0]["additionalfields"]) == {"severity": "HIGH"}
+        finally:
+            await _delete_project(client, token, project_id)
+
+    @pytest.mark.asyncio
+    async def test_create_many_unknown_method_raises(self):
+        with pytest.raises(ValueError):
+            await MutantRepository(db).create_many([_mutant_row(0, 1)], method="bogus")
+
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_all_repository_writes(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, _, _ = await _create_project(client, token)
+        mutant_repo = MutantRepository(db)
+
+        try:
+            with pytest.raises(RuntimeError):
+                async with db.transaction():
+                    await mutant_repo.create_many([_mutant_row(project_id, 1)])
+                    assert await mutant_repo.count_by_project_id(project_id) == 2
+                    raise RuntimeError("abort")
+
+            assert await mutant_repo.count_by_project_id(project_id) == 1
+        finally:
+            await _delete_project(client, token, project_id)
+
+
+# ---------------------------------------------------------------------------
+# ExportRepository
+# ---------------------------------------------------------------------------
+
+class TestExportRepositoryPreview:
+    """The preview reads a prefix of the full export, in the same order."""
+
+    @pytest.mark.asyncio
+    async def test_limited_ratings_are_prefix_of_all_ratings(self, client: AsyncClient):
+        token = await _admin_token(client)
+        project_id, _, _ = await _create_project(client, token)
+        user_repo = UserRepository(db)
+        rating_repo = RatingRepository(db)
+        export_repo = ExportRepository(db)
+        user_ids = [
+            await user_repo.create(f"{prefix}_{uuid.uuid4().hex[:8]}", "x") for prefix in ("zed", "amy")
+        ]
+
+        try:
+            await MutantRepository(db).create_many([_mutant_row(project_id, i) for i in range(4)])
+            mutant_ids = [m["id"] for m in await MutantRepository(db).get_all_for_ranking(project_id)]
+            for mutant_id in reversed(mutant_ids):
+                for user_id in user_ids:
+                    await rating_repo.create(mutant_id, user_id)
+
+            everything = await export_repo.get_all_ratings_with_details(project_id)
+            assert len(everything) == 2 * len(mutant_ids)
+            for limit in (1, 3, 5, 100):
+                assert await export_repo.get_all_ratings_with_details(project_id, limit) == everything[:limit]
+            assert everything[0]["reviewer_username"].startswith("amy")
+        finally:
+            await _delete_project(client, token, project_id)
+            for user_id in user_ids:
+                await user_repo.delete_by_id(user_id)
@@ -0,0 +1,162 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from core.session_cache import SessionCache, session_cache
+from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
+
+
+class TestSessionCache:
+    """Unit tests for the LRU/TTL behaviour of SessionCache."""
+
+    def test_get_returns_cached_value_and_counts_hits(self):
+        cache = SessionCache(max_size=10, ttl=60)
+        assert cache.get("token") is None
+        cache.put("token", 1, "user", cache.generation)
+
+        assert cache.get("token") == "user"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_tokens_are_stored_hashed(self):
+        cache = SessionCache(max_size=10, ttl=60)
+        cache.put("secret-token", 1, "user", cache.generation)
+        assert "secret-token" not in cache._entries
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SessionCache(max_size=2, ttl=60)
+        cache.put("a", 1, "A", cache.generation)
+        cache.put("b", 2, "B", cache.generation)
+        cache.get("a")
+        cache.put("c", 3, "C", cache.generation)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        cache = SessionCache(max_size=10, ttl=30)
+        with patch("core.session_cache.time.monotonic", return_value=1000.0):
+            cache.put("token", 1, "user", cache.generation)
+        with patch("core.session_cache.time.monotonic", return_value=1029.0):
+            assert cache.get("token") == "user"
+        with patch("core.session_cache.time.monotonic", return_value=1031.0):
+            assert cache.get("token") is None
+        assert cache.stats()["size"] == 0
+
+    def test_expired_session_is_not_cached(self):
+        cache = SessionCache(max_size=10, ttl=30)
+        cache.put("token", 1, "user", cache.generation, datetime.now() - timedelta(seconds=1))
+        assert cache.get("token") is None
+
+    def test_invalidate_user_drops_all_their_tokens(self):
+        cache = SessionCache(max_size=10, ttl=60)
+        cache.put("a", 1, "A", cache.generation)
+        cache.put("b", 1, "B", cache.generation)
+        cache.put("c", 2, "C", cache.generation)
+        cache.invalidate_user(1)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.get("c") == "C"
+
+    def test_put_after_invalidation_is_dropped(self):
+        """A value loaded before an invalidation must not be cached after it."""
+        cache = SessionCache(max_size=10, ttl=60)
+        generation = cache.generation
+        cache.invalidate_user(1)
+        cache.put("token", 1, "stale", generation)
+        assert cache.get("token") is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = SessionCache(max_size=10, ttl=0)
+        cache.put("token", 1, "user", cache.generation)
+        assert cache.get("token") is None
+        assert cache.stats()["enabled"] is False
+
+
+class TestSessionCacheIntegration:
+    """The cache must never outlive the changes that AuthService makes."""
+
+    async def _login(self, client: AsyncClient, username: str, password: str) -> str:
+        response = await client.post("/api/login", json={"username": username, "password": password})
+        assert response.status_code == 200
+        return response.json()["token"]
+
+    async def _create_user(self, client: AsyncClient, admin_token: str) -> tuple[int, str, str]:
+        username = f"cache_{uuid.uuid4().hex[:8]}"
+        password = "TestPass123!"
+        await client.post(
+            "/api/admin/users",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"username": username, "password": password}
+        )
+        users = (await client.get(
+            "/api/admin/users",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            params={"search": username}
+        )).json()
+        return users[0]["id"], username, password
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_hit_the_cache(self, client: AsyncClient):
+        token = await self._login(client, TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD)
+        hits = session_cache.hits
+        for _ in range(3):
+            response = await client.get("/api/user", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+        assert session_cache.hits >= hits + 2
+
+    @pytest.mark.asyncio
+    async def test_logout_invalidates_cached_session(self, client: AsyncClient):
+        token = await self._login(client, TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD)
+        headers = {"Authorization": f"Bearer {token}"}
+        assert (await client.get("/api/user", headers=headers)).status_code == 200
+
+        await client.post("/api/user/logout", headers=headers)
+        assert (await client.get("/api/user", headers=headers)).status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_admin_changes_apply_to_cached_sessions(self, client: AsyncClient):
+        admin_token = await self._login(client, TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD)
+        admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        user_id, username, password = await self._create_user(client, admin_token)
+        headers = {"Authorization": f"Bearer {await self._login(client, username, password)}"}
+
+        try:
+            assert (await client.get("/api/user", headers=headers)).json()["is_admin"] is False
+
+            await client.patch(f"/api/admin/users/promote/{user_id}", headers=admin_headers)
+            assert (await client.get("/api/user", headers=headers)).json()["is_admin"] is True
+
+            await client.patch(f"/api/admin/users/{user_id}/disable", headers=admin_headers)
+            assert (await client.get("/api/user", headers=headers)).status_code == 401
+
+            await client.patch(f"/api/admin/users/{user_id}/enable", headers=admin_headers)
+            headers = {"Authorization": f"Bearer {await self._login(client, username, password)}"}
+            assert (await client.get("/api/user", headers=headers)).status_code == 200
+        finally:
+            await client.delete(f"/api/admin/users/{user_id}", headers=admin_headers)
+
+        assert (await client.get("/api/user", headers=headers)).status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_requires_admin_and_reports_counts(self, client: AsyncClient):
+        admin_token = await self._login(client, TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD)
+        response = await client.get(
+            "/api/admin/metrics/session-cache",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        stats = response.json()
+        assert {"hits", "misses", "hit_ratio", "size", "evictions", "invalidations"} <= stats.keys()
+
+        response = await client.get(
+            "/api/admin/metrics/session-cache",
+            headers={"Authorization": "Bearer invalid_token"}
+        )
+        assert response.status_code == 401
@@ -0,0 +1,142 @@
+import io
+import sys
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from core.source_cache import SourceCache
+from core.storage import FileStorage
+from repositories.source_code_repository import SourceCodeRepository
+from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
+
+
+class TestSourceCache:
+    """Unit tests for the byte bound, revalidation and invalidation of SourceCache."""
+
+    def test_get_checks_the_file_version(self):
+        cache = SourceCache(max_bytes=10_000, revalidate_after=5)
+        assert cache.get(1, "Foo.java", (1, 10)) is None
+        cache.put(1, "Foo.java", (1, 10), "class Foo {}", cache.generation)
+
+        assert cache.get(1, "Foo.java", (1, 10)) == "class Foo {}"
+        assert cache.get(1, "Foo.java", (2, 10)) is None
+        assert cache.stats()["files"] == 0
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_get_recent_serves_entries_until_they_need_revalidation(self):
+        cache = SourceCache(max_bytes=10_000, revalidate_after=5)
+        with patch("core.source_cache.time.monotonic", return_value=1000.0):
+            cache.put(1, "Foo.java", (1, 10), "class Foo {}", cache.generation)
+        with patch("core.source_cache.time.monotonic", return_value=1004.0):
+            assert cache.get_recent(1, "Foo.java") == "class Foo {}"
+        with patch("core.source_cache.time.monotonic", return_value=1006.0):
+            assert cache.get_recent(1, "Foo.java") is None
+            # Checking the version starts a new window
+            assert cache.get(1, "Foo.java", (1, 10)) == "class Foo {}"
+        with patch("core.source_cache.time.monotonic", return_value=1010.0):
+            assert cache.get_recent(1, "Foo.java") == "class Foo {}"
+        assert cache.stats()["misses"] == 0
+
+    def test_least_recently_used_files_are_evicted_by_size(self):
+        content = "x" * 100
+        cache = SourceCache(max_bytes=2 * sys.getsizeof(content), revalidate_after=5)
+        cache.put(1, "A.java", (1, 1), content, cache.generation)
+        cache.put(1, "B.java", (1, 1), content, cache.generation)
+        cache.get(1, "A.java", (1, 1))
+        cache.put(1, "C.java", (1, 1), content, cache.generation)
+
+        assert cache.get(1, "B.java", (1, 1)) is None
+        assert cache.get(1, "A.java", (1, 1)) == content
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size_bytes"] == 2 * sys.getsizeof(content)
+
+        # A file larger than the whole cache is not cached
+        cache.put(1, "Big.java", (1, 1), content * 3, cache.generation)
+        assert cache.stats()["files"] == 2
+
+    def test_invalidate_project_drops_its_files_and_stale_reads(self):
+        cache = SourceCache(max_bytes=10_000, revalidate_after=5)
+        cache.put(1, "Foo.java", (1, 1), "one", cache.generation)
+        cache.put(2, "Foo.java", (1, 1), "two", cache.generation)
+        generation = cache.generation
+
+        cache.invalidate_project(1)
+        cache.put(1, "Bar.java", (1, 1), "read before the invalidation", generation)
+
+        assert cache.get_recent(1, "Foo.java") is None
+        assert cache.get_recent(1, "Bar.java") is None
+        assert cache.get_recent(2, "Foo.java") == "two"
+
+    def test_zero_size_disables_the_cache(self):
+        cache = SourceCache(max_bytes=0, revalidate_after=5)
+        cache.put(1, "Foo.java", (1, 1), "class Foo {}", cache.generation)
+        assert cache.get(1, "Foo.java", (1, 1)) is None
+        assert cache.stats()["enabled"] is False
+
+
+def _zip(content: str) -> io.BytesIO:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("src/main/java/com/example/Foo.java", content)
+    buf.seek(0)
+    return buf
+
+
+class TestCachedSourceCodeRepository:
+
+    def _make_repo(self, project_dir) -> SourceCodeRepository:
+        fs = MagicMock(spec=FileStorage)
+        fs.get_project_path.return_value = project_dir
+        return SourceCodeRepository(fs, SourceCache(max_bytes=10_000, revalidate_after=60))
+
+    @pytest.mark.asyncio
+    async def test_classes_of_a_file_are_read_once(self, tmp_path):
+        repo = self._make_repo(tmp_path / "1")
+        source = "package com.example;\nclass Foo { class Inner {} }"
+        await repo.save_project_source(1, _zip(source))
+
+        assert await repo.get_source_file(1, "com.example.Foo") == source
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("read from disk")), \
+                patch("pathlib.Path.stat", side_effect=AssertionError("checked on disk")):
+            assert await repo.get_source_file(1, "com.example.Foo$Inner") == source
+            assert await repo.get_source_file(1, "com.example.Foo") == source
+        assert repo.cache.stats()["hits"] == 2
+        assert repo.cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_upload_and_delete_invalidate_the_project(self, tmp_path):
+        repo = self._make_repo(tmp_path / "1")
+        await repo.save_project_source(1, _zip("package com.example;\nclass Foo {}"))
+        await repo.get_source_file(1, "com.example.Foo")
+
+        await repo.save_project_source(1, _zip("package com.example;\nclass Foo { int changed; }"))
+        assert await repo.get_source_file(1, "com.example.Foo") == "package com.example;\nclass Foo { int changed; }"
+
+        await repo.delete_project_source(1)
+        assert await repo.get_source_file(1, "com.example.Foo") is None
+
+    def test_changed_file_is_read_again_once_revalidated(self, tmp_path):
+        repo = self._make_repo(tmp_path / "1")
+        repo.cache.revalidate_after = 0
+        repo._sync_save_zip(1, _zip("package com.example;\nclass Foo {}"))
+        repo._sync_get_class_content(1, "com.example.Foo")
+
+        path = tmp_path / "1" / "src" / "main" / "java" / "com" / "example" / "Foo.java"
+        path.write_text("package com.example;\nclass Foo { /* edited */ }", encoding="utf-8")
+
+        assert repo._sync_get_class_content(1, "com.example.Foo") == "package com.example;\nclass Foo { /* edited */ }"
+
+
+@pytest.mark.asyncio
+async def test_source_cache_metrics_endpoint(client: AsyncClient):
+    assert (await client.get("/api/admin/metrics/source-cache")).status_code == 401
+    response = await client.post(
+        "/api/login", json={"username": TEST_ADMIN_USERNAME, "password": TEST_ADMIN_PASSWORD}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    stats = (await client.get("/api/admin/metrics/source-cache", headers=headers)).json()
+    assert {"hits", "misses", "hit_ratio", "size_bytes", "max_bytes", "evictions"} <= set(stats)
@@ -11,7 +11,8 @@ import io
 import zipfile
 import pytest
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
 from httpx import AsyncClient
 
 from main import app
@@ -24,9 +25,9 @@ from dependencies import (
 )
 from models.auth import UserResponse
 from models.mutant import MutantResponse
-from models.source_code import SourceClassQuery, SourceCodeResponse
+from models.source_code import SourceClassQuery, SourceCodeResponse, SourceUploadResponse
 from services.source_code import SourceCodeService
-from repositories.source_code_repository import SourceCodeRepository
+from repositories.source_code_repository import SourceCodeRepository, build_class_index, declared_types
 from core.storage import FileStorage
 from .conftest import TEST_ADMIN_USERNAME, TEST_ADMIN_PASSWORD
 
@@ -138,6 +139,26 @@ class TestSourceCodeService:
         await service.upload_project_source(1, mock_file)
         repo.save_project_source.assert_awaited_once_with(1, mock_file.file)
 
+    @pytest.mark.asyncio
+    async def test_upload_reports_unresolved_classes(self):
+        repo = AsyncMock()
+        repo.save_project_source.return_value = {"com.example.Foo": "src/main/java/com/example/Foo.java"}
+        mutant_repo = AsyncMock()
+        mutant_repo.count_by_class.return_value = [
+            {"mutatedclass": "com.example.Foo", "mutants": 3},
+            {"mutatedclass": "com.example.Foo$Inner", "mutants": 2},
+            {"mutatedclass": "com.example.Gone", "mutants": 4},
+        ]
+        service = SourceCodeService(repo, mutant_repo)
+        mock_file = MagicMock()
+        mock_file.filename = "sources.zip"
+
+        report = await service.upload_project_source(1, mock_file)
+
+        assert report.indexed_classes == 1
+        assert report.unresolved_classes == ["com.example.Gone"]
+        assert report.unresolved_mutants == 4
+
     @pytest.mark.asyncio
     async def test_get_class_source_code_found(self):
         repo = AsyncMock()
@@ -241,6 +262,77 @@ class TestSourceCodeRepository:
         with pytest.raises(ValueError, match="Malicious"):
             repo._sync_save_zip(1, buf)
 
+    # --- class index ---
+
+    def test_declared_types_ignores_nested_types_comments_and_literals(self):
+        source = """
+            // class Commented {
+            package com.example.util;
+            /* interface Hidden { */
+            public final class Strings {
+                private static final String BRACE = "}";
+                static class Nested { enum Kind { A } }
+            }
+            record Pair(int a, int b) {}
+        """
+        assert declared_types(source) == ("com.example.util", ["Strings", "Pair"])
+
+    def test_build_class_index_prefers_main_sources_of_multi_module_builds(self):
+        index = build_class_index([
+            ("core/src/test/java/com/example/Foo.java", "package com.example; class Foo {}"),
+            ("core/src/main/java/com/example/Foo.java", "package com.example; class Foo {}"),
+            ("app/src/main/java/com/example/app/Main.java", "package com.example.app; class Main {}"),
+            ("Default.java", "class Default {}"),
+        ])
+        assert index == {
+            "com.example.Foo": "core/src/main/java/com/example/Foo.java",
+            "com.example.app.Main": "app/src/main/java/com/example/app/Main.java",
+            "Default": "Default.java",
+        }
+
+    def test_save_zip_indexes_maven_layout_and_inner_classes(self, tmp_path):
+        project_dir = tmp_path / "1"
+        repo = _make_repo(project_dir)
+        source = "package com.example;\npublic class Foo { class Inner {} }\nclass Helper {}"
+
+        index = repo._sync_save_zip(1, _make_valid_zip(("module/src/main/java/com/example/Foo.java", source)))
+
+        assert set(index) == {"com.example.Foo", "com.example.Helper"}
+        assert repo._sync_get_class_content(1, "com.example.Foo$Inner") == source
+        assert repo._sync_get_class_content(1, "com.example.Helper") == source
+        assert repo._sync_get_class_content(1, "com.example.Inner") is None
+
+    def test_class_index_is_built_for_sources_extracted_without_one(self, tmp_path):
+        project_dir = tmp_path / "1"
+        java_file = project_dir / "src" / "Foo.java"
+        java_file.parent.mkdir(parents=True)
+        java_file.write_text("package com.example; class Foo {}", encoding="utf-8")
+        repo = _make_repo(project_dir)
+
+        assert repo._sync_get_class_index(1) == {"com.example.Foo": "src/Foo.java"}
+        assert repo._index_path(1).exists()
+
+        repo._sync_delete_source(1)
+        assert not repo._index_path(1).exists()
+        assert repo._sync_get_class_index(1) is None
+
+    def test_index_of_an_upload_is_not_overwritten_by_a_legacy_build(self, tmp_path):
+        project_dir = tmp_path / "1"
+        java_file = project_dir / "src" / "Foo.java"
+        java_file.parent.mkdir(parents=True)
+        java_file.write_text("package com.example; class Foo {}", encoding="utf-8")
+        repo = _make_repo(project_dir)
+
+        with ThreadPoolExecutor(1) as pool:
+            with repo._project_lock(1):
+                load = pool.submit(repo._sync_get_class_index, 1)
+                with pytest.raises(TimeoutError):
+                    load.result(timeout=0.2)
+                # Stands in for an upload publishing its index while the lock is held
+                repo._write_index(1, {"com.example.Bar": "src/Bar.java"})
+            assert load.result(timeout=5) == {"com.example.Bar": "src/Bar.java"}
+        assert repo._sync_get_class_index(1) == {"com.example.Bar": "src/Bar.java"}
+
     # --- _sync_delete_source ---
 
     def test_delete_source_removes_existing_directory(self, tmp_path):
@@ -336,6 +428,256 @@ class TestSourceCodeRepository:
         assert result is None
 
 
+class TestSourceUploadSwap:
+    """Uploads are extracted in parallel next to the previous sources and then swapped in."""
+
+    def test_previous_sources_stay_readable_until_the_swap(self, tmp_path):
+        project_dir = tmp_path / "1"
+        repo = _make_repo(project_dir)
+        repo._sync_save_zip(1, _make_valid_zip(("a/Foo.java", "package a; class Foo {}")))
+        seen = []
+        extract_members = SourceCodeRepository._sync_extract_members
+
+        def extract_and_read(*args):
+            seen.append(repo._sync_get_class_content(1, "a.Foo"))
+            return extract_members(*args)
+
+        with patch.object(SourceCodeRepository, "_sync_extract_members", side_effect=extract_and_read):
+            repo._sync_save_zip(1, _make_valid_zip(("a/Foo.java", "package a; class Foo { int x; }")))
+
+        assert seen == ["package a; class Foo {}"]
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo { int x; }"
+        assert project_dir.is_symlink()
+        # Only the current tree, its link, the index and the lock file are left
+        assert len(list(tmp_path.iterdir())) == 4
+
+    def test_failed_upload_keeps_the_previous_sources(self, tmp_path):
+        repo = _make_repo(tmp_path / "1")
+        repo._sync_save_zip(1, _make_valid_zip(("a/Foo.java", "package a; class Foo {}")))
+        repo.MAX_UNCOMPRESSED_SIZE = 10
+
+        with pytest.raises(ValueError, match="limit"):
+            repo._sync_save_zip(1, _make_valid_zip(("a/Foo.java", "x" * 100)))
+
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo {}"
+        assert len(list(tmp_path.iterdir())) == 4
+
+    def test_members_are_extracted_by_several_threads(self, tmp_path):
+        project_dir = tmp_path / "1"
+        repo = _make_repo(project_dir)
+        repo.extract_workers = 3
+        entries = [(f"m{i % 2}/src/p{i % 5}/C{i}.java", f"package p{i % 5}; class C{i} {{}}") for i in range(40)]
+
+        index = repo._sync_save_zip(1, _make_valid_zip(*entries, ("docs/", ""), ("docs/notes.txt", "notes")))
+
+        assert len(index) == 40
+        assert (project_dir / "docs" / "notes.txt").read_text() == "notes"
+        assert repo._sync_get_class_content(1, "p3.C13") == "package p3; class C13 {}"
+
+    def test_sources_extracted_before_swapping_are_replaced(self, tmp_path):
+        project_dir = tmp_path / "1"
+        (project_dir / "a").mkdir(parents=True)
+        (project_dir / "a" / "Old.java").write_text("package a; class Old {}")
+        repo = _make_repo(project_dir)
+        assert repo._sync_get_class_content(1, "a.Old") == "package a; class Old {}"
+
+        repo._sync_save_zip(1, _make_valid_zip(("a/Foo.java", "package a; class Foo {}")))
+
+        assert project_dir.is_symlink()
+        assert repo._sync_get_class_content(1, "a.Old") is None
+        repo._sync_delete_source(1)
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_streamed_upload(self, tmp_path):
+        repo = _make_repo(tmp_path / "1")
+
+        async def chunks():
+            data = _make_valid_zip(("a/Foo.java", "package a; class Foo {}")).getvalue()
+            for start in range(0, len(data), 16):
+                yield data[start:start + 16]
+
+        assert await repo.save_project_source_stream(1, chunks()) == {"a.Foo": "a/Foo.java"}
+        assert await repo.get_source_file(1, "a.Foo") == "package a; class Foo {}"
+        assert len(list(tmp_path.iterdir())) == 4
+
+        # The compressed body has a limit of its own
+        repo.MAX_UPLOAD_SIZE = 64
+        with pytest.raises(ValueError, match="Upload exceeds"):
+            await repo.save_project_source_stream(1, chunks())
+        repo.MAX_UPLOAD_SIZE, repo.MAX_UNCOMPRESSED_SIZE = 10 ** 6, 64
+        assert await repo.save_project_source_stream(1, chunks()) == {"a.Foo": "a/Foo.java"}
+
+    @pytest.mark.parametrize("storage_mode", ["extract", "archive"])
+    def test_concurrent_uploads_leave_only_the_last_sources(self, tmp_path, storage_mode):
+        repo = SourceCodeRepository(_make_repo(tmp_path / "1").fs, storage_mode=storage_mode)
+        uploads = [_make_valid_zip(("a/Foo.java", f"package a; class Foo {{ int v{n}; }}")) for n in range(6)]
+
+        with ThreadPoolExecutor(6) as pool:
+            list(pool.map(lambda archive: repo._sync_save_zip(1, archive), uploads))
+
+        assert repo._sync_get_class_content(1, "a.Foo").startswith("package a; class Foo { int v")
+        # One stored tree (and its link) or archive next to the index and the lock file
+        assert len(list(tmp_path.iterdir())) == (4 if storage_mode == "extract" else 3)
+
+
+class TestArchiveSourceStorage:
+    """SourceCodeRepository with storage_mode="archive": the upload is kept and read on demand."""
+
+    def _make_repo(self, project_dir: Path, storage_mode: str = "archive") -> SourceCodeRepository:
+        mock_fs = MagicMock(spec=FileStorage)
+        mock_fs.get_project_path.return_value = project_dir
+        return SourceCodeRepository(mock_fs, storage_mode=storage_mode)
+
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="storage mode"):
+            self._make_repo(tmp_path / "1", storage_mode="tape")
+
+    def test_archive_is_kept_instead_of_extracted(self, tmp_path):
+        project_dir = tmp_path / "1"
+        repo = self._make_repo(project_dir)
+        source = "package com.example;\npublic class Foo { class Inner {} }"
+
+        index = repo._sync_save_zip(1, _make_valid_zip(
+            ("src/main/java/com/example/Foo.java", source), ("README.md", "docs")
+        ))
+
+        assert index == {"com.example.Foo": "src/main/java/com/example/Foo.java"}
+        assert not project_dir.exists()
+        assert [p.suffix for p in sorted(tmp_path.iterdir())] == [".zip", ".json", ".lock"]
+        assert repo._sync_get_class_content(1, "com.example.Foo$Inner") == source
+        assert repo._sync_get_class_content(1, "com.example.Missing") is None
+
+    def test_reupload_replaces_the_archive(self, tmp_path):
+        repo = self._make_repo(tmp_path / "1")
+        repo._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo {}")))
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo {}"
+
+        repo._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo { int x; }")))
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo { int x; }"
+
+        # Switching modes replaces the stored form
+        extracting = self._make_repo(tmp_path / "1", storage_mode="extract")
+        extracting._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo { int y; }")))
+        assert not (tmp_path / "1.zip").exists()
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo { int y; }"
+
+    def test_archive_is_checked_like_an_extraction(self, tmp_path):
+        repo = self._make_repo(tmp_path / "1")
+        repo.MAX_UNCOMPRESSED_SIZE = 10
+
+        with pytest.raises(ValueError, match="limit"):
+            repo._sync_save_zip(1, _make_valid_zip(("big.java", "x" * 100)))
+        with pytest.raises(ValueError, match="Malicious"):
+            repo._sync_save_zip(1, _make_valid_zip(("../evil.java", "x")))
+        assert list(tmp_path.iterdir()) == [tmp_path / "1.lock"]
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_the_archive(self, tmp_path):
+        repo = self._make_repo(tmp_path / "1")
+        await repo.save_project_source(1, _make_valid_zip())
+        assert await repo.get_source_file(1, "Foo") == "public class Foo {}"
+
+        await repo.delete_project_source(1)
+
+        assert list(tmp_path.iterdir()) == []
+        assert await repo.get_source_file(1, "Foo") is None
+
+
+class TestBlobSourceStorage:
+    """SourceCodeRepository with storage_mode="blobs": Java files stored once by content hash."""
+
+    def _make_repo(self, root: Path) -> SourceCodeRepository:
+        mock_fs = MagicMock(spec=FileStorage)
+        mock_fs.get_project_path.side_effect = lambda project_id: root / str(project_id)
+        mock_fs.get_blob_root.return_value = root / "blobs"
+        mock_fs.root_path = root
+        return SourceCodeRepository(mock_fs, storage_mode="blobs")
+
+    def _blobs(self, root: Path) -> list:
+        return sorted(p.name for p in (root / "blobs").glob("??/*"))
+
+    def test_identical_files_are_stored_once(self, tmp_path):
+        repo = self._make_repo(tmp_path)
+        shared = ("src/main/java/a/Foo.java", "package a; class Foo {}")
+        repo._sync_save_zip(1, _make_valid_zip(shared, ("README.md", "docs")))
+        repo._sync_save_zip(2, _make_valid_zip(shared, ("src/main/java/a/Bar.java", "package a; class Bar {}")))
+
+        assert len(self._blobs(tmp_path)) == 2
+        assert repo._sync_referenced_blobs() == set(self._blobs(tmp_path))
+        assert not (tmp_path / "1").exists()
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo {}"
+        assert repo._sync_get_class_content(2, "a.Bar") == "package a; class Bar {}"
+
+    def test_reupload_of_unchanged_files_writes_nothing(self, tmp_path):
+        repo = self._make_repo(tmp_path)
+        repo._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo {}")))
+        blob = next((tmp_path / "blobs").glob("??/*"))
+        inode = blob.stat().st_ino
+
+        with patch("pathlib.Path.write_bytes", side_effect=AssertionError("blob written")):
+            repo._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo {}")))
+
+        assert blob.stat().st_ino == inode
+        assert repo._sync_referenced_blobs() == {blob.name}
+
+    def test_delete_releases_references_for_garbage_collection(self, tmp_path):
+        repo = self._make_repo(tmp_path)
+        repo._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo {}")))
+        repo._sync_save_zip(2, _make_valid_zip(("Foo.java", "package a; class Foo {}"),
+                                               ("Bar.java", "package a; class Bar {}")))
+
+        repo._sync_delete_source(2)
+        assert len(repo._sync_referenced_blobs()) == 1
+        stats = repo._sync_collect_garbage()
+
+        assert stats["removed_blobs"] == 1 and stats["kept_blobs"] == 1
+        assert repo._sync_get_class_content(1, "a.Foo") == "package a; class Foo {}"
+
+        repo._sync_delete_source(1)
+        repo._sync_collect_garbage()
+        assert self._blobs(tmp_path) == []
+        assert repo._sync_referenced_blobs() == set()
+
+    def test_concurrent_reuploads_keep_shared_blobs(self, tmp_path):
+        repo = self._make_repo(tmp_path)
+        shared = [(f"p/C{i}.java", f"package p; class C{i} {{}}") for i in range(20)]
+        repo._sync_save_zip(1, _make_valid_zip(*shared))
+        repo._sync_save_zip(2, _make_valid_zip(*shared))
+
+        uploads = [
+            _make_valid_zip(*shared[:10], (f"p/New{n}.java", f"package p; class New{n} {{}}"))
+            for n in range(4)
+        ]
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda archive: repo._sync_save_zip(1, archive), uploads))
+        repo._sync_collect_garbage()
+
+        assert repo._sync_get_class_content(2, "p.C15") == "package p; class C15 {}"
+        assert repo._sync_get_class_content(1, "p.C5") == "package p; class C5 {}"
+        # Blobs only the replaced uploads referenced are gone
+        assert set(self._blobs(tmp_path)) == repo._sync_referenced_blobs()
+        assert len(self._blobs(tmp_path)) == 21
+
+    def test_project_lock_serializes_uploads(self, tmp_path):
+        repo = self._make_repo(tmp_path)
+        with ThreadPoolExecutor(1) as pool:
+            with repo._project_lock(1):
+                upload = pool.submit(repo._sync_save_zip, 1, _make_valid_zip(("Foo.java", "package a; class Foo {}")))
+                with pytest.raises(TimeoutError):
+                    upload.result(timeout=0.2)
+            assert upload.result(timeout=5) == {"a.Foo": "Foo.java"}
+
+    def test_failed_upload_keeps_no_references(self, tmp_path):
+        repo = self._make_repo(tmp_path)
+        repo.MAX_UNCOMPRESSED_SIZE = 30
+        with pytest.raises(ValueError, match="limit"):
+            repo._sync_save_zip(1, _make_valid_zip(("Foo.java", "package a; class Foo {}"), ("Big.java", "x" * 100)))
+
+        repo._sync_collect_garbage()
+        assert self._blobs(tmp_path) == []
+
+
 # ---------------------------------------------------------------------------
 # Router tests for GET /api/mutants/{id}/source
 # (routers/mutants.py lines 39-60)
@@ -504,7 +846,10 @@ class TestAdminSourceCodeRouter:
     @pytest.mark.asyncio
     async def test_upload_source_success(self, client: AsyncClient):
         mock_source_svc = AsyncMock()
-        mock_source_svc.upload_project_source.return_value = None
+        mock_source_svc.upload_project_source.return_value = SourceUploadResponse(
+            detail="Source code uploaded and extracted successfully",
+            indexed_classes=1, unresolved_classes=[], unresolved_mutants=0
+        )
 
         app.dependency_overrides[get_current_admin] = lambda: FAKE_ADMIN
         app.dependency_overrides[get_source_code_service] = lambda: mock_source_svc
@@ -518,6 +863,62 @@ class TestAdminSourceCodeRouter:
         finally:
             app.dependency_overrides.clear()
 
+    @pytest.mark.asyncio
+    async def test_upload_source_stream_requires_zip_body(self, client: AsyncClient):
+        app.dependency_overrides[get_current_admin] = lambda: FAKE_ADMIN
+        app.dependency_overrides[get_source_code_service] = lambda: AsyncMock()
+        try:
+            response = await client.put(
+                "/api/admin/project/1/source/stream",
+                content=b"data", headers={"Content-Type": "application/gzip"}
+            )
+            assert response.status_code == 400
+            assert "zip" in response.json()["detail"].lower()
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_upload_source_stream(self, client: AsyncClient):
+        assert (await client.put("/api/admin/project/1/source/stream", content=b"")).status_code == 401
+        response = await client.post(
+            "/api/login", json={"username": TEST_ADMIN_USERNAME, "password": TEST_ADMIN_PASSWORD}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['token']}", "Content-Type": "application/zip"}
+        archive = _make_valid_zip(("src/a/Foo.java", "package a; class Foo {}")).getvalue()
+        source_service = get_source_code_service()
+        project_id = 987654
+
+        try:
+            response = await client.put(
+                f"/api/admin/project/{project_id}/source/stream", headers=headers, content=archive
+            )
+            assert response.status_code == 201
+            assert response.json()["indexed_classes"] == 1
+            assert await source_service.repository.get_source_file(project_id, "a.Foo") == "package a; class Foo {}"
+
+            response = await client.put(
+                f"/api/admin/project/{project_id}/source/stream", headers=headers, content=b"not a zip"
+            )
+            assert response.status_code == 500
+            assert await source_service.repository.get_source_file(project_id, "a.Foo") == "package a; class Foo {}"
+        finally:
+            await source_service.delete_source_folder(project_id)
+
+    @pytest.mark.asyncio
+    async def test_collect_garbage(self, client: AsyncClient):
+        assert (await client.post("/api/admin/storage/collect-garbage")).status_code == 401
+
+        mock_source_svc = AsyncMock()
+        mock_source_svc.collect_garbage.return_value = {"removed_blobs": 2, "freed_bytes": 10, "kept_blobs": 1}
+        app.dependency_overrides[get_current_admin] = lambda: FAKE_ADMIN
+        app.dependency_overrides[get_source_code_service] = lambda: mock_source_svc
+        try:
+            response = await client.post("/api/admin/storage/collect-garbage")
+            assert response.status_code == 200
+            assert response.json()["removed_blobs"] == 2
+        finally:
+            app.dependency_overrides.clear()
+
     @pytest.mark.asyncio
     async def test_create_project_invalid_xml_returns_400(self, client: AsyncClient):
         """Trigger the ValueError path in create_project (admin.py line 198)."""
@@ -1,7 +1,13 @@
 import pytest
 import json
+from io import BytesIO
 
-from services.xml_parser import parse_mutations
+from services.xml_parser import (
+    MutationParseError,
+    iter_mutation_batches,
+    parse_mutations,
+    stream_mutation_batches,
+)
 
 
 class TestXmlParser:
@@ -224,3 +230,74 @@ class TestXmlParser:
 </mutations>"""
         result = parse_mutations(xml)
         assert result[0][11] == ""
+
+
+def _mutation_xml(line_number: int) -> str:
+    return f"""
+    <mutation detected='true' status='KILLED' numberOfTestsRun='1'>
+        <sourceFile>Foo.java</sourceFile>
+        <mutatedClass>com.Foo</mutatedClass>
+        <mutatedMethod>bar</mutatedMethod>
+        <methodDescription>()V</methodDescription>
+        <lineNumber>{line_number}</lineNumber>
+        <mutator>MATH</mutator>
+        <killingTest>test</killingTest>
+        <description>test</description>
+    </mutation>"""
+
+
+class TestStreamingXmlParser:
+    """Unit tests for the incremental, batched XML mutation parser."""
+
+    def test_batches_respect_batch_size(self):
+        """Mutations are yielded in batches of at most batch_size rows."""
+        xml = "<mutations>" + "".join(_mutation_xml(i) for i in range(7)) + "</mutations>"
+        batches = list(iter_mutation_batches(BytesIO(xml.encode()), batch_size=3))
+        assert [len(b) for b in batches] == [3, 3, 1]
+        assert [row[8] for batch in batches for row in batch] == list(range(7))
+
+    def test_matches_parse_mutations(self):
+        """Streaming produces the same rows as the in-memory parser."""
+        xml = ("<mutations>" + "".join(_mutation_xml(i) for i in range(5)) + "</mutations>").encode()
+        streamed = [row for batch in iter_mutation_batches(BytesIO(xml), batch_size=2) for row in batch]
+        assert streamed == parse_mutations(xml)
+
+    def test_empty_mutations_yields_nothing(self):
+        xml = b'<?xml version="1.0" encoding="UTF-8"?><mutations></mutations>'
+        assert list(iter_mutation_batches(BytesIO(xml))) == []
+
+    def test_nested_mutation_tags_are_ignored(self):
+        """Only direct children of the root are treated as mutations."""
+        xml = b"""<mutations>
+    <mutation detected='true' status='KILLED' numberOfTestsRun='1'>
+        <lineNumber>1</lineNumber>
+        <additionalFields><mutation>nested</mutation></additionalFields>
+    </mutation>
+</mutations>"""
+        rows = [row for batch in iter_mutation_batches(BytesIO(xml)) for row in batch]
+        assert len(rows) == 1
+        assert json.loads(rows[0][12]) == {"mutation": "nested"}
+
+    def test_malformed_xml_raises_parse_error(self):
+        xml = b"<mutations><this is not valid xml</mutations>"
+        with pytest.raises(MutationParseError):
+            list(iter_mutation_batches(BytesIO(xml)))
+
+    def test_malformed_tail_raises_after_earlier_batches(self):
+        """Errors late in the report surface after earlier batches were yielded."""
+        xml = ("<mutations>" + "".join(_mutation_xml(i) for i in range(4)) + "<broken").encode()
+        batches = iter_mutation_batches(BytesIO(xml), batch_size=2)
+        assert len(next(batches)) == 2
+        with pytest.raises(MutationParseError):
+            list(batches)
+
+    def test_invalid_line_number_raises_parse_error(self):
+        xml = b"<mutations><mutation><lineNumber>abc</lineNumber></mutation></mutations>"
+        with pytest.raises(MutationParseError):
+            list(iter_mutation_batches(BytesIO(xml)))
+
+    @pytest.mark.asyncio
+    async def test_stream_mutation_batches(self):
+        xml = ("<mutations>" + "".join(_mutation_xml(i) for i in range(5)) + "</mutations>").encode()
+        batches = [batch async for batch in stream_mutation_batches(BytesIO(xml), batch_size=2)]
+        assert [len(b) for b in batches] == [2, 2, 1]